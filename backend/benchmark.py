@@ -0,0 +1,450 @@
+"""
+Load-test the API in-process and report throughput and latency percentiles.
+
+    python benchmark.py                          # in-memory Mongo, full seed
+    python benchmark.py --scale 0.02 --requests 200
+    python benchmark.py --mongo-url mongodb://localhost:27017 --output bench.json
+    python benchmark.py --compare bench-main.json --threshold 0.15
+    python benchmark.py --serialization         # list serialization CPU only
+
+Without --mongo-url the app runs against mongomock-motor (install it
+separately; it is not a server dependency). Requests go through httpx's ASGI
+transport, so the numbers include routing, validation and serialization but
+no network. The in-memory stand-in scans collections linearly, so compare its
+numbers only against other in-memory runs. Seed volumes default to 50k
+students, 500k grades and 5k news items and scale with --scale. With --compare, p95 regressions above the
+threshold are listed and the exit code is 1, so CI can gate on it.
+--serialization skips the load test and compares CPU time per 1k-item list
+for the legacy `[Model(**doc)]` + response_model path against list_response.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+SEED_BATCH_SIZE = 5000
+STUDENT_PASSWORD = "bench-password"
+DEPARTMENTS = ["Bilgisayar Programcılığı", "Yazılım Mühendisliği", "Elektrik Elektronik", "İşletme", "Makine Mühendisliği"]
+COURSES = [
+    ("Programlama Temelleri", "BP101", 4), ("Veri Yapıları", "BP102", 3), ("Veritabanı Yönetimi", "BP201", 3),
+    ("Web Programlama", "BP202", 3), ("Algoritma Analizi", "BP301", 4), ("İşletim Sistemleri", "BP302", 3),
+    ("Matematik I", "MAT101", 4), ("Fizik I", "FIZ101", 4), ("Türk Dili", "TDL101", 2), ("İngilizce", "ING101", 2),
+]
+SEMESTERS = ["Güz 2023", "Bahar 2024", "Güz 2024", "Bahar 2025"]
+LETTER_GRADES = ["AA", "BA", "BB", "CB", "CC", "DC", "DD", "FD", "FF"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL"), help="real MongoDB instead of the in-memory stand-in")
+    parser.add_argument("--db-name", default="university_benchmark")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the seed volumes")
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--grades-per-student", type=int, default=10)
+    parser.add_argument("--news", type=int, default=5_000)
+    parser.add_argument("--scenarios", default="home,obs_login,admin_listing,registration_burst")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative p95 increase")
+    parser.add_argument("--serialization", action="store_true", help="only run the list serialization micro-benchmark")
+    parser.add_argument("--rounds", type=int, default=20, help="repetitions per serialization measurement")
+    return parser.parse_args()
+
+
+def load_app(args):
+    """Import the server with the benchmark database configured."""
+    os.environ["MONGO_URL"] = args.mongo_url or "mongodb://localhost:27017"
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("BOOTSTRAP_ON_STARTUP", "false")
+    # Every simulated login comes from one client address
+    os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import server
+
+    if not args.mongo_url:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("mongomock-motor is not installed; pip install mongomock-motor or pass --mongo-url")
+        server.client = AsyncMongoMockClient()
+        server.db = server.client[args.db_name]
+    return server
+
+
+def student_doc(index: int, password_hash: str, now: datetime) -> dict:
+    year = 2021 + index % 5
+    return {
+        "id": str(uuid.uuid4()),
+        "student_no": f"{year}{index:06d}",
+        "tc_no": f"{10_000_000_000 + index}",
+        "first_name": random.choice(["Ahmet", "Ayşe", "Mehmet", "Zeynep", "Can", "Elif", "Emre", "Selin"]),
+        "last_name": random.choice(["Yılmaz", "Kaya", "Demir", "Çelik", "Şahin", "Öztürk", "Aydın", "Arslan"]),
+        "email": f"student{index}@student.ata.edu.tr",
+        "phone": f"0555 {index % 1000:03d} {index % 100:02d} {index % 97:02d}",
+        "department": DEPARTMENTS[index % len(DEPARTMENTS)],
+        "class_level": str(1 + index % 4),
+        "password": password_hash,
+        "status": "approved" if index % 10 else "pending",
+        "gpa": round(random.uniform(1.5, 4.0), 2),
+        "created_at": (now - timedelta(minutes=index)).isoformat(),
+        "approved_at": None,
+        "approved_by": None,
+    }
+
+
+def grade_docs(student_id: str, count: int, now: str) -> list:
+    docs = []
+    for position in range(count):
+        course_name, course_code, credit = COURSES[position % len(COURSES)]
+        docs.append({
+            "id": str(uuid.uuid4()),
+            "student_id": student_id,
+            "course_name": course_name,
+            "course_code": course_code,
+            "credit": credit,
+            "midterm": random.randint(30, 100),
+            "final": random.randint(30, 100),
+            "grade": random.choice(LETTER_GRADES),
+            "semester": SEMESTERS[position % len(SEMESTERS)],
+            "created_at": now,
+        })
+    return docs
+
+
+async def seed(server, args) -> dict:
+    db = server.db
+    started = time.perf_counter()
+    await server.run_bootstrap(wait=True)
+    if not args.mongo_url:
+        # mongomock has no query planner; its unique indexes only add a full
+        # scan per insert, which makes seeding quadratic
+        for name in server.INDEXES:
+            await db[name].drop_indexes()
+    for name in ("students", "student_grades", "student_attendance", "news"):
+        await db[name].delete_many({"benchmark": True})
+
+    students = int(args.students * args.scale)
+    news = int(args.news * args.scale)
+    password_hash = await server.get_password_hash(STUDENT_PASSWORD)
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+
+    logins = []
+    batch, grades = [], []
+    for index in range(students):
+        doc = student_doc(index, password_hash, now)
+        doc["benchmark"] = True
+        batch.append(doc)
+        if doc["status"] == "approved" and len(logins) < 5000:
+            logins.append(doc["student_no"])
+        grades.extend({**grade, "benchmark": True} for grade in grade_docs(doc["id"], args.grades_per_student, now_iso))
+        if len(batch) >= SEED_BATCH_SIZE:
+            await db.students.insert_many(batch)
+            await db.student_grades.insert_many(grades)
+            batch, grades = [], []
+    if batch:
+        await db.students.insert_many(batch)
+        await db.student_grades.insert_many(grades)
+
+    news_docs = [{
+        "id": str(uuid.uuid4()),
+        "title": f"Haber {index}",
+        "content": "Üniversitemizde gerçekleştirilen etkinlik hakkında ayrıntılar. " * 20,
+        "summary": "Üniversitemizden kısa bir haber özeti.",
+        "image_url": f"https://example.com/news/{index}.jpg",
+        "category": random.choice(["genel", "akademik", "etkinlik"]),
+        "published_date": (now - timedelta(hours=index)).isoformat(),
+        "is_featured": index < 5,
+        "benchmark": True,
+    } for index in range(news)]
+    for start in range(0, len(news_docs), SEED_BATCH_SIZE):
+        await db.news.insert_many(news_docs[start:start + SEED_BATCH_SIZE])
+
+    return {
+        "students": students,
+        "grades": students * args.grades_per_student,
+        "news": news,
+        "seconds": round(time.perf_counter() - started, 2),
+        "logins": logins,
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}  # label -> list of seconds
+        self.errors = {}   # label -> count
+
+    def record(self, label: str, seconds: float, status: int, expected: tuple = (200,)):
+        self.samples.setdefault(label, []).append(seconds)
+        if status not in expected:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for label, samples in sorted(self.samples.items()):
+            values = np.array(samples) * 1000
+            routes[label] = {
+                "count": len(samples),
+                "errors": self.errors.get(label, 0),
+                "mean_ms": round(float(values.mean()), 3),
+                "p50_ms": round(float(np.percentile(values, 50)), 3),
+                "p95_ms": round(float(np.percentile(values, 95)), 3),
+                "p99_ms": round(float(np.percentile(values, 99)), 3),
+                "max_ms": round(float(values.max()), 3),
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {"requests": total, "seconds": round(elapsed, 3), "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0, "routes": routes}
+
+
+async def timed(http, recorder: Recorder, label: str, method: str, url: str, expected: tuple = (200,), **kwargs):
+    started = time.perf_counter()
+    response = await http.request(method, url, **kwargs)
+    recorder.record(label, time.perf_counter() - started, response.status_code, expected)
+    return response
+
+
+async def home_visit(http, recorder, context):
+    """Anonymous visitor: home payload, then one of the public listings."""
+    await timed(http, recorder, "GET /api/home", "GET", "/api/home")
+    page = random.random()
+    if page < 0.5:
+        await timed(http, recorder, "GET /api/news", "GET", "/api/news", params={"limit": 12})
+    elif page < 0.8:
+        await timed(http, recorder, "GET /api/announcements", "GET", "/api/announcements", params={"limit": 20})
+    else:
+        await timed(http, recorder, "GET /api/events", "GET", "/api/events", params={"limit": 12})
+
+
+async def obs_login(http, recorder, context):
+    """Student signs in to OBS and opens the dashboard."""
+    student_no = random.choice(context["logins"])
+    response = await timed(
+        http, recorder, "POST /api/students/login", "POST", "/api/students/login",
+        json={"student_no": student_no, "password": STUDENT_PASSWORD},
+    )
+    if response.status_code != 200:
+        return
+    token = response.json()["access_token"]
+    await timed(
+        http, recorder, "GET /api/students/me/dashboard", "GET", "/api/students/me/dashboard",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+async def admin_listing(http, recorder, context):
+    """Admin pages through and filters the student list."""
+    headers = {"Authorization": f"Bearer {context['admin_token']}"}
+    params = random.choice([
+        {"limit": 50},
+        {"limit": 50, "status": "pending"},
+        {"limit": 50, "department": random.choice(DEPARTMENTS), "sort": "gpa", "order": "desc"},
+        {"limit": 50, "q": random.choice(["Ahmet", "Kaya", "2023"])},
+    ])
+    response = await timed(http, recorder, "GET /api/students", "GET", "/api/students", params=params, headers=headers)
+    cursor = response.headers.get("x-next-cursor")
+    if cursor:
+        await timed(http, recorder, "GET /api/students (next page)", "GET", "/api/students", params={**params, "after": cursor}, headers=headers)
+
+
+async def registration_burst(http, recorder, context):
+    """New-term registrations arriving together."""
+    suffix = next(context["registrations"])
+    await timed(http, recorder, "POST /api/students/register", "POST", "/api/students/register", json={
+        "tc_no": f"{90_000_000_000 + suffix}",
+        "first_name": "Yeni",
+        "last_name": "Öğrenci",
+        "email": f"new{suffix}@student.ata.edu.tr",
+        "phone": "0555 000 00 00",
+        "department": random.choice(DEPARTMENTS),
+        "class_level": "1",
+        "password": STUDENT_PASSWORD,
+    })
+
+
+SCENARIOS = {
+    "home": home_visit,
+    "obs_login": obs_login,
+    "admin_listing": admin_listing,
+    "registration_burst": registration_burst,
+}
+
+
+async def run_scenario(http, scenario, context, requests: int, concurrency: int) -> dict:
+    recorder = Recorder()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            await scenario(http, recorder, context)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> list:
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        old_routes = baseline.get("scenarios", {}).get(name, {}).get("routes", {})
+        for label, stats in scenario["routes"].items():
+            old = old_routes.get(label)
+            if old and old["p95_ms"] > 0 and stats["p95_ms"] > old["p95_ms"] * (1 + threshold):
+                regressions.append(f"{name} {label}: p95 {old['p95_ms']}ms -> {stats['p95_ms']}ms")
+    return regressions
+
+
+def serialization_samples(server) -> dict:
+    """1k raw Mongo-shaped documents for each list endpoint model."""
+    now = datetime.now(timezone.utc)
+    students = [student_doc(index, "x", now) for index in range(1000)]
+    for doc in students:
+        doc.pop("password")
+    schedules = [{
+        "id": str(uuid.uuid4()), "department_id": "d1", "day": "Pazartesi", "start_time": "09:00", "end_time": "11:00",
+        "course_name": COURSES[index % len(COURSES)][0], "room": f"A{index:03d}", "instructor": "Prof. Dr. Ahmet Yılmaz",
+        "created_at": now.isoformat(),
+    } for index in range(1000)]
+    staff = [{
+        "id": str(uuid.uuid4()), "name": f"Öğretim Üyesi {index}", "title": "Doç. Dr.", "department": DEPARTMENTS[index % len(DEPARTMENTS)],
+        "email": f"staff{index}@ata.edu.tr", "bio": "Araştırma alanları: yazılım mühendisliği. " * 5, "order": index,
+        "created_at": now.isoformat(),
+    } for index in range(1000)]
+    return {
+        "StudentProfile": (server.StudentProfile, students),
+        "StudentGrade": (server.StudentGrade, grade_docs("s1", 1000, now.isoformat())),
+        "CourseSchedule": (server.CourseSchedule, schedules),
+        "AcademicStaff": (server.AcademicStaff, staff),
+    }
+
+
+async def run_serialization(server, rounds: int) -> dict:
+    from typing import List
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    async def legacy(model, field, docs):
+        # What the handlers used to do, followed by FastAPI's response_model pass
+        content = await serialize_response(field=field, response_content=[model(**doc) for doc in docs])
+        return JSONResponse(content).body
+
+    async def fast(model, field, docs):
+        return server.list_response(model, docs).body
+
+    results = {}
+    for name, (model, docs) in serialization_samples(server).items():
+        field = create_response_field(f"Response_{name}", List[model])
+        timings = {}
+        for label, path in (("legacy", legacy), ("fast", fast)):
+            await path(model, field, docs)  # warm up adapters and schema caches
+            started = time.process_time()
+            for _ in range(rounds):
+                await path(model, field, docs)
+            timings[label] = (time.process_time() - started) / rounds * 1000
+        assert json.loads(await legacy(model, field, docs)) == json.loads(await fast(model, field, docs))
+        results[name] = {
+            "legacy_cpu_ms_per_1k": round(timings["legacy"], 3),
+            "fast_cpu_ms_per_1k": round(timings["fast"], 3),
+            "speedup": round(timings["legacy"] / timings["fast"], 2) if timings["fast"] else None,
+        }
+    return results
+
+
+def print_report(results: dict):
+    for name, scenario in results["scenarios"].items():
+        print(f"\n{name}: {scenario['requests']} requests in {scenario['seconds']}s ({scenario['throughput_rps']} req/s)")
+        print(f"  {'route':<40} {'count':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for label, stats in scenario["routes"].items():
+            print(f"  {label:<40} {stats['count']:>7} {stats['errors']:>5} {stats['p50_ms']:>8.2f}ms {stats['p95_ms']:>8.2f}ms {stats['p99_ms']:>8.2f}ms")
+
+
+async def main():
+    args = parse_args()
+    random.seed(args.seed)
+    server = load_app(args)
+    import httpx
+
+    if args.serialization:
+        results = {
+            "meta": {"commit": git_commit(), "timestamp": datetime.now(timezone.utc).isoformat(), "python": platform.python_version(), "rounds": args.rounds},
+            "serialization": await run_serialization(server, args.rounds),
+        }
+        for name, stats in results["serialization"].items():
+            print(f"{name:<16} legacy {stats['legacy_cpu_ms_per_1k']:>8.2f}ms  fast {stats['fast_cpu_ms_per_1k']:>8.2f}ms  x{stats['speedup']}")
+        if args.output:
+            with open(args.output, "w") as handle:
+                json.dump(results, handle, indent=2, ensure_ascii=False)
+        server.password_pool.shutdown()
+        return
+
+    print("Seeding...", flush=True)
+    seeded = await seed(server, args)
+    print(f"Seeded {seeded['students']} students, {seeded['grades']} grades, {seeded['news']} news in {seeded['seconds']}s")
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+        response = await http.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+        response.raise_for_status()
+        context = {
+            "admin_token": response.json()["access_token"],
+            "logins": seeded.pop("logins"),
+            # Offset by start time so reruns against a real database do not collide on tc_no
+            "registrations": iter(range(int(time.time()) % 10**6 * 1000, 10**10)),
+        }
+
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "backend": "mongodb" if args.mongo_url else "mongomock",
+                "requests_per_scenario": args.requests,
+                "concurrency": args.concurrency,
+                "seed": seeded,
+            },
+            "scenarios": {},
+        }
+        for name in args.scenarios.split(","):
+            if name not in SCENARIOS:
+                sys.exit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+            print(f"Running {name}...", flush=True)
+            results["scenarios"][name] = await run_scenario(http, SCENARIOS[name], context, args.requests, args.concurrency)
+
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2, ensure_ascii=False)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+    server.password_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
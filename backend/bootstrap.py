@@ -0,0 +1,24 @@
+"""
+Create indexes and seed data ahead of starting the API workers.
+
+    python bootstrap.py
+
+Waits for the bootstrap lock if another process holds it, so it is safe to run
+from several deploy hooks at once.
+"""
+import asyncio
+import logging
+
+from server import run_bootstrap, client
+
+
+async def main():
+    try:
+        applied = await run_bootstrap(wait=True)
+        logging.info("Bootstrap finished" if applied else "Schema already up to date")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,25 +1,165 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse, PlainTextResponse, FileResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, ASCENDING, DESCENDING, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import OperationFailure, DuplicateKeyError, BulkWriteError
 import os
+import asyncio
+import hashlib
+import hmac
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, TypeAdapter, ValidationError, create_model
+from typing import Dict, List, Optional
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import uuid
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 import jwt
 import httpx
+import numpy as np
+import base64
+import json
+import time
+import csv
+import io
+import re
+import bisect
+import math
+import threading
+import tempfile
+import shutil
+import fcntl
+import multiprocessing
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics. A small Prometheus-compatible registry: counters, gauges and
+# fixed-bucket histograms keyed by label values. Observations are a bisect and
+# a couple of increments under a lock (the Mongo listener runs on driver
+# threads), and the text exposition is only built when /metrics is scraped.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        metrics_registry.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in values]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # per-bucket counts (last slot is +Inf), sum
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = self.header()
+        names = self.labels + ("le",)
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+metrics_registry = []
+
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+HTTP_RESPONSE_BYTES = Histogram("http_response_size_bytes", "HTTP response body size by route template.", ("method", "route"), buckets=SIZE_BUCKETS)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.")
+MONGO_COMMAND_SECONDS = Histogram("mongodb_command_duration_seconds", "MongoDB command latency by collection.", ("command", "collection"))
+MONGO_COMMAND_FAILURES = Counter("mongodb_command_failures_total", "Failed MongoDB commands by collection.", ("command", "collection"))
+PASSWORD_HASH_SECONDS = Histogram("password_hash_duration_seconds", "Time spent inside bcrypt per hash or verify.")
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every driver command. Started events carry the collection name, completions do not."""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        # getMore carries the cursor id under its own name and the collection separately
+        collection = target if isinstance(target, str) else event.command.get("collection", "-")
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, event.command_name, collection)
+
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, event.command_name, collection)
+        MONGO_COMMAND_FAILURES.inc(event.command_name, collection)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 db = client[os.environ['DB_NAME']]
 
 # Security
@@ -71,6 +211,7 @@ class News(BaseModel):
     content: str
     summary: str
     image_url: str
+    image_srcset: Optional[str] = None  # "url 320w, url 800w, ..." for uploaded images
     category: str = "genel"
     published_date: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     is_featured: bool = False
@@ -80,6 +221,7 @@ class NewsCreate(BaseModel):
     content: str
     summary: str
     image_url: str
+    image_srcset: Optional[str] = None
     category: str = "genel"
     is_featured: bool = False
 
@@ -128,6 +270,7 @@ class AcademicUnit(BaseModel):
     contact_phone: Optional[str] = None
     departments: List[str] = []
     image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class AcademicUnitCreate(BaseModel):
@@ -139,6 +282,7 @@ class AcademicUnitCreate(BaseModel):
     contact_phone: Optional[str] = None
     departments: List[str] = []
     image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
 
 class SliderImage(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -146,6 +290,7 @@ class SliderImage(BaseModel):
     title: str
     subtitle: Optional[str] = None
     image_url: str
+    image_srcset: Optional[str] = None
     link_url: Optional[str] = None
     order: int = 0
     is_active: bool = True
@@ -155,6 +300,7 @@ class SliderImageCreate(BaseModel):
     title: str
     subtitle: Optional[str] = None
     image_url: str
+    image_srcset: Optional[str] = None
     link_url: Optional[str] = None
     order: int = 0
     is_active: bool = True
@@ -288,6 +434,7 @@ class AcademicStaff(BaseModel):
     office: Optional[str] = None
     bio: Optional[str] = None
     image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
     order: int = 0
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
@@ -300,6 +447,7 @@ class AcademicStaffCreate(BaseModel):
     office: Optional[str] = None
     bio: Optional[str] = None
     image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
     order: int = 0
 
 class AcademicStaffUpdate(BaseModel):
@@ -311,6 +459,7 @@ class AcademicStaffUpdate(BaseModel):
     office: Optional[str] = None
     bio: Optional[str] = None
     image_url: Optional[str] = None
+    image_srcset: Optional[str] = None
     order: Optional[int] = None
 
 class AcademicCalendar(BaseModel):
@@ -458,6 +607,23 @@ class Student(BaseModel):
     approved_at: Optional[str] = None
     approved_by: Optional[str] = None
 
+class StudentProfile(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    student_no: str
+    tc_no: str
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    department: str
+    class_level: str
+    status: str = "pending"
+    gpa: float = 0.0
+    created_at: str
+    approved_at: Optional[str] = None
+    approved_by: Optional[str] = None
+
 class StudentRegister(BaseModel):
     tc_no: str
     first_name: str
@@ -535,12 +701,106 @@ class StudentAttendanceUpdate(BaseModel):
     total_hours: Optional[int] = None
     attended_hours: Optional[int] = None
 
+class HomeNews(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    summary: str
+    image_url: str
+    image_srcset: Optional[str] = None
+    category: str = "genel"
+    published_date: str
+    is_featured: bool = False
+
+class HomePayload(BaseModel):
+    slider: List[SliderImage]
+    news: List[HomeNews]
+    announcements: List[Announcement]
+    settings: Settings
+    footer_settings: FooterSettings
+
+class SemesterGrades(BaseModel):
+    semester: str
+    gpa: float
+    credits: int
+    grades: List[StudentGrade]
+
+class AttendanceStatus(StudentAttendance):
+    at_risk: bool
+    limit_exceeded: bool
+
+class StudentDashboard(BaseModel):
+    student: StudentProfile
+    semesters: List[SemesterGrades]
+    attendance: List[AttendanceStatus]
+
+# Password hashing pool. bcrypt takes a few hundred milliseconds of CPU, so it
+# runs in a bounded thread pool (bcrypt releases the GIL) instead of on the
+# event loop. When more than PASSWORD_QUEUE_LIMIT jobs are waiting, new ones
+# are rejected with 503 rather than piling up behind each other.
+PASSWORD_WORKERS = int(os.environ.get('PASSWORD_WORKERS', str(os.cpu_count() or 2)))
+PASSWORD_QUEUE_LIMIT = int(os.environ.get('PASSWORD_QUEUE_LIMIT', '64'))
+
+class PasswordPool:
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self._lock = threading.Lock()  # _timed runs on the worker threads
+
+    def _timed(self, submitted_at: float, fn, *args):
+        started_at = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.monotonic() - started_at
+            with self._lock:
+                self.wait_seconds += started_at - submitted_at
+                self.run_seconds += elapsed
+            PASSWORD_HASH_SECONDS.observe(elapsed)
+
+    async def run(self, fn, *args):
+        if self.pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Sunucu yoğun, lütfen tekrar deneyin", headers={"Retry-After": "1"})
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, time.monotonic(), fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            wait_seconds, run_seconds = self.wait_seconds, self.run_seconds
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_progress": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_total": round(wait_seconds, 3),
+            "run_seconds_total": round(run_seconds, 3),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_pool = PasswordPool(PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT)
+
 # Helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_pool.run(pwd_context.verify, plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_pool.run(pwd_context.hash, password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -549,6 +809,75 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Resolved principals are cached briefly so bursts of authenticated requests
+# (admin dashboard, OBS dashboard) do not repeat the same user/student lookup.
+# Writers bump a shared "principals" counter in cache_versions; each worker
+# compares it at most every PRINCIPAL_VERSION_CHECK seconds and drops its whole
+# cache when it moved, so a deleted or rejected account stops authenticating
+# on every worker within that interval.
+PRINCIPAL_CACHE_TTL = float(os.environ.get('PRINCIPAL_CACHE_TTL', '30'))
+PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', '2048'))
+PRINCIPAL_VERSION_CHECK = float(os.environ.get('PRINCIPAL_VERSION_CHECK', '2'))
+
+class PrincipalCache:
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # (kind, subject) -> (principal, expires_at)
+        self.version = None
+        self.checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    async def _sync(self):
+        now = time.monotonic()
+        if self.version is not None and now - self.checked_at < PRINCIPAL_VERSION_CHECK:
+            return
+        self.checked_at = now
+        doc = await db.cache_versions.find_one({"_id": "principals"})
+        version = doc["version"] if doc else 0
+        if version != self.version:
+            self._entries.clear()
+            self.version = version
+
+    def _get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    async def resolve(self, kind: str, subject: str, loader):
+        """Return the cached principal for `subject`, loading it with `loader` on a miss (None if not found)."""
+        await self._sync()
+        key = (kind, subject)
+        principal = self._get(key)
+        if principal is not None:
+            return principal
+        version = self.version
+        principal = await loader()
+        # A load that raced with an invalidation is returned but not kept
+        if principal is not None and version == self.version:
+            self._entries[key] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    async def invalidate(self, kind: str, principal_id: str):
+        stale = [key for key, (principal, _) in self._entries.items() if key[0] == kind and principal.id == principal_id]
+        for key in stale:
+            del self._entries[key]
+        await db.cache_versions.update_one({"_id": "principals"}, {"$inc": {"version": 1}}, upsert=True)
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "version": self.version or 0}
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
@@ -557,10 +886,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = await db.users.find_one({"username": username}, {"_id": 0})
-        if user is None:
+        async def load_user():
+            user = await db.users.find_one({"username": username}, {"_id": 0})
+            return User(**user) if user else None
+
+        current_user = await principal_cache.resolve("user", username, load_user)
+        if current_user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return User(**user)
+        return current_user
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except Exception:
@@ -571,195 +904,774 @@ async def get_current_admin(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
-# Startup event to create default admin and sample data
-@app.on_event("startup")
-async def create_default_admin():
-    existing_admin = await db.users.find_one({"username": "admin"})
-    if not existing_admin:
-        hashed_password = get_password_hash("admin123")
-        default_admin = User(
-            username="admin",
-            email="admin@ata.edu.tr",
-            full_name="System Administrator",
-            role="admin"
+# Keyset pagination helpers
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+LEGACY_LIST_LIMIT = 1000
+
+def encode_cursor(doc: dict, sort_key: str) -> str:
+    raw = json.dumps([doc.get(sort_key), doc["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(padded))
+        return sort_value, str(doc_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def paginate(collection, query: dict, sort_key: str, response: Response,
+                   limit: Optional[int] = None, after: Optional[str] = None,
+                   before: Optional[str] = None, projection: Optional[dict] = None):
+    """
+    Keyset pagination over (sort_key desc, id desc). Requests without limit or
+    cursors get the legacy behaviour (newest LEGACY_LIST_LIMIT documents).
+    Cursors for the neighbouring pages are returned in the X-Next-Cursor and
+    X-Prev-Cursor headers so the response body keeps its list shape.
+    """
+    projection = projection or {"_id": 0}
+    if limit is None and after is None and before is None:
+        return await collection.find(query, projection).sort([(sort_key, -1), ("id", -1)]).to_list(LEGACY_LIST_LIMIT)
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Use either 'after' or 'before', not both")
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    page_query = query
+    direction = -1
+    if after is not None or before is not None:
+        value, doc_id = decode_cursor(after if after is not None else before)
+        op = "$lt" if after is not None else "$gt"
+        cursor_filter = {"$or": [{sort_key: {op: value}}, {sort_key: value, "id": {op: doc_id}}]}
+        page_query = {"$and": [query, cursor_filter]} if query else cursor_filter
+        if before is not None:
+            direction = 1
+
+    # The cursor needs sort_key and id even if the caller projected them away
+    fetch_projection = dict(projection)
+    if any(v for k, v in fetch_projection.items() if k != "_id"):
+        fetch_projection.update({sort_key: 1, "id": 1})
+    docs = await collection.find(page_query, fetch_projection).sort(
+        [(sort_key, direction), ("id", direction)]
+    ).limit(limit + 1).to_list(limit + 1)
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    if direction == 1:
+        docs.reverse()
+
+    if docs:
+        if has_more or before is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(docs[-1], sort_key)
+        if after is not None or (before is not None and has_more):
+            response.headers["X-Prev-Cursor"] = encode_cursor(docs[0], sort_key)
+    return docs
+
+# Sparse fieldsets: `?fields=id,title,summary` becomes a Mongo projection and
+# the response is validated against a partial model holding only those fields.
+def parse_fields(model, fields: Optional[str]) -> Optional[tuple]:
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return tuple(dict.fromkeys(requested))
+
+def fields_projection(fields: Optional[tuple]) -> dict:
+    projection = {"_id": 0}
+    if fields:
+        projection.update({name: 1 for name in fields})
+    return projection
+
+@lru_cache(maxsize=256)
+def partial_list_adapter(model, fields: tuple) -> TypeAdapter:
+    definitions = {name: (Optional[model.model_fields[name].annotation], None) for name in fields}
+    partial = create_model(f"{model.__name__}Partial", __config__=ConfigDict(extra="ignore"), **definitions)
+    return TypeAdapter(List[partial])
+
+def sparse_response(model, fields: tuple, docs: list, response: Optional[Response] = None) -> Response:
+    return json_list_response(partial_list_adapter(model, fields), docs, response)
+
+# List fast path. Returning model instances makes FastAPI validate them a second
+# time against response_model and then run jsonable_encoder over the result.
+# Validating the raw Mongo documents once with a cached TypeAdapter and letting
+# pydantic-core write the JSON bytes skips both passes; the output is the same
+# (defaults filled, unknown fields dropped).
+@lru_cache(maxsize=None)
+def list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+def json_list_response(adapter: TypeAdapter, docs: list, response: Optional[Response] = None) -> Response:
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=adapter.dump_json(adapter.validate_python(docs)), media_type="application/json", headers=headers)
+
+def list_response(model, docs: list, response: Optional[Response] = None) -> Response:
+    """Serialize Mongo documents as a JSON list of `model`, carrying over headers set on `response`."""
+    return json_list_response(list_adapter(model), docs, response)
+
+# Singleton settings cache. Each worker keeps the settings documents in memory
+# and, once the TTL has passed, compares a per-document version counter stored
+# in Mongo before trusting its copy. Writers bump the counter, so every worker
+# sees an update within SETTINGS_CACHE_TTL seconds and the writing worker sees
+# it immediately.
+SETTINGS_CACHE_TTL = float(os.environ.get('SETTINGS_CACHE_TTL', '10'))
+
+class SingletonCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}  # name -> (document, version, checked_at)
+        self._locks = {}
+
+    async def _version(self, name: str) -> int:
+        doc = await db.cache_versions.find_one({"_id": name})
+        return doc["version"] if doc else 0
+
+    def _fresh(self, name: str):
+        entry = self._entries.get(name)
+        if entry and time.monotonic() - entry[2] < self.ttl:
+            return entry
+        return None
+
+    async def get(self, name: str, loader=None):
+        """Return the cached value for `name`, loading it with `loader` (default: the collection's single document)."""
+        entry = self._fresh(name)
+        if entry:
+            return entry[0]
+
+        # Only one coroutine per worker refreshes a given entry
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            entry = self._fresh(name)
+            if entry:
+                return entry[0]
+
+            entry = self._entries.get(name)
+            version = await self._version(name)
+            now = time.monotonic()
+            if entry and entry[1] == version:
+                self._entries[name] = (entry[0], version, now)
+                return entry[0]
+
+            value = await (loader() if loader else db[name].find_one({}, {"_id": 0}))
+            self._entries[name] = (value, version, now)
+            return value
+
+    async def invalidate(self, name: str):
+        self._entries.pop(name, None)
+        await db.cache_versions.update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+
+settings_cache = SingletonCache(SETTINGS_CACHE_TTL)
+
+class SingleFlightCache:
+    """TTL cache where concurrent misses for the same key share one load."""
+    def __init__(self, ttl: float, max_size: int = 4096):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._inflight = {}
+
+    async def get(self, key, loader):
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        return await asyncio.shield(task)
+
+    def _store(self, key, task):
+        # A load that was invalidated while in flight is returned but not kept
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._entries[key] = (task.result(), time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+# Per-student OBS dashboard data (profile, grades and attendance). Entries are
+# keyed by a per-student counter in cache_versions; writers bump it, so a write
+# on any worker retires every worker's copy on its next request.
+STUDENT_DASHBOARD_TTL = float(os.environ.get('STUDENT_DASHBOARD_TTL', '60'))
+dashboard_cache = SingleFlightCache(STUDENT_DASHBOARD_TTL, max_size=10000)
+
+async def dashboard_version(student_id: str) -> int:
+    doc = await db.cache_versions.find_one({"_id": f"dashboard:{student_id}"})
+    return doc["version"] if doc else 0
+
+async def invalidate_dashboards(student_ids):
+    updates = [
+        UpdateOne({"_id": f"dashboard:{student_id}"}, {"$inc": {"version": 1}}, upsert=True)
+        for student_id in set(student_ids)
+    ]
+    if updates:
+        await db.cache_versions.bulk_write(updates, ordered=False)
+
+# Composed home page payload, invalidated by slider/news/announcement/settings writes
+HOME_CACHE_TTL = float(os.environ.get('HOME_CACHE_TTL', '30'))
+HOME_NEWS_LIMIT = 3
+HOME_ANNOUNCEMENTS_LIMIT = 6
+home_cache = SingletonCache(HOME_CACHE_TTL)
+
+# Index registry: every collection is looked up by its UUID `id`, plus the
+# natural keys and sort keys used by the endpoints below.
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "news": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("published_date", DESCENDING), ("id", DESCENDING)], name="published_date_id_desc"),
+    ],
+    "announcements": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING), ("published_date", DESCENDING), ("id", DESCENDING)], name="active_published_date_id"),
+    ],
+    "events": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("event_date", DESCENDING), ("id", DESCENDING)], name="event_date_id_desc"),
+    ],
+    "academic_units": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("type", ASCENDING)], name="type"),
+    ],
+    "slider_images": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING), ("order", ASCENDING)], name="active_order"),
+    ],
+    "quick_links": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("is_active", ASCENDING), ("order", ASCENDING)], name="active_order"),
+    ],
+    "footer_links": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("category", ASCENDING), ("order", ASCENDING)], name="category_order"),
+    ],
+    "contact_messages": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id_desc"),
+    ],
+    "academic_staff": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order", ASCENDING)], name="order"),
+    ],
+    "academic_calendar": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order", ASCENDING)], name="order"),
+    ],
+    "course_departments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order", ASCENDING)], name="order"),
+    ],
+    "images": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "rate_limits": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "course_schedules": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("department_id", ASCENDING)], name="department_id"),
+    ],
+    "students": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_no", ASCENDING)], name="student_no_unique", unique=True),
+        IndexModel([("tc_no", ASCENDING)], name="tc_no_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id_desc"),
+        # Admin listing: one (sort, id) index per STUDENT_SORT_FIELDS key, plus
+        # (filter, created_at, id) for the status and department filters
+        IndexModel([("student_no", ASCENDING), ("id", ASCENDING)], name="student_no_id"),
+        IndexModel([("first_name", ASCENDING), ("id", ASCENDING)], name="first_name_id"),
+        IndexModel([("last_name", ASCENDING), ("id", ASCENDING)], name="last_name_id"),
+        IndexModel([("department", ASCENDING), ("id", ASCENDING)], name="department_id"),
+        IndexModel([("gpa", ASCENDING), ("id", ASCENDING)], name="gpa_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("department", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="department_created_at_id"),
+        IndexModel([("department", ASCENDING), ("class_level", ASCENDING)], name="department_class_level"),
+    ],
+    "student_grades": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING), ("semester", ASCENDING)], name="student_semester"),
+    ],
+    "student_attendance": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("student_id", ASCENDING), ("course_name", ASCENDING)], name="student_course_unique", unique=True),
+    ],
+}
+
+def _index_spec(info: dict) -> tuple:
+    key = info["key"]
+    items = key.items() if hasattr(key, "items") else key
+    return (tuple((k, int(v)) for k, v in items), bool(info.get("unique", False)))
+
+async def ensure_indexes():
+    """
+    Create every index declared in INDEXES. Safe to run on every boot: existing
+    indexes with a matching spec are left alone. Returns a drift report of
+    indexes whose spec differs from the registry or that are not declared.
+    """
+    report = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        drift = {"conflicting": [], "undeclared": []}
+        to_create = []
+        for model in models:
+            wanted = _index_spec(model.document)
+            name = model.document["name"]
+            if name not in existing:
+                to_create.append(model)
+            elif _index_spec(existing[name]) != wanted:
+                drift["conflicting"].append(name)
+        declared = {model.document["name"] for model in models}
+        drift["undeclared"] = [name for name in existing if name != "_id_" and name not in declared]
+
+        for model in to_create:
+            try:
+                await collection.create_indexes([model])
+            except OperationFailure as e:
+                # Usually duplicate data blocking a unique index; keep booting
+                drift["conflicting"].append(model.document["name"])
+                logging.error(f"Index {collection_name}.{model.document['name']} could not be created: {e}")
+
+        if drift["conflicting"] or drift["undeclared"]:
+            logging.warning(f"Index drift on {collection_name}: {drift}")
+            report[collection_name] = drift
+    return report
+
+# Bootstrap: index creation and seed data run as numbered migrations guarded by
+# a schema marker and a lock document, so only one process ever seeds and
+# workers whose marker is current start after a single round trip. Run
+# `python bootstrap.py` as a deploy step and set BOOTSTRAP_ON_STARTUP=false to
+# keep workers out of it entirely.
+BOOTSTRAP_ON_STARTUP = os.environ.get('BOOTSTRAP_ON_STARTUP', 'true').lower() == 'true'
+BOOTSTRAP_LOCK_TTL = float(os.environ.get('BOOTSTRAP_LOCK_TTL', '120'))
+
+async def acquire_lock(name: str, ttl: float) -> Optional[str]:
+    """Take the named lock unless another owner holds an unexpired lease. Returns the owner token."""
+    owner = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    try:
+        await db.locks.update_one(
+            {"_id": name, "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl)}},
+            upsert=True,
         )
-        doc = default_admin.model_dump()
-        doc['password'] = hashed_password
+    except DuplicateKeyError:
+        return None
+    return owner
+
+async def release_lock(name: str, owner: str):
+    await db.locks.delete_one({"_id": name, "owner": owner})
+
+def indexes_fingerprint() -> str:
+    spec = {name: [model.document for model in models] for name, models in INDEXES.items()}
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+async def seed_default_admin():
+    if await db.users.find_one({"username": "admin"}, {"_id": 1}):
+        return
+    default_admin = User(
+        username="admin",
+        email="admin@ata.edu.tr",
+        full_name="System Administrator",
+        role="admin"
+    )
+    doc = default_admin.model_dump()
+    doc['password'] = await get_password_hash("admin123")
+    try:
         await db.users.insert_one(doc)
         logging.info("Default admin user created")
+    except DuplicateKeyError:
+        pass
+
+async def seed_course_schedules():
+    if await db.course_departments.find_one({}, {"_id": 1}):
+        return
+    departments = [
+        CourseDepartment(id=str(uuid.uuid4()), name="Bilgisayar Programcılığı", order=1),
+        CourseDepartment(id=str(uuid.uuid4()), name="Yazılım Mühendisliği", order=2)
+    ]
+    dept_bp = departments[0]  # Bilgisayar Programcılığı
+    dept_ym = departments[1]  # Yazılım Mühendisliği
     
-    # Create course departments if they don't exist
-    existing_depts = await db.course_departments.count_documents({})
-    if existing_depts == 0:
-        departments = [
-            CourseDepartment(id=str(uuid.uuid4()), name="Bilgisayar Programcılığı", order=1),
-            CourseDepartment(id=str(uuid.uuid4()), name="Yazılım Mühendisliği", order=2)
-        ]
-        for dept in departments:
-            await db.course_departments.insert_one(dept.model_dump())
-        logging.info("Course departments created")
-        
-        # Create sample course schedules
-        dept_bp = departments[0]  # Bilgisayar Programcılığı
-        dept_ym = departments[1]  # Yazılım Mühendisliği
-        
-        # Bilgisayar Programcılığı schedules
-        bp_schedules = [
-            CourseSchedule(department_id=dept_bp.id, day="Pazartesi", start_time="09:00", end_time="11:00", course_name="Programlama Temelleri", room="A101", instructor="Prof. Dr. Ahmet Yılmaz"),
-            CourseSchedule(department_id=dept_bp.id, day="Pazartesi", start_time="11:00", end_time="13:00", course_name="Veri Yapıları", room="A102", instructor="Doç. Dr. Mehmet Demir"),
-            CourseSchedule(department_id=dept_bp.id, day="Salı", start_time="09:00", end_time="11:00", course_name="Veritabanı Yönetimi", room="B201", instructor="Dr. Öğr. Üyesi Ayşe Kaya"),
-            CourseSchedule(department_id=dept_bp.id, day="Salı", start_time="13:00", end_time="15:00", course_name="Web Programlama", room="B202", instructor="Öğr. Gör. Fatma Çelik"),
-            CourseSchedule(department_id=dept_bp.id, day="Çarşamba", start_time="10:00", end_time="12:00", course_name="Nesne Yönelimli Programlama", room="A103", instructor="Prof. Dr. Ahmet Yılmaz"),
-            CourseSchedule(department_id=dept_bp.id, day="Perşembe", start_time="09:00", end_time="11:00", course_name="Algoritma Analizi", room="C301", instructor="Doç. Dr. Mehmet Demir"),
-            CourseSchedule(department_id=dept_bp.id, day="Perşembe", start_time="14:00", end_time="16:00", course_name="Mobil Uygulama Geliştirme", room="B203", instructor="Dr. Öğr. Üyesi Ayşe Kaya"),
-            CourseSchedule(department_id=dept_bp.id, day="Cuma", start_time="10:00", end_time="12:00", course_name="İşletim Sistemleri", room="A104", instructor="Öğr. Gör. Fatma Çelik"),
-        ]
-        
-        # Yazılım Mühendisliği schedules
-        ym_schedules = [
-            CourseSchedule(department_id=dept_ym.id, day="Pazartesi", start_time="09:00", end_time="11:00", course_name="Yazılım Mühendisliği Temelleri", room="D401", instructor="Prof. Dr. Can Öztürk"),
-            CourseSchedule(department_id=dept_ym.id, day="Pazartesi", start_time="13:00", end_time="15:00", course_name="Yazılım Tasarımı ve Mimarisi", room="D402", instructor="Doç. Dr. Zeynep Aydın"),
-            CourseSchedule(department_id=dept_ym.id, day="Salı", start_time="10:00", end_time="12:00", course_name="Yazılım Test ve Kalite", room="E501", instructor="Dr. Öğr. Üyesi Emre Şahin"),
-            CourseSchedule(department_id=dept_ym.id, day="Salı", start_time="14:00", end_time="16:00", course_name="Yazılım Proje Yönetimi", room="E502", instructor="Öğr. Gör. Selin Arslan"),
-            CourseSchedule(department_id=dept_ym.id, day="Çarşamba", start_time="09:00", end_time="11:00", course_name="Yapay Zeka ve Makine Öğrenmesi", room="D403", instructor="Prof. Dr. Can Öztürk"),
-            CourseSchedule(department_id=dept_ym.id, day="Perşembe", start_time="10:00", end_time="12:00", course_name="Bulut Bilişim ve DevOps", room="E503", instructor="Doç. Dr. Zeynep Aydın"),
-            CourseSchedule(department_id=dept_ym.id, day="Perşembe", start_time="13:00", end_time="15:00", course_name="Siber Güvenlik", room="D404", instructor="Dr. Öğr. Üyesi Emre Şahin"),
-            CourseSchedule(department_id=dept_ym.id, day="Cuma", start_time="09:00", end_time="11:00", course_name="Büyük Veri ve Analitik", room="E504", instructor="Öğr. Gör. Selin Arslan"),
-        ]
-        
-        all_schedules = bp_schedules + ym_schedules
-        for schedule in all_schedules:
-            await db.course_schedules.insert_one(schedule.model_dump())
-        logging.info("Course schedules created")
-    
-    # Create academic calendar if doesn't exist
-    existing_calendar = await db.academic_calendar.count_documents({})
-    if existing_calendar == 0:
-        calendar_events = [
-            # Güz Dönemi 2024-2025
-            AcademicCalendar(title="Güz Dönemi Kayıt", start_date="2024-09-16", end_date="2024-09-27", semester="Güz", year="2024-2025", description="Güz dönemi öğrenci kayıt işlemleri", order=1),
-            AcademicCalendar(title="Güz Dönemi Ders Başlangıcı", start_date="2024-10-01", end_date="2024-10-01", semester="Güz", year="2024-2025", description="Güz dönemi derslerinin başlangıcı", order=2),
-            AcademicCalendar(title="Ara Sınav Dönemi", start_date="2024-11-18", end_date="2024-11-29", semester="Güz", year="2024-2025", description="Güz dönemi ara sınav haftası", order=3),
-            AcademicCalendar(title="Yarıyıl Tatili", start_date="2025-01-27", end_date="2025-02-02", semester="Güz", year="2024-2025", description="Yarıyıl tatili", order=4),
-            AcademicCalendar(title="Final Sınav Dönemi", start_date="2025-01-13", end_date="2025-01-24", semester="Güz", year="2024-2025", description="Güz dönemi final sınav haftası", order=5),
-            AcademicCalendar(title="Bütünleme Sınav Dönemi", start_date="2025-02-03", end_date="2025-02-07", semester="Güz", year="2024-2025", description="Güz dönemi bütünleme sınav haftası", order=6),
-            
-            # Bahar Dönemi 2024-2025
-            AcademicCalendar(title="Bahar Dönemi Kayıt", start_date="2025-02-10", end_date="2025-02-21", semester="Bahar", year="2024-2025", description="Bahar dönemi öğrenci kayıt işlemleri", order=7),
-            AcademicCalendar(title="Bahar Dönemi Ders Başlangıcı", start_date="2025-02-24", end_date="2025-02-24", semester="Bahar", year="2024-2025", description="Bahar dönemi derslerinin başlangıcı", order=8),
-            AcademicCalendar(title="Ulusal Egemenlik ve Çocuk Bayramı", start_date="2025-04-23", end_date="2025-04-23", semester="Bahar", year="2024-2025", description="Resmi tatil", order=9),
-            AcademicCalendar(title="Ara Sınav Dönemi", start_date="2025-04-14", end_date="2025-04-25", semester="Bahar", year="2024-2025", description="Bahar dönemi ara sınav haftası", order=10),
-            AcademicCalendar(title="Emek ve Dayanışma Günü", start_date="2025-05-01", end_date="2025-05-01", semester="Bahar", year="2024-2025", description="Resmi tatil", order=11),
-            AcademicCalendar(title="Ramazan Bayramı", start_date="2025-03-30", end_date="2025-04-01", semester="Bahar", year="2024-2025", description="Resmi tatil", order=12),
-            AcademicCalendar(title="Final Sınav Dönemi", start_date="2025-06-02", end_date="2025-06-13", semester="Bahar", year="2024-2025", description="Bahar dönemi final sınav haftası", order=13),
-            AcademicCalendar(title="Bütünleme Sınav Dönemi", start_date="2025-06-16", end_date="2025-06-20", semester="Bahar", year="2024-2025", description="Bahar dönemi bütünleme sınav haftası", order=14),
-        ]
+    # Bilgisayar Programcılığı schedules
+    bp_schedules = [
+        CourseSchedule(department_id=dept_bp.id, day="Pazartesi", start_time="09:00", end_time="11:00", course_name="Programlama Temelleri", room="A101", instructor="Prof. Dr. Ahmet Yılmaz"),
+        CourseSchedule(department_id=dept_bp.id, day="Pazartesi", start_time="11:00", end_time="13:00", course_name="Veri Yapıları", room="A102", instructor="Doç. Dr. Mehmet Demir"),
+        CourseSchedule(department_id=dept_bp.id, day="Salı", start_time="09:00", end_time="11:00", course_name="Veritabanı Yönetimi", room="B201", instructor="Dr. Öğr. Üyesi Ayşe Kaya"),
+        CourseSchedule(department_id=dept_bp.id, day="Salı", start_time="13:00", end_time="15:00", course_name="Web Programlama", room="B202", instructor="Öğr. Gör. Fatma Çelik"),
+        CourseSchedule(department_id=dept_bp.id, day="Çarşamba", start_time="10:00", end_time="12:00", course_name="Nesne Yönelimli Programlama", room="A103", instructor="Prof. Dr. Ahmet Yılmaz"),
+        CourseSchedule(department_id=dept_bp.id, day="Perşembe", start_time="09:00", end_time="11:00", course_name="Algoritma Analizi", room="C301", instructor="Doç. Dr. Mehmet Demir"),
+        CourseSchedule(department_id=dept_bp.id, day="Perşembe", start_time="14:00", end_time="16:00", course_name="Mobil Uygulama Geliştirme", room="B203", instructor="Dr. Öğr. Üyesi Ayşe Kaya"),
+        CourseSchedule(department_id=dept_bp.id, day="Cuma", start_time="10:00", end_time="12:00", course_name="İşletim Sistemleri", room="A104", instructor="Öğr. Gör. Fatma Çelik"),
+    ]
+    
+    # Yazılım Mühendisliği schedules
+    ym_schedules = [
+        CourseSchedule(department_id=dept_ym.id, day="Pazartesi", start_time="09:00", end_time="11:00", course_name="Yazılım Mühendisliği Temelleri", room="D401", instructor="Prof. Dr. Can Öztürk"),
+        CourseSchedule(department_id=dept_ym.id, day="Pazartesi", start_time="13:00", end_time="15:00", course_name="Yazılım Tasarımı ve Mimarisi", room="D402", instructor="Doç. Dr. Zeynep Aydın"),
+        CourseSchedule(department_id=dept_ym.id, day="Salı", start_time="10:00", end_time="12:00", course_name="Yazılım Test ve Kalite", room="E501", instructor="Dr. Öğr. Üyesi Emre Şahin"),
+        CourseSchedule(department_id=dept_ym.id, day="Salı", start_time="14:00", end_time="16:00", course_name="Yazılım Proje Yönetimi", room="E502", instructor="Öğr. Gör. Selin Arslan"),
+        CourseSchedule(department_id=dept_ym.id, day="Çarşamba", start_time="09:00", end_time="11:00", course_name="Yapay Zeka ve Makine Öğrenmesi", room="D403", instructor="Prof. Dr. Can Öztürk"),
+        CourseSchedule(department_id=dept_ym.id, day="Perşembe", start_time="10:00", end_time="12:00", course_name="Bulut Bilişim ve DevOps", room="E503", instructor="Doç. Dr. Zeynep Aydın"),
+        CourseSchedule(department_id=dept_ym.id, day="Perşembe", start_time="13:00", end_time="15:00", course_name="Siber Güvenlik", room="D404", instructor="Dr. Öğr. Üyesi Emre Şahin"),
+        CourseSchedule(department_id=dept_ym.id, day="Cuma", start_time="09:00", end_time="11:00", course_name="Büyük Veri ve Analitik", room="E504", instructor="Öğr. Gör. Selin Arslan"),
+    ]
+
+    await db.course_departments.insert_many([dept.model_dump() for dept in departments])
+    await db.course_schedules.insert_many([schedule.model_dump() for schedule in bp_schedules + ym_schedules])
+    await db.cache_versions.update_one({"_id": "timetable"}, {"$inc": {"version": 1}}, upsert=True)
+    logging.info("Course departments and schedules created")
+
+async def seed_academic_calendar():
+    if await db.academic_calendar.find_one({}, {"_id": 1}):
+        return
+    calendar_events = [
+        # Güz Dönemi 2024-2025
+        AcademicCalendar(title="Güz Dönemi Kayıt", start_date="2024-09-16", end_date="2024-09-27", semester="Güz", year="2024-2025", description="Güz dönemi öğrenci kayıt işlemleri", order=1),
+        AcademicCalendar(title="Güz Dönemi Ders Başlangıcı", start_date="2024-10-01", end_date="2024-10-01", semester="Güz", year="2024-2025", description="Güz dönemi derslerinin başlangıcı", order=2),
+        AcademicCalendar(title="Ara Sınav Dönemi", start_date="2024-11-18", end_date="2024-11-29", semester="Güz", year="2024-2025", description="Güz dönemi ara sınav haftası", order=3),
+        AcademicCalendar(title="Yarıyıl Tatili", start_date="2025-01-27", end_date="2025-02-02", semester="Güz", year="2024-2025", description="Yarıyıl tatili", order=4),
+        AcademicCalendar(title="Final Sınav Dönemi", start_date="2025-01-13", end_date="2025-01-24", semester="Güz", year="2024-2025", description="Güz dönemi final sınav haftası", order=5),
+        AcademicCalendar(title="Bütünleme Sınav Dönemi", start_date="2025-02-03", end_date="2025-02-07", semester="Güz", year="2024-2025", description="Güz dönemi bütünleme sınav haftası", order=6),
         
-        for event in calendar_events:
-            await db.academic_calendar.insert_one(event.model_dump())
-        logging.info("Academic calendar created")
-    
-    # Create sample student if doesn't exist
-    existing_students = await db.students.count_documents({})
-    if existing_students == 0:
-        # Create sample student
-        sample_student = Student(
-            student_no="2025001",
-            tc_no="12345678901",
-            first_name="Ahmet",
-            last_name="Yılmaz",
-            email="ahmet.yilmaz@student.ata.edu.tr",
-            phone="0555 123 45 67",
-            department="Bilgisayar Programcılığı",
-            class_level="2",
-            password=get_password_hash("123456"),
-            status="approved",
-            gpa=3.25
+        # Bahar Dönemi 2024-2025
+        AcademicCalendar(title="Bahar Dönemi Kayıt", start_date="2025-02-10", end_date="2025-02-21", semester="Bahar", year="2024-2025", description="Bahar dönemi öğrenci kayıt işlemleri", order=7),
+        AcademicCalendar(title="Bahar Dönemi Ders Başlangıcı", start_date="2025-02-24", end_date="2025-02-24", semester="Bahar", year="2024-2025", description="Bahar dönemi derslerinin başlangıcı", order=8),
+        AcademicCalendar(title="Ulusal Egemenlik ve Çocuk Bayramı", start_date="2025-04-23", end_date="2025-04-23", semester="Bahar", year="2024-2025", description="Resmi tatil", order=9),
+        AcademicCalendar(title="Ara Sınav Dönemi", start_date="2025-04-14", end_date="2025-04-25", semester="Bahar", year="2024-2025", description="Bahar dönemi ara sınav haftası", order=10),
+        AcademicCalendar(title="Emek ve Dayanışma Günü", start_date="2025-05-01", end_date="2025-05-01", semester="Bahar", year="2024-2025", description="Resmi tatil", order=11),
+        AcademicCalendar(title="Ramazan Bayramı", start_date="2025-03-30", end_date="2025-04-01", semester="Bahar", year="2024-2025", description="Resmi tatil", order=12),
+        AcademicCalendar(title="Final Sınav Dönemi", start_date="2025-06-02", end_date="2025-06-13", semester="Bahar", year="2024-2025", description="Bahar dönemi final sınav haftası", order=13),
+        AcademicCalendar(title="Bütünleme Sınav Dönemi", start_date="2025-06-16", end_date="2025-06-20", semester="Bahar", year="2024-2025", description="Bahar dönemi bütünleme sınav haftası", order=14),
+    ]
+
+    await db.academic_calendar.insert_many([event.model_dump() for event in calendar_events])
+    logging.info("Academic calendar created")
+
+async def seed_sample_student():
+    if await db.students.find_one({}, {"_id": 1}):
+        return
+    sample_student = Student(
+        student_no="2025001",
+        tc_no="12345678901",
+        first_name="Ahmet",
+        last_name="Yılmaz",
+        email="ahmet.yilmaz@student.ata.edu.tr",
+        phone="0555 123 45 67",
+        department="Bilgisayar Programcılığı",
+        class_level="2",
+        password=await get_password_hash("123456"),
+        status="approved",
+        gpa=3.25
+    )
+    
+    sample_grades = [
+        StudentGrade(
+            student_id=sample_student.id,
+            course_name="Programlama Temelleri",
+            course_code="BP101",
+            credit=4,
+            midterm=85,
+            final=90,
+            grade="AA",
+            semester="Güz 2024"
+        ),
+        StudentGrade(
+            student_id=sample_student.id,
+            course_name="Veri Yapıları",
+            course_code="BP102",
+            credit=3,
+            midterm=78,
+            final=82,
+            grade="BA",
+            semester="Güz 2024"
+        ),
+        StudentGrade(
+            student_id=sample_student.id,
+            course_name="Veritabanı Yönetimi",
+            course_code="BP201",
+            credit=3,
+            midterm=88,
+            final=92,
+            grade="AA",
+            semester="Bahar 2025"
+        ),
+        StudentGrade(
+            student_id=sample_student.id,
+            course_name="Web Programlama",
+            course_code="BP202",
+            credit=3,
+            midterm=75,
+            final=80,
+            grade="BB",
+            semester="Bahar 2025"
+        ),
+    ]
+
+    sample_attendance = [
+        StudentAttendance(
+            student_id=sample_student.id,
+            course_name="Programlama Temelleri",
+            total_hours=56,
+            attended_hours=52,
+            absence_percentage=7.14
+        ),
+        StudentAttendance(
+            student_id=sample_student.id,
+            course_name="Veri Yapıları",
+            total_hours=42,
+            attended_hours=38,
+            absence_percentage=9.52
+        ),
+        StudentAttendance(
+            student_id=sample_student.id,
+            course_name="Veritabanı Yönetimi",
+            total_hours=42,
+            attended_hours=42,
+            absence_percentage=0.0
+        ),
+    ]
+
+    await db.students.insert_one(sample_student.model_dump())
+    await db.student_grades.insert_many([grade.model_dump() for grade in sample_grades])
+    await db.student_attendance.insert_many([attendance.model_dump() for attendance in sample_attendance])
+    logging.info("Sample student created: 2025001 / 123456")
+
+async def dedupe_student_attendance():
+    """Keep the first record per (student_id, course_name) and make the pair unique."""
+    duplicates = await db.student_attendance.aggregate([
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": {"student_id": "$student_id", "course_name": "$course_name"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ], allowDiskUse=True).to_list(length=None)
+    extra = [doc_id for group in duplicates for doc_id in group["ids"][1:]]
+    if extra:
+        await db.student_attendance.delete_many({"_id": {"$in": extra}})
+        logging.info(f"Removed {len(extra)} duplicate attendance records")
+    # ensure_indexes ran before this and could not build the index over the duplicates
+    await db.student_attendance.create_indexes(
+        [model for model in INDEXES["student_attendance"] if model.document["name"] == "student_course_unique"]
+    )
+    if "student_course" in await db.student_attendance.index_information():
+        await db.student_attendance.drop_index("student_course")
+
+async def drop_replaced_student_indexes():
+    # status_created_at gained an id tiebreak as status_created_at_id
+    if "status_created_at" in await db.students.index_information():
+        await db.students.drop_index("status_created_at")
+
+# Append only: each entry runs once per database, in order
+MIGRATIONS = [
+    (1, seed_default_admin),
+    (2, seed_course_schedules),
+    (3, seed_academic_calendar),
+    (4, seed_sample_student),
+    (5, dedupe_student_attendance),
+    (6, drop_replaced_student_indexes),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+async def run_bootstrap(wait: bool = False) -> bool:
+    """
+    Bring indexes and seed data up to date. Returns True if this process did
+    the work, False if the schema was already current or another process holds
+    the lock (with wait=True, keep retrying until the lock frees up instead).
+    """
+    fingerprint = indexes_fingerprint()
+    while True:
+        marker = await db.app_meta.find_one({"_id": "schema"}) or {}
+        if marker.get("version", 0) >= SCHEMA_VERSION and marker.get("indexes") == fingerprint:
+            return False
+        owner = await acquire_lock("bootstrap", BOOTSTRAP_LOCK_TTL)
+        if owner:
+            break
+        if not wait:
+            logging.info("Bootstrap is running in another process, skipping")
+            return False
+        await asyncio.sleep(1)
+
+    try:
+        # Re-read under the lock; the previous holder may have just finished
+        marker = await db.app_meta.find_one({"_id": "schema"}) or {}
+        if marker.get("indexes") != fingerprint:
+            await ensure_indexes()
+            await db.app_meta.update_one({"_id": "schema"}, {"$set": {"indexes": fingerprint}}, upsert=True)
+        for version, migration in MIGRATIONS:
+            if version <= marker.get("version", 0):
+                continue
+            await migration()
+            await db.app_meta.update_one(
+                {"_id": "schema"},
+                {"$set": {"version": version, "updated_at": datetime.now(timezone.utc).isoformat()}},
+                upsert=True,
+            )
+            logging.info(f"Applied migration {version}: {migration.__name__}")
+        # Seeds write collections directly, so retire every versioned ETag
+        await bump_http_versions(CACHE_WRITE_PREFIXES)
+        return True
+    finally:
+        await release_lock("bootstrap", owner)
+
+@app.on_event("startup")
+async def bootstrap():
+    if BOOTSTRAP_ON_STARTUP:
+        await run_bootstrap()
+
+# Login rate limiting. Token buckets keyed by client IP and by account name
+# are checked before the password is verified, so throttled attempts never
+# reach bcrypt. Admin accounts are keyed by user id, so logging in by username
+# or by email draws on the same bucket.
+# A successful login refunds its tokens, so only failed attempts use up a
+# bucket. Behind a reverse proxy set TRUST_PROXY_HEADERS=true (and
+# TRUSTED_PROXY_HOPS to the number of proxies) or every client shares the
+# proxy's IP bucket.
+# Buckets live in process memory by default (bounded LRU); with
+# RATE_LIMIT_BACKEND=mongo they are shared by all workers through an atomic
+# pipeline update on the rate_limits collection.
+LOGIN_RATE_LIMIT_ENABLED = os.environ.get('LOGIN_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+LOGIN_IP_BURST = float(os.environ.get('LOGIN_IP_BURST', '100'))
+LOGIN_IP_PER_MINUTE = float(os.environ.get('LOGIN_IP_PER_MINUTE', '60'))
+LOGIN_ACCOUNT_BURST = float(os.environ.get('LOGIN_ACCOUNT_BURST', '5'))
+LOGIN_ACCOUNT_PER_MINUTE = float(os.environ.get('LOGIN_ACCOUNT_PER_MINUTE', '1'))
+TRUST_PROXY_HEADERS = os.environ.get('TRUST_PROXY_HEADERS', 'false').lower() == 'true'
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
+
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected by the login rate limiter.", ("endpoint", "scope"))
+
+class TokenBucketLimiter:
+    def __init__(self, backend: str, max_keys: int):
+        self.backend = backend
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self.allowed = 0
+        self.limited = 0
+
+    def _take_local(self, key: str, capacity: float, per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / per_second
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def _take_shared(self, key: str, capacity: float, per_second: float) -> float:
+        now = time.time()
+        refilled = {"$min": [capacity, {"$add": [
+            {"$ifNull": ["$tokens", capacity]},
+            {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, per_second]},
+        ]}]}
+        bucket = await db.rate_limits.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    # A bucket left alone this long is full again, so the TTL index may drop it
+                    "expires_at": datetime.now(timezone.utc) + timedelta(seconds=capacity / per_second),
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
         )
-        student_doc = sample_student.model_dump()
-        await db.students.insert_one(student_doc)
-        logging.info("Sample student created: 2025001 / 123456")
-        
-        # Create sample grades for the student
-        sample_grades = [
-            StudentGrade(
-                student_id=sample_student.id,
-                course_name="Programlama Temelleri",
-                course_code="BP101",
-                credit=4,
-                midterm=85,
-                final=90,
-                grade="AA",
-                semester="Güz 2024"
-            ),
-            StudentGrade(
-                student_id=sample_student.id,
-                course_name="Veri Yapıları",
-                course_code="BP102",
-                credit=3,
-                midterm=78,
-                final=82,
-                grade="BA",
-                semester="Güz 2024"
-            ),
-            StudentGrade(
-                student_id=sample_student.id,
-                course_name="Veritabanı Yönetimi",
-                course_code="BP201",
-                credit=3,
-                midterm=88,
-                final=92,
-                grade="AA",
-                semester="Bahar 2025"
-            ),
-            StudentGrade(
-                student_id=sample_student.id,
-                course_name="Web Programlama",
-                course_code="BP202",
-                credit=3,
-                midterm=75,
-                final=80,
-                grade="BB",
-                semester="Bahar 2025"
-            ),
-        ]
-        
-        for grade in sample_grades:
-            await db.student_grades.insert_one(grade.model_dump())
-        logging.info("Sample grades created")
-        
-        # Create sample attendance records
-        sample_attendance = [
-            StudentAttendance(
-                student_id=sample_student.id,
-                course_name="Programlama Temelleri",
-                total_hours=56,
-                attended_hours=52,
-                absence_percentage=7.14
-            ),
-            StudentAttendance(
-                student_id=sample_student.id,
-                course_name="Veri Yapıları",
-                total_hours=42,
-                attended_hours=38,
-                absence_percentage=9.52
-            ),
-            StudentAttendance(
-                student_id=sample_student.id,
-                course_name="Veritabanı Yönetimi",
-                total_hours=42,
-                attended_hours=42,
-                absence_percentage=0.0
-            ),
-        ]
-        
-        for attendance in sample_attendance:
-            await db.student_attendance.insert_one(attendance.model_dump())
-        logging.info("Sample attendance records created")
+        return 0.0 if bucket["allowed"] else (1 - bucket["tokens"]) / per_second
+
+    async def refund(self, key: str, capacity: float):
+        """Give back the token taken by a request that turned out to be legitimate."""
+        if self.backend == "mongo":
+            await db.rate_limits.update_one(
+                {"_id": key}, [{"$set": {"tokens": {"$min": [capacity, {"$add": ["$tokens", 1]}]}}}]
+            )
+        elif key in self._buckets:
+            tokens, updated_at = self._buckets[key]
+            self._buckets[key] = (min(capacity, tokens + 1), updated_at)
+
+    async def acquire(self, key: str, capacity: float, per_second: float) -> float:
+        """Take one token from `key`. Returns 0 when allowed, otherwise seconds until a token is available."""
+        if self.backend == "mongo":
+            retry_after = await self._take_shared(key, capacity, per_second)
+        else:
+            retry_after = self._take_local(key, capacity, per_second)
+        if retry_after:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "keys": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
+
+login_limiter = TokenBucketLimiter(RATE_LIMIT_BACKEND, RATE_LIMIT_MAX_KEYS)
+
+_proxy_warning_logged = False
+
+def client_ip(request: Request) -> str:
+    global _proxy_warning_logged
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and TRUST_PROXY_HEADERS:
+        # Each trusted proxy appends the address it saw; entries left of those are client-supplied
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        if hops:
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    elif forwarded and not _proxy_warning_logged:
+        _proxy_warning_logged = True
+        logging.warning("X-Forwarded-For received but TRUST_PROXY_HEADERS is off; login rate limits use the proxy address")
+    return request.client.host if request.client else "unknown"
+
+def login_limit_checks(request: Request, endpoint: str, account: str) -> tuple:
+    return (
+        ("ip", f"{endpoint}:ip:{client_ip(request)}", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60),
+        ("account", f"{endpoint}:account:{account.strip().lower()}", LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE / 60),
+    )
+
+async def enforce_login_limits(request: Request, endpoint: str, account: str, detail: str):
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return
+    taken = []
+    for scope, key, capacity, per_second in login_limit_checks(request, endpoint, account):
+        retry_after = await login_limiter.acquire(key, capacity, per_second)
+        if retry_after:
+            # A locked account must not also drain the IP budget shared behind a NAT
+            for taken_key, taken_capacity in taken:
+                await login_limiter.refund(taken_key, taken_capacity)
+            RATE_LIMITED.inc(endpoint, scope)
+            raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(math.ceil(retry_after))})
+        taken.append((key, capacity))
+
+async def refund_login_limits(request: Request, endpoint: str, account: str):
+    """Called after a successful login so only failed attempts count against the buckets."""
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return
+    for _, key, capacity, _ in login_limit_checks(request, endpoint, account):
+        await login_limiter.refund(key, capacity)
 
 # Auth endpoints
 @api_router.post("/auth/login", response_model=Token)
-async def login(user_input: UserLogin):
+async def login(user_input: UserLogin, request: Request):
     # Try to find user by username or email
     user = await db.users.find_one({
         "$or": [
@@ -767,12 +1679,16 @@ async def login(user_input: UserLogin):
             {"email": user_input.username}
         ]
     }, {"_id": 0})
+    # Username and email share one bucket per account; unknown names get their own
+    account = f"id:{user['id']}" if user else user_input.username
+    await enforce_login_limits(request, "admin", account, "Too many login attempts, please try again later")
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if not verify_password(user_input.password, user['password']):
+    if not await verify_password(user_input.password, user['password']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    await refund_login_limits(request, "admin", account)
     
     access_token = create_access_token(data={"sub": user['username']})
     user.pop('password')
@@ -785,9 +1701,18 @@ async def login(user_input: UserLogin):
 
 # News endpoints
 @api_router.get("/news", response_model=List[News])
-async def get_news():
-    news_list = await db.news.find({}, {"_id": 0}).sort("published_date", -1).to_list(1000)
-    return news_list
+async def get_news(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    selected = parse_fields(News, fields)
+    news_list = await paginate(db.news, {}, "published_date", response, limit, after, before, fields_projection(selected))
+    if selected:
+        return sparse_response(News, selected, news_list, response)
+    return list_response(News, news_list, response)
 
 @api_router.get("/news/{news_id}", response_model=News)
 async def get_news_by_id(news_id: str):
@@ -801,6 +1726,8 @@ async def create_news(news_input: NewsCreate, current_user: User = Depends(get_c
     news_obj = News(**news_input.model_dump())
     doc = news_obj.model_dump()
     await db.news.insert_one(doc)
+    await home_cache.invalidate("home")
+    await search_index_changed("news", doc)
     return news_obj
 
 @api_router.put("/news/{news_id}", response_model=News)
@@ -811,8 +1738,10 @@ async def update_news(news_id: str, news_input: NewsCreate, current_user: User =
     
     update_data = news_input.model_dump()
     await db.news.update_one({"id": news_id}, {"$set": update_data})
+    await home_cache.invalidate("home")
     
     updated_news = await db.news.find_one({"id": news_id}, {"_id": 0})
+    await search_index_changed("news", updated_news)
     return News(**updated_news)
 
 @api_router.delete("/news/{news_id}")
@@ -820,19 +1749,28 @@ async def delete_news(news_id: str, current_user: User = Depends(get_current_use
     result = await db.news.delete_one({"id": news_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="News not found")
+    await home_cache.invalidate("home")
+    await search_index_changed("news", doc_id=news_id)
     return {"message": "News deleted successfully"}
 
 # Announcements endpoints
 @api_router.get("/announcements", response_model=List[Announcement])
-async def get_announcements():
-    announcements = await db.announcements.find({"is_active": True}, {"_id": 0}).sort("published_date", -1).to_list(1000)
-    return announcements
+async def get_announcements(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+):
+    announcements = await paginate(db.announcements, {"is_active": True}, "published_date", response, limit, after, before)
+    return list_response(Announcement, announcements, response)
 
 @api_router.post("/announcements", response_model=Announcement)
 async def create_announcement(announcement_input: AnnouncementCreate, current_user: User = Depends(get_current_user)):
     announcement_obj = Announcement(**announcement_input.model_dump())
     doc = announcement_obj.model_dump()
     await db.announcements.insert_one(doc)
+    await home_cache.invalidate("home")
+    await search_index_changed("announcements", doc)
     return announcement_obj
 
 @api_router.put("/announcements/{announcement_id}", response_model=Announcement)
@@ -843,8 +1781,10 @@ async def update_announcement(announcement_id: str, announcement_input: Announce
     
     update_data = announcement_input.model_dump()
     await db.announcements.update_one({"id": announcement_id}, {"$set": update_data})
+    await home_cache.invalidate("home")
     
     updated = await db.announcements.find_one({"id": announcement_id}, {"_id": 0})
+    await search_index_changed("announcements", updated)
     return Announcement(**updated)
 
 @api_router.delete("/announcements/{announcement_id}")
@@ -852,13 +1792,24 @@ async def delete_announcement(announcement_id: str, current_user: User = Depends
     result = await db.announcements.delete_one({"id": announcement_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Announcement not found")
+    await home_cache.invalidate("home")
+    await search_index_changed("announcements", doc_id=announcement_id)
     return {"message": "Announcement deleted successfully"}
 
 # Events endpoints
 @api_router.get("/events", response_model=List[Event])
-async def get_events():
-    events = await db.events.find({}, {"_id": 0}).sort("event_date", -1).to_list(1000)
-    return events
+async def get_events(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    selected = parse_fields(Event, fields)
+    events = await paginate(db.events, {}, "event_date", response, limit, after, before, fields_projection(selected))
+    if selected:
+        return sparse_response(Event, selected, events, response)
+    return list_response(Event, events, response)
 
 @api_router.get("/events/{event_id}", response_model=Event)
 async def get_event_by_id(event_id: str):
@@ -872,6 +1823,7 @@ async def create_event(event_input: EventCreate, current_user: User = Depends(ge
     event_obj = Event(**event_input.model_dump())
     doc = event_obj.model_dump()
     await db.events.insert_one(doc)
+    await search_index_changed("events", doc)
     return event_obj
 
 @api_router.put("/events/{event_id}", response_model=Event)
@@ -884,6 +1836,7 @@ async def update_event(event_id: str, event_input: EventCreate, current_user: Us
     await db.events.update_one({"id": event_id}, {"$set": update_data})
     
     updated = await db.events.find_one({"id": event_id}, {"_id": 0})
+    await search_index_changed("events", updated)
     return Event(**updated)
 
 @api_router.delete("/events/{event_id}")
@@ -891,14 +1844,18 @@ async def delete_event(event_id: str, current_user: User = Depends(get_current_u
     result = await db.events.delete_one({"id": event_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await search_index_changed("events", doc_id=event_id)
     return {"message": "Event deleted successfully"}
 
 # Academic Units endpoints
 @api_router.get("/academic-units", response_model=List[AcademicUnit])
-async def get_academic_units(unit_type: Optional[str] = None):
+async def get_academic_units(unit_type: Optional[str] = None, fields: Optional[str] = None):
+    selected = parse_fields(AcademicUnit, fields)
     query = {"type": unit_type} if unit_type else {}
-    units = await db.academic_units.find(query, {"_id": 0}).to_list(1000)
-    return units
+    units = await db.academic_units.find(query, fields_projection(selected)).to_list(1000)
+    if selected:
+        return sparse_response(AcademicUnit, selected, units)
+    return list_response(AcademicUnit, units)
 
 @api_router.get("/academic-units/{unit_id}", response_model=AcademicUnit)
 async def get_academic_unit_by_id(unit_id: str):
@@ -912,6 +1869,7 @@ async def create_academic_unit(unit_input: AcademicUnitCreate, current_user: Use
     unit_obj = AcademicUnit(**unit_input.model_dump())
     doc = unit_obj.model_dump()
     await db.academic_units.insert_one(doc)
+    await search_index_changed("academic_units", doc)
     return unit_obj
 
 @api_router.put("/academic-units/{unit_id}", response_model=AcademicUnit)
@@ -924,6 +1882,7 @@ async def update_academic_unit(unit_id: str, unit_input: AcademicUnitCreate, cur
     await db.academic_units.update_one({"id": unit_id}, {"$set": update_data})
     
     updated = await db.academic_units.find_one({"id": unit_id}, {"_id": 0})
+    await search_index_changed("academic_units", updated)
     return AcademicUnit(**updated)
 
 @api_router.delete("/academic-units/{unit_id}")
@@ -931,6 +1890,7 @@ async def delete_academic_unit(unit_id: str, current_user: User = Depends(get_cu
     result = await db.academic_units.delete_one({"id": unit_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Academic unit not found")
+    await search_index_changed("academic_units", doc_id=unit_id)
     return {"message": "Academic unit deleted successfully"}
 
 # Slider endpoints
@@ -944,6 +1904,7 @@ async def create_slider_image(slider_input: SliderImageCreate, current_user: Use
     slider_obj = SliderImage(**slider_input.model_dump())
     doc = slider_obj.model_dump()
     await db.slider_images.insert_one(doc)
+    await home_cache.invalidate("home")
     return slider_obj
 
 @api_router.put("/slider/{slider_id}", response_model=SliderImage)
@@ -954,6 +1915,7 @@ async def update_slider_image(slider_id: str, slider_input: SliderImageCreate, c
     
     update_data = slider_input.model_dump()
     await db.slider_images.update_one({"id": slider_id}, {"$set": update_data})
+    await home_cache.invalidate("home")
     
     updated = await db.slider_images.find_one({"id": slider_id}, {"_id": 0})
     return SliderImage(**updated)
@@ -963,12 +1925,13 @@ async def delete_slider_image(slider_id: str, current_user: User = Depends(get_c
     result = await db.slider_images.delete_one({"id": slider_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Slider image not found")
+    await home_cache.invalidate("home")
     return {"message": "Slider image deleted successfully"}
 
 # Contact endpoints
 @api_router.get("/contact", response_model=ContactInfo)
 async def get_contact_info():
-    contact = await db.contact_info.find_one({}, {"_id": 0})
+    contact = await settings_cache.get("contact_info")
     if not contact:
         # Return default contact info
         return ContactInfo(
@@ -992,6 +1955,7 @@ async def update_contact_info(contact_input: ContactInfoUpdate, current_user: Us
         await db.contact_info.update_one({"id": existing['id']}, {"$set": doc})
     else:
         await db.contact_info.insert_one(doc)
+    await settings_cache.invalidate("contact_info")
     
     return contact_obj
 
@@ -1030,11 +1994,13 @@ async def delete_quick_link(link_id: str, current_user: User = Depends(get_curre
 # Settings endpoints
 @api_router.get("/settings", response_model=Settings)
 async def get_settings():
-    settings = await db.settings.find_one({}, {"_id": 0})
+    settings = await settings_cache.get("settings")
     if not settings:
         # Return default settings
         default_settings = Settings()
         await db.settings.insert_one(default_settings.model_dump())
+        await settings_cache.invalidate("settings")
+        await home_cache.invalidate("home")
         return default_settings
     return Settings(**settings)
 
@@ -1046,25 +2012,262 @@ async def update_settings(settings_input: SettingsUpdate, current_user: User = D
         update_data = settings_input.model_dump()
         update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
         await db.settings.update_one({"id": existing['id']}, {"$set": update_data})
+        await settings_cache.invalidate("settings")
+        await home_cache.invalidate("home")
         updated = await db.settings.find_one({"id": existing['id']}, {"_id": 0})
         return Settings(**updated)
     else:
         settings_obj = Settings(**settings_input.model_dump())
         doc = settings_obj.model_dump()
         await db.settings.insert_one(doc)
+        await settings_cache.invalidate("settings")
+        await home_cache.invalidate("home")
         return settings_obj
 
+# Home page endpoint
+async def build_home_payload() -> dict:
+    slider, news, announcements, settings, footer_settings = await asyncio.gather(
+        db.slider_images.find({"is_active": True}, {"_id": 0}).sort("order", 1).to_list(1000),
+        db.news.find({}, {"_id": 0, "content": 0}).sort([("published_date", -1), ("id", -1)]).to_list(HOME_NEWS_LIMIT),
+        db.announcements.find({"is_active": True}, {"_id": 0}).sort([("published_date", -1), ("id", -1)]).to_list(HOME_ANNOUNCEMENTS_LIMIT),
+        # Read directly: a worker's settings_cache copy may predate the write that
+        # bumped the home version, and this payload is kept until the next write
+        db.settings.find_one({}, {"_id": 0}),
+        db.footer_settings.find_one({}, {"_id": 0}),
+    )
+    payload = HomePayload(
+        slider=slider,
+        news=news,
+        announcements=announcements,
+        settings=Settings(**settings) if settings else Settings(),
+        footer_settings=FooterSettings(**footer_settings) if footer_settings else FooterSettings(),
+    )
+    body = payload.model_dump_json().encode()
+    return {"body": body, "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"'}
+
+@api_router.get("/home", response_model=HomePayload)
+async def get_home(request: Request):
+    home = await home_cache.get("home", build_home_payload)
+    if etag_matches(request, home["etag"]):
+        return Response(status_code=304, headers={"ETag": home["etag"]})
+    return Response(content=home["body"], media_type="application/json", headers={"ETag": home["etag"]})
+
+# Contact message intake. Public submissions are fingerprinted, appended to a
+# per-process spill file and buffered in memory; a background task writes the
+# buffer with insert_many every CONTACT_FLUSH_INTERVAL seconds or as soon as
+# CONTACT_FLUSH_SIZE messages are waiting. Spill segments are deleted only
+# after their batch is stored, and on startup any segment not locked by a live
+# worker is replayed, so a crash loses nothing that was acknowledged.
+CONTACT_FLUSH_SIZE = int(os.environ.get('CONTACT_FLUSH_SIZE', '100'))
+CONTACT_FLUSH_INTERVAL = float(os.environ.get('CONTACT_FLUSH_INTERVAL', '1'))
+CONTACT_QUEUE_LIMIT = int(os.environ.get('CONTACT_QUEUE_LIMIT', '5000'))
+CONTACT_SPILL_DIR = Path(os.environ.get('CONTACT_SPILL_DIR', str(ROOT_DIR / 'spill' / 'contact_messages')))
+CONTACT_SPILL_FSYNC = os.environ.get('CONTACT_SPILL_FSYNC', 'false').lower() == 'true'
+CONTACT_DEDUP_WINDOW = float(os.environ.get('CONTACT_DEDUP_WINDOW', '3600'))
+CONTACT_DEDUP_MAX_KEYS = int(os.environ.get('CONTACT_DEDUP_MAX_KEYS', '50000'))
+# The same text from this many different senders inside the window is a spam wave
+CONTACT_SPAM_THRESHOLD = int(os.environ.get('CONTACT_SPAM_THRESHOLD', '5'))
+
+CONTACT_MESSAGES = Counter("contact_messages_total", "Contact form submissions by outcome.", ("outcome",))
+
+class MessageFingerprints:
+    """Bounded, time-windowed counts of recently seen fingerprints."""
+
+    def __init__(self, window: float, max_keys: int):
+        self.window = window
+        self.max_keys = max_keys
+        self._seen = OrderedDict()  # fingerprint -> (first_seen, count)
+
+    def hit(self, fingerprint: str) -> int:
+        """Record one occurrence and return how many times it was seen in the window, this one included."""
+        now = time.monotonic()
+        first_seen, count = self._seen.pop(fingerprint, (now, 0))
+        if now - first_seen > self.window:
+            first_seen, count = now, 0
+        self._seen[fingerprint] = (first_seen, count + 1)
+        while len(self._seen) > self.max_keys:
+            self._seen.popitem(last=False)
+        return count + 1
+
+def message_fingerprints(message: ContactMessageCreate) -> tuple:
+    content = " ".join(tokenize(f"{message.subject} {message.message}"))
+    content_hash = hashlib.sha1(content.encode()).hexdigest()
+    sender_hash = hashlib.sha1(f"{message.email.strip().lower()}|{content_hash}".encode()).hexdigest()
+    return sender_hash, content_hash
+
+class ContactIntakeQueue:
+    def __init__(self):
+        self._buffer = []
+        self._segment = None  # (path, file) currently being appended to
+        self._sealed = []     # (path, file) segments whose messages are still in the buffer
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._flush_lock = asyncio.Lock()
+        self.senders = MessageFingerprints(CONTACT_DEDUP_WINDOW, CONTACT_DEDUP_MAX_KEYS)
+        self.contents = MessageFingerprints(CONTACT_DEDUP_WINDOW, CONTACT_DEDUP_MAX_KEYS)
+        self.flushed = 0
+        self.flush_failures = 0
+
+    def _open_segment(self):
+        CONTACT_SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        path = CONTACT_SPILL_DIR / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.ndjson"
+        handle = open(path, "a", encoding="utf-8")
+        # Held until the segment is deleted so recovery in other workers skips it
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._segment = (path, handle)
+
+    def _spill(self, doc: dict):
+        if self._segment is None:
+            self._open_segment()
+        handle = self._segment[1]
+        handle.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        handle.flush()
+        if CONTACT_SPILL_FSYNC:
+            os.fsync(handle.fileno())
+
+    def submit(self, message: ContactMessageCreate) -> Optional[ContactMessage]:
+        """Queue a message. Returns None when it is dropped as a duplicate or spam."""
+        # Checked first so a retried submission is not mistaken for a duplicate
+        if len(self._buffer) >= CONTACT_QUEUE_LIMIT:
+            CONTACT_MESSAGES.inc("rejected")
+            raise HTTPException(status_code=503, detail="Service busy, please try again shortly", headers={"Retry-After": "5"})
+        sender_hash, content_hash = message_fingerprints(message)
+        if self.senders.hit(sender_hash) > 1:
+            CONTACT_MESSAGES.inc("duplicate")
+            return None
+        if self.contents.hit(content_hash) > CONTACT_SPAM_THRESHOLD:
+            CONTACT_MESSAGES.inc("spam")
+            return None
+
+        message_obj = ContactMessage(**message.model_dump())
+        doc = message_obj.model_dump()
+        self._spill(doc)
+        self._buffer.append(doc)
+        CONTACT_MESSAGES.inc("accepted")
+        self._ensure_running()
+        if len(self._buffer) >= CONTACT_FLUSH_SIZE:
+            self._wakeup.set()
+        return message_obj
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=CONTACT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            if self._segment is not None:
+                self._sealed.append(self._segment)
+                self._segment = None
+            try:
+                await insert_spilled(batch)
+            except Exception as e:
+                # Keep the messages and their segments; the next flush retries them
+                self._buffer = batch + self._buffer
+                self.flush_failures += 1
+                logging.error(f"Contact message flush of {len(batch)} failed: {e}")
+                return
+            self.flushed += len(batch)
+            for path, handle in self._sealed:
+                os.remove(path)
+                handle.close()
+            self._sealed = []
+
+    async def recover(self):
+        """Replay spill segments left behind by workers that are no longer running."""
+        if not CONTACT_SPILL_DIR.is_dir():
+            return
+        for path in sorted(CONTACT_SPILL_DIR.glob("*.ndjson")):
+            with open(path, "r+", encoding="utf-8") as handle:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # a live worker owns it
+                docs, corrupt = [], []
+                for line_no, line in enumerate(handle, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        docs.append(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        # Typically the last line of a segment cut short by a crash
+                        logging.warning(f"Skipping unreadable line {line_no} of {path.name}: {e}")
+                        corrupt.append(line if line.endswith("\n") else line + "\n")
+                if docs:
+                    try:
+                        await insert_spilled(docs)
+                    except Exception as e:
+                        # Leave the segment for the next start rather than failing this one
+                        logging.error(f"Could not recover contact messages from {path.name}: {e}")
+                        continue
+                    logging.info(f"Recovered {len(docs)} contact messages from {path.name}")
+                if corrupt:
+                    with open(path.with_suffix(".corrupt"), "a", encoding="utf-8") as dump:
+                        dump.writelines(corrupt)
+                os.remove(path)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+        await self.flush()
+        if self._segment is not None and not self._buffer:
+            path, handle = self._segment
+            os.remove(path)
+            handle.close()
+            self._segment = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._buffer),
+            "queue_limit": CONTACT_QUEUE_LIMIT,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "pending_segments": len(self._sealed) + (self._segment is not None),
+        }
+
+async def insert_spilled(docs: List[dict]):
+    try:
+        await db.contact_messages.insert_many([dict(doc) for doc in docs], ordered=False)
+    except BulkWriteError as e:
+        # Replays may hit messages that were stored before the crash
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+
+contact_queue = ContactIntakeQueue()
+
+@app.on_event("startup")
+async def recover_contact_messages():
+    await contact_queue.recover()
+
 # Contact Messages endpoints
 @api_router.get("/contact-messages", response_model=List[ContactMessage])
-async def get_contact_messages(current_user: User = Depends(get_current_user)):
-    messages = await db.contact_messages.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return messages
+async def get_contact_messages(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    messages = await paginate(db.contact_messages, {}, "created_at", response, limit, after, before)
+    return list_response(ContactMessage, messages, response)
 
 @api_router.post("/contact-messages", response_model=ContactMessage)
 async def create_contact_message(message_input: ContactMessageCreate):
-    message_obj = ContactMessage(**message_input.model_dump())
-    doc = message_obj.model_dump()
-    await db.contact_messages.insert_one(doc)
+    message_obj = contact_queue.submit(message_input)
+    if message_obj is None:
+        # Duplicates and spam get the same answer so senders cannot probe the filter
+        message_obj = ContactMessage(**message_input.model_dump())
     return message_obj
 
 @api_router.put("/contact-messages/{message_id}/read", response_model=ContactMessage)
@@ -1088,7 +2291,7 @@ async def delete_contact_message(message_id: str, current_user: User = Depends(g
 @api_router.get("/users", response_model=List[User])
 async def get_users(current_admin: User = Depends(get_current_admin)):
     users = await db.users.find({}, {"_id": 0, "password": 0}).sort("created_at", -1).to_list(1000)
-    return [User(**user) for user in users]
+    return list_response(User, users)
 
 @api_router.get("/users/{user_id}", response_model=User)
 async def get_user_by_id(user_id: str, current_admin: User = Depends(get_current_admin)):
@@ -1107,7 +2310,7 @@ async def create_user(user_input: UserCreate, current_admin: User = Depends(get_
     if existing_email:
         raise HTTPException(status_code=400, detail="Email already exists")
     
-    hashed_password = get_password_hash(user_input.password)
+    hashed_password = await get_password_hash(user_input.password)
     user_dict = user_input.model_dump()
     user_dict.pop('password')
     user_obj = User(**user_dict)
@@ -1150,10 +2353,11 @@ async def update_user(user_id: str, user_input: UserUpdate, current_admin: User
         update_data["role"] = user_input.role
     
     if user_input.password is not None:
-        update_data["password"] = get_password_hash(user_input.password)
+        update_data["password"] = await get_password_hash(user_input.password)
     
     if update_data:
         await db.users.update_one({"id": user_id}, {"$set": update_data})
+        await principal_cache.invalidate("user", user_id)
     
     updated_user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
     return User(**updated_user)
@@ -1176,16 +2380,19 @@ async def delete_user(user_id: str, current_admin: User = Depends(get_current_ad
     result = await db.users.delete_one({"id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    await principal_cache.invalidate("user", user_id)
     return {"message": "User deleted successfully"}
 
 # Footer Settings endpoints
 @api_router.get("/footer-settings")
 async def get_footer_settings():
-    settings = await db.footer_settings.find_one({}, {"_id": 0})
+    settings = await settings_cache.get("footer_settings")
     if not settings:
         # Create default settings
         default_settings = FooterSettings()
         await db.footer_settings.insert_one(default_settings.model_dump())
+        await settings_cache.invalidate("footer_settings")
+        await home_cache.invalidate("home")
         return default_settings
     return FooterSettings(**settings)
 
@@ -1197,6 +2404,8 @@ async def update_footer_settings(settings_input: FooterSettingsUpdate, current_a
         # Create new settings
         new_settings = FooterSettings(**settings_input.model_dump(exclude_none=True))
         await db.footer_settings.insert_one(new_settings.model_dump())
+        await settings_cache.invalidate("footer_settings")
+        await home_cache.invalidate("home")
         return new_settings
     
     # Update existing settings
@@ -1207,6 +2416,8 @@ async def update_footer_settings(settings_input: FooterSettingsUpdate, current_a
         {"id": existing_settings["id"]},
         {"$set": update_data}
     )
+    await settings_cache.invalidate("footer_settings")
+    await home_cache.invalidate("home")
     
     updated = await db.footer_settings.find_one({"id": existing_settings["id"]}, {"_id": 0})
     return FooterSettings(**updated)
@@ -1216,7 +2427,7 @@ async def update_footer_settings(settings_input: FooterSettingsUpdate, current_a
 async def get_footer_links(category: Optional[str] = None):
     query = {"category": category} if category else {}
     links = await db.footer_links.find(query, {"_id": 0}).sort("order", 1).to_list(1000)
-    return [FooterLink(**link) for link in links]
+    return list_response(FooterLink, links)
 
 @api_router.get("/footer-links/{link_id}", response_model=FooterLink)
 async def get_footer_link_by_id(link_id: str):
@@ -1253,9 +2464,12 @@ async def delete_footer_link(link_id: str, current_admin: User = Depends(get_cur
 
 # Academic Staff endpoints
 @api_router.get("/academic-staff", response_model=List[AcademicStaff])
-async def get_academic_staff():
-    staff = await db.academic_staff.find({}, {"_id": 0}).sort("order", 1).to_list(length=None)
-    return [AcademicStaff(**s) for s in staff]
+async def get_academic_staff(fields: Optional[str] = None):
+    selected = parse_fields(AcademicStaff, fields)
+    staff = await db.academic_staff.find({}, fields_projection(selected)).sort("order", 1).to_list(length=None)
+    if selected:
+        return sparse_response(AcademicStaff, selected, staff)
+    return list_response(AcademicStaff, staff)
 
 @api_router.get("/academic-staff/{staff_id}", response_model=AcademicStaff)
 async def get_academic_staff_by_id(staff_id: str):
@@ -1268,6 +2482,7 @@ async def get_academic_staff_by_id(staff_id: str):
 async def create_academic_staff(staff_data: AcademicStaffCreate, current_user: User = Depends(get_current_admin)):
     new_staff = AcademicStaff(**staff_data.model_dump())
     await db.academic_staff.insert_one(new_staff.model_dump())
+    await search_index_changed("academic_staff", new_staff.model_dump())
     return new_staff
 
 @api_router.put("/academic-staff/{staff_id}", response_model=AcademicStaff)
@@ -1277,10 +2492,13 @@ async def update_academic_staff(staff_id: str, staff_data: AcademicStaffUpdate,
         raise HTTPException(status_code=404, detail="Academic staff not found")
     
     update_data = {k: v for k, v in staff_data.model_dump().items() if v is not None}
+    if "image_url" in update_data and "image_srcset" not in update_data:
+        update_data["image_srcset"] = None  # the old variants belong to the previous image
     if update_data:
         await db.academic_staff.update_one({"id": staff_id}, {"$set": update_data})
     
     updated_staff = await db.academic_staff.find_one({"id": staff_id}, {"_id": 0})
+    await search_index_changed("academic_staff", updated_staff)
     return AcademicStaff(**updated_staff)
 
 @api_router.delete("/academic-staff/{staff_id}")
@@ -1288,13 +2506,14 @@ async def delete_academic_staff(staff_id: str, current_user: User = Depends(get_
     result = await db.academic_staff.delete_one({"id": staff_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Academic staff not found")
+    await search_index_changed("academic_staff", doc_id=staff_id)
     return {"message": "Academic staff deleted successfully"}
 
 # Academic Calendar endpoints
 @api_router.get("/academic-calendar", response_model=List[AcademicCalendar])
 async def get_academic_calendar():
     calendar = await db.academic_calendar.find({}, {"_id": 0}).sort("order", 1).to_list(length=None)
-    return [AcademicCalendar(**c) for c in calendar]
+    return list_response(AcademicCalendar, calendar)
 
 @api_router.get("/academic-calendar/{calendar_id}", response_model=AcademicCalendar)
 async def get_academic_calendar_by_id(calendar_id: str):
@@ -1333,7 +2552,7 @@ async def delete_academic_calendar(calendar_id: str, current_user: User = Depend
 @api_router.get("/course-departments", response_model=List[CourseDepartment])
 async def get_course_departments():
     departments = await db.course_departments.find({}, {"_id": 0}).sort("order", 1).to_list(length=None)
-    return [CourseDepartment(**d) for d in departments]
+    return list_response(CourseDepartment, departments)
 
 @api_router.get("/course-departments/{department_id}", response_model=CourseDepartment)
 async def get_course_department_by_id(department_id: str):
@@ -1365,18 +2584,239 @@ async def update_course_department(department_id: str, department_data: CourseDe
 async def delete_course_department(department_id: str, current_user: User = Depends(get_current_admin)):
     # Also delete all schedules for this department
     await db.course_schedules.delete_many({"department_id": department_id})
+    await timetable_changed(rebuild=True)
     
     result = await db.course_departments.delete_one({"id": department_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Department not found")
     return {"message": "Department and its schedules deleted successfully"}
 
+# Timetable index. Schedules are kept in per-(room|instructor|department, day)
+# buckets sorted by start minute, so a conflict check is a bisect plus a short
+# backwards walk bounded by the longest slot in the bucket. Weekly grids are
+# assembled from the department buckets and free-room lookups probe one bucket
+# per room instead of scanning every schedule. Only room and instructor clashes
+# block a write; a department teaches several class levels in parallel, so
+# department overlaps are reported as warnings.
+TIMETABLE_INDEX_TTL = float(os.environ.get('TIMETABLE_INDEX_TTL', '30'))
+TIMETABLE_DAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+TIMETABLE_KINDS = ("room", "instructor", "department")
+BLOCKING_CONFLICT_KINDS = ("room", "instructor")
+TIME_PATTERN = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+
+def parse_time(value: str) -> int:
+    """Convert "HH:MM" to minutes since midnight."""
+    match = TIME_PATTERN.match(value or "")
+    if not match:
+        raise HTTPException(status_code=400, detail=f"Invalid time '{value}', expected HH:MM")
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+def schedule_interval(schedule: dict) -> tuple:
+    start, end = parse_time(schedule["start_time"]), parse_time(schedule["end_time"])
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    return start, end
+
+def schedule_keys(schedule: dict) -> List[tuple]:
+    keys = [("room", schedule["room"]), ("department", schedule["department_id"])]
+    if schedule.get("instructor"):
+        keys.append(("instructor", schedule["instructor"]))
+    return keys
+
+class TimetableBucket:
+    __slots__ = ("starts", "entries", "max_duration")
+
+    def __init__(self):
+        self.starts = []
+        self.entries = []  # (start, end, schedule_id), parallel to starts
+        self.max_duration = 0
+
+    def add(self, start: int, end: int, schedule_id: str):
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.entries.insert(position, (start, end, schedule_id))
+        self.max_duration = max(self.max_duration, end - start)
+
+    def discard(self, start: int, schedule_id: str):
+        position = bisect.bisect_left(self.starts, start)
+        while position < len(self.starts) and self.starts[position] == start:
+            if self.entries[position][2] == schedule_id:
+                del self.starts[position], self.entries[position]
+                return
+            position += 1
+
+    def overlapping(self, start: int, end: int) -> List[str]:
+        """Ids of entries intersecting [start, end)."""
+        matches = []
+        position = bisect.bisect_left(self.starts, end) - 1
+        # Nothing starting before start - max_duration can still be running at start
+        while position >= 0 and self.starts[position] > start - self.max_duration:
+            entry_start, entry_end, schedule_id = self.entries[position]
+            if entry_end > start:
+                matches.append(schedule_id)
+            position -= 1
+        return matches
+
+class TimetableIndex:
+    def __init__(self):
+        self.schedules = {}
+        self.buckets = {}  # (kind, key, day) -> TimetableBucket
+        self.rooms = set()
+        self.version = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def add(self, schedule: dict):
+        self.remove(schedule["id"])
+        start, end = schedule_interval(schedule)
+        self.schedules[schedule["id"]] = schedule
+        self.rooms.add(schedule["room"])
+        for kind, key in schedule_keys(schedule):
+            bucket = self.buckets.setdefault((kind, key, schedule["day"]), TimetableBucket())
+            bucket.add(start, end, schedule["id"])
+
+    def remove(self, schedule_id: str):
+        schedule = self.schedules.pop(schedule_id, None)
+        if schedule is None:
+            return
+        start = parse_time(schedule["start_time"])
+        for kind, key in schedule_keys(schedule):
+            bucket = self.buckets.get((kind, key, schedule["day"]))
+            if bucket:
+                bucket.discard(start, schedule_id)
+
+    def conflicts(self, schedule: dict, exclude_id: Optional[str] = None) -> List[dict]:
+        start, end = schedule_interval(schedule)
+        found = []
+        for kind, key in schedule_keys(schedule):
+            bucket = self.buckets.get((kind, key, schedule["day"]))
+            if not bucket:
+                continue
+            for schedule_id in bucket.overlapping(start, end):
+                if schedule_id == exclude_id:
+                    continue
+                other = self.schedules[schedule_id]
+                found.append({
+                    "kind": kind,
+                    "blocking": kind in BLOCKING_CONFLICT_KINDS,
+                    "schedule_id": schedule_id,
+                    "course_name": other["course_name"],
+                    "day": other["day"],
+                    "start_time": other["start_time"],
+                    "end_time": other["end_time"],
+                })
+        return found
+
+    def free_rooms(self, day: str, start: int, end: int) -> List[str]:
+        return sorted(
+            room for room in self.rooms
+            if not (bucket := self.buckets.get(("room", room, day))) or not bucket.overlapping(start, end)
+        )
+
+    def grid(self, department_id: str) -> dict:
+        days = {}
+        time_slots = set()
+        for day in TIMETABLE_DAYS:
+            bucket = self.buckets.get(("department", department_id, day))
+            if not bucket or not bucket.entries:
+                continue
+            days[day] = [self.schedules[schedule_id] for _, _, schedule_id in bucket.entries]
+            time_slots.update(schedule["start_time"] for schedule in days[day])
+        return {"department_id": department_id, "time_slots": sorted(time_slots), "days": days}
+
+    async def rebuild(self):
+        schedules = await db.course_schedules.find({}, {"_id": 0}).to_list(length=None)
+        self.schedules, self.buckets, self.rooms = {}, {}, set()
+        for schedule in schedules:
+            try:
+                self.add(schedule)
+            except HTTPException:
+                logging.warning(f"Skipping course schedule {schedule.get('id')} with an invalid time range")
+        logging.info(f"Timetable index built with {len(self.schedules)} schedules")
+
+    async def ensure_current(self, max_age: float = TIMETABLE_INDEX_TTL):
+        if self.version is not None and time.monotonic() - self.checked_at < max_age:
+            return
+        marker = await db.cache_versions.find_one({"_id": "timetable"})
+        version = marker["version"] if marker else 0
+        if version != self.version:
+            await self.rebuild()
+            self.version = version
+        self.checked_at = time.monotonic()
+
+timetable_index = TimetableIndex()
+
+async def timetable_changed(schedule: Optional[dict] = None, schedule_id: Optional[str] = None, rebuild: bool = False):
+    if rebuild:
+        timetable_index.version = None
+    elif schedule is not None:
+        timetable_index.add(schedule)
+    else:
+        timetable_index.remove(schedule_id)
+    marker = await db.cache_versions.find_one_and_update(
+        {"_id": "timetable"}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    if timetable_index.version is not None and marker["version"] == timetable_index.version + 1:
+        timetable_index.version = marker["version"]
+
+def raise_on_conflicts(conflicts: List[dict], response: Response):
+    blocking = [conflict for conflict in conflicts if conflict["blocking"]]
+    if blocking:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Schedule conflicts with existing bookings", "conflicts": blocking},
+        )
+    warnings = len(conflicts) - len(blocking)
+    if warnings:
+        response.headers["X-Schedule-Warnings"] = str(warnings)
+
+class ScheduleConflict(BaseModel):
+    kind: str  # room, instructor, department
+    blocking: bool = True
+    schedule_id: str
+    course_name: str
+    day: str
+    start_time: str
+    end_time: str
+
+class WeeklyGrid(BaseModel):
+    department_id: str
+    time_slots: List[str]
+    days: Dict[str, List[CourseSchedule]]
+
 # Course Schedule endpoints
 @api_router.get("/course-schedules", response_model=List[CourseSchedule])
 async def get_course_schedules(department_id: Optional[str] = None):
     query = {"department_id": department_id} if department_id else {}
     schedules = await db.course_schedules.find(query, {"_id": 0}).to_list(length=None)
-    return [CourseSchedule(**s) for s in schedules]
+    return list_response(CourseSchedule, schedules)
+
+@api_router.get("/course-schedules/grid", response_model=WeeklyGrid)
+async def get_course_schedule_grid(department_id: str):
+    await timetable_index.ensure_current()
+    return timetable_index.grid(department_id)
+
+@api_router.get("/course-schedules/free-rooms", response_model=List[str])
+async def get_free_rooms(
+    day: str,
+    start_time: str = Query(..., alias="time"),
+    end_time: Optional[str] = None,
+):
+    start = parse_time(start_time)
+    end = parse_time(end_time) if end_time else start + 1
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_time must be after time")
+    await timetable_index.ensure_current()
+    return timetable_index.free_rooms(day, start, end)
+
+@api_router.post("/course-schedules/conflicts", response_model=List[ScheduleConflict])
+async def check_course_schedule_conflicts(
+    schedule_data: CourseScheduleCreate,
+    exclude_id: Optional[str] = None,
+    current_user: User = Depends(get_current_admin),
+):
+    await timetable_index.ensure_current(max_age=0)
+    return timetable_index.conflicts(schedule_data.model_dump(), exclude_id=exclude_id)
 
 @api_router.get("/course-schedules/{schedule_id}", response_model=CourseSchedule)
 async def get_course_schedule_by_id(schedule_id: str):
@@ -1386,20 +2826,45 @@ async def get_course_schedule_by_id(schedule_id: str):
     return CourseSchedule(**schedule)
 
 @api_router.post("/course-schedules", response_model=CourseSchedule)
-async def create_course_schedule(schedule_data: CourseScheduleCreate, current_user: User = Depends(get_current_admin)):
+async def create_course_schedule(
+    schedule_data: CourseScheduleCreate,
+    response: Response,
+    allow_conflicts: bool = False,
+    current_user: User = Depends(get_current_admin),
+):
     new_schedule = CourseSchedule(**schedule_data.model_dump())
-    await db.course_schedules.insert_one(new_schedule.model_dump())
+    doc = new_schedule.model_dump()
+    # The lock keeps check-then-insert atomic within this worker
+    async with timetable_index._lock:
+        await timetable_index.ensure_current(max_age=0)
+        conflicts = timetable_index.conflicts(doc)
+        if not allow_conflicts:
+            raise_on_conflicts(conflicts, response)
+        await db.course_schedules.insert_one(doc)
+        await timetable_changed(doc)
     return new_schedule
 
 @api_router.put("/course-schedules/{schedule_id}", response_model=CourseSchedule)
-async def update_course_schedule(schedule_id: str, schedule_data: CourseScheduleUpdate, current_user: User = Depends(get_current_admin)):
+async def update_course_schedule(
+    schedule_id: str,
+    schedule_data: CourseScheduleUpdate,
+    response: Response,
+    allow_conflicts: bool = False,
+    current_user: User = Depends(get_current_admin),
+):
     schedule = await db.course_schedules.find_one({"id": schedule_id}, {"_id": 0})
     if not schedule:
         raise HTTPException(status_code=404, detail="Course schedule not found")
     
     update_data = {k: v for k, v in schedule_data.model_dump().items() if v is not None}
     if update_data:
-        await db.course_schedules.update_one({"id": schedule_id}, {"$set": update_data})
+        async with timetable_index._lock:
+            await timetable_index.ensure_current(max_age=0)
+            conflicts = timetable_index.conflicts({**schedule, **update_data}, exclude_id=schedule_id)
+            if not allow_conflicts:
+                raise_on_conflicts(conflicts, response)
+            await db.course_schedules.update_one({"id": schedule_id}, {"$set": update_data})
+            await timetable_changed({**schedule, **update_data})
     
     updated_schedule = await db.course_schedules.find_one({"id": schedule_id}, {"_id": 0})
     return CourseSchedule(**updated_schedule)
@@ -1409,12 +2874,13 @@ async def delete_course_schedule(schedule_id: str, current_user: User = Depends(
     result = await db.course_schedules.delete_one({"id": schedule_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Course schedule not found")
+    await timetable_changed(schedule_id=schedule_id)
     return {"message": "Course schedule deleted successfully"}
 
 # Contact Page Settings endpoints
 @api_router.get("/contact-page-settings", response_model=ContactPageSettings)
 async def get_contact_page_settings():
-    settings = await db.contact_page_settings.find_one({}, {"_id": 0})
+    settings = await settings_cache.get("contact_page_settings")
     if not settings:
         # Return default if not exists
         return ContactPageSettings()
@@ -1428,6 +2894,7 @@ async def update_contact_page_settings(settings_data: ContactPageSettingsUpdate,
         # Create new settings
         new_settings = ContactPageSettings(**settings_data.model_dump(exclude_none=True))
         await db.contact_page_settings.insert_one(new_settings.model_dump())
+        await settings_cache.invalidate("contact_page_settings")
         return new_settings
     
     # Update existing
@@ -1436,6 +2903,7 @@ async def update_contact_page_settings(settings_data: ContactPageSettingsUpdate,
     
     if update_data:
         await db.contact_page_settings.update_one({"id": existing['id']}, {"$set": update_data})
+        await settings_cache.invalidate("contact_page_settings")
     
     updated = await db.contact_page_settings.find_one({"id": existing['id']}, {"_id": 0})
     return ContactPageSettings(**updated)
@@ -1443,7 +2911,7 @@ async def update_contact_page_settings(settings_data: ContactPageSettingsUpdate,
 # About Settings endpoints
 @api_router.get("/about-settings", response_model=AboutSettings)
 async def get_about_settings():
-    settings = await db.about_settings.find_one({}, {"_id": 0})
+    settings = await settings_cache.get("about_settings")
     if not settings:
         # Return default if not exists
         return AboutSettings()
@@ -1457,6 +2925,7 @@ async def update_about_settings(settings_data: AboutSettingsUpdate, current_user
         # Create new settings
         new_settings = AboutSettings(**settings_data.model_dump(exclude_none=True))
         await db.about_settings.insert_one(new_settings.model_dump())
+        await settings_cache.invalidate("about_settings")
         return new_settings
     
     # Update existing
@@ -1465,10 +2934,44 @@ async def update_about_settings(settings_data: AboutSettingsUpdate, current_user
     
     if update_data:
         await db.about_settings.update_one({"id": existing['id']}, {"$set": update_data})
+        await settings_cache.invalidate("about_settings")
     
     updated = await db.about_settings.find_one({"id": existing['id']}, {"_id": 0})
     return AboutSettings(**updated)
 
+# Student number allocation: one atomic counter document per year
+async def next_student_no(year: int) -> str:
+    counter_id = f"student_no:{year}"
+    counter = await db.counters.find_one_and_update(
+        {"_id": counter_id}, {"$inc": {"seq": 1}}, return_document=ReturnDocument.AFTER
+    )
+    if counter is None:
+        # First registration of the year: continue after the highest existing number
+        last_seq = 0
+        async for student in db.students.find({"student_no": {"$regex": f"^{year}"}}, {"_id": 0, "student_no": 1}):
+            suffix = student["student_no"][len(str(year)):]
+            if suffix.isdigit():
+                last_seq = max(last_seq, int(suffix))
+        try:
+            await db.counters.insert_one({"_id": counter_id, "seq": last_seq})
+        except DuplicateKeyError:
+            pass  # another worker initialised it first
+        counter = await db.counters.find_one_and_update(
+            {"_id": counter_id}, {"$inc": {"seq": 1}}, return_document=ReturnDocument.AFTER
+        )
+    return f"{year}{str(counter['seq']).zfill(4)}"
+
+STUDENT_NO_ATTEMPTS = 5
+
+def duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+    """Name of the first field in the unique index that rejected the write."""
+    key_pattern = (error.details or {}).get("keyPattern")
+    if key_pattern:
+        return next(iter(key_pattern))
+    # Older servers only name the index in the message
+    match = re.search(r"index: (\w+?)_unique", str(error))
+    return match.group(1) if match else None
+
 # Student endpoints
 @api_router.post("/students/register", response_model=Student)
 async def register_student(student_data: StudentRegister):
@@ -1477,13 +2980,11 @@ async def register_student(student_data: StudentRegister):
     if existing:
         raise HTTPException(status_code=400, detail="Bu TC No ile kayıtlı öğrenci zaten var")
     
-    # Generate student number
-    year = datetime.now().year
-    count = await db.students.count_documents({"student_no": {"$regex": f"^{year}"}})
-    student_no = f"{year}{str(count + 1).zfill(4)}"
-    
     # Hash password
-    hashed_pw = get_password_hash(student_data.password)
+    hashed_pw = await get_password_hash(student_data.password)
+    
+    # Generate student number
+    student_no = await next_student_no(datetime.now().year)
     
     # Create student
     new_student = Student(
@@ -1499,11 +3000,25 @@ async def register_student(student_data: StudentRegister):
         status="pending"
     )
     
-    await db.students.insert_one(new_student.model_dump())
-    return new_student
+    for attempt in range(STUDENT_NO_ATTEMPTS):
+        try:
+            await db.students.insert_one(new_student.model_dump())
+            return new_student
+        except DuplicateKeyError as e:
+            field = duplicate_key_field(e)
+            if field == "tc_no":
+                # Concurrent registration with the same TC No (unique index)
+                raise HTTPException(status_code=400, detail="Bu TC No ile kayıtlı öğrenci zaten var")
+            if field != "student_no":
+                raise
+            # The counter handed out a number that is already taken (e.g. an
+            # imported student); draw the next one
+            new_student.student_no = await next_student_no(datetime.now().year)
+    raise HTTPException(status_code=503, detail="Öğrenci numarası atanamadı, lütfen tekrar deneyin")
 
 @api_router.post("/students/login")
-async def student_login(credentials: StudentLogin):
+async def student_login(credentials: StudentLogin, request: Request):
+    await enforce_login_limits(request, "student", credentials.student_no, "Çok fazla giriş denemesi, lütfen daha sonra tekrar deneyin")
     student = await db.students.find_one({"student_no": credentials.student_no}, {"_id": 0})
     
     if not student:
@@ -1512,8 +3027,9 @@ async def student_login(credentials: StudentLogin):
     if student['status'] != 'approved':
         raise HTTPException(status_code=403, detail="Hesabınız henüz onaylanmamış")
     
-    if not verify_password(credentials.password, student['password']):
+    if not await verify_password(credentials.password, student['password']):
         raise HTTPException(status_code=401, detail="Öğrenci numarası veya şifre hatalı")
+    await refund_login_limits(request, "student", credentials.student_no)
     
     # Create access token
     access_token = create_access_token(data={"sub": student['student_no'], "type": "student"})
@@ -1545,20 +3061,167 @@ async def get_current_student(credentials: HTTPAuthorizationCredentials = Depend
     except jwt.PyJWTError:
         raise credentials_exception
     
-    student = await db.students.find_one({"student_no": student_no}, {"_id": 0})
-    if student is None:
+    async def load_student():
+        student = await db.students.find_one({"student_no": student_no}, {"_id": 0})
+        return Student(**student) if student else None
+
+    current_student = await principal_cache.resolve("student", student_no, load_student)
+    if current_student is None:
         raise credentials_exception
-    
-    return Student(**student)
+    return current_student
 
 @api_router.get("/students/me", response_model=Student)
 async def get_current_student_info(current_student: Student = Depends(get_current_student)):
     return current_student
 
-@api_router.get("/students", response_model=List[Student])
-async def get_all_students(current_user: User = Depends(get_current_admin)):
-    students = await db.students.find({}, {"_id": 0}).to_list(length=None)
-    return [Student(**s) for s in students]
+# OBS dashboard
+ATTENDANCE_WARNING_PERCENT = 20.0
+ATTENDANCE_LIMIT_PERCENT = 30.0
+SEMESTER_TERM_ORDER = {"Bahar": 0, "Yaz": 1, "Güz": 2}
+
+def semester_sort_key(semester: str) -> tuple:
+    # "Güz 2024" comes before "Bahar 2025"
+    parts = semester.split()
+    year = int(parts[-1]) if parts and parts[-1].isdigit() else 0
+    return (year, SEMESTER_TERM_ORDER.get(parts[0], 3) if parts else 3, semester)
+
+async def build_student_dashboard(student_id: str) -> Optional[dict]:
+    student, grades, attendance = await asyncio.gather(
+        db.students.find_one({"id": student_id}, {"_id": 0}),
+        db.student_grades.find({"student_id": student_id}, {"_id": 0}).to_list(length=None),
+        db.student_attendance.find({"student_id": student_id}, {"_id": 0}).to_list(length=None),
+    )
+
+    by_semester = {}
+    for grade in grades:
+        by_semester.setdefault(grade["semester"], []).append(grade)
+    semesters = []
+    for semester in sorted(by_semester, key=semester_sort_key):
+        summary = new_gpa_summary()
+        for grade in by_semester[semester]:
+            add_to_gpa_summary(summary, grade)
+        finalize_gpa_summary(summary)
+        semesters.append({
+            "semester": semester,
+            "gpa": summary["gpa"],
+            "credits": summary["total_credits"],
+            "grades": by_semester[semester],
+        })
+
+    attendance_status = [
+        {
+            **record,
+            "at_risk": record["absence_percentage"] >= ATTENDANCE_WARNING_PERCENT,
+            "limit_exceeded": record["absence_percentage"] > ATTENDANCE_LIMIT_PERCENT,
+        }
+        for record in attendance
+    ]
+    if student is None:
+        return None
+    # The profile is read with the grades so GPA and totals match the semester list
+    return {"student": student, "semesters": semesters, "attendance": attendance_status}
+
+@api_router.get("/students/me/dashboard", response_model=StudentDashboard)
+async def get_student_dashboard(current_student: Student = Depends(get_current_student)):
+    version = await dashboard_version(current_student.id)
+    data = await dashboard_cache.get(
+        (current_student.id, version), lambda: build_student_dashboard(current_student.id)
+    )
+    if data is None:
+        raise HTTPException(status_code=404, detail="Öğrenci bulunamadı")
+    return data
+
+STUDENT_SORT_FIELDS = ("created_at", "student_no", "first_name", "last_name", "department", "gpa")
+
+@api_router.get("/students", response_model=List[StudentProfile])
+async def get_all_students(
+    response: Response,
+    student_status: Optional[str] = Query(None, alias="status"),
+    department: Optional[str] = None,
+    class_level: Optional[str] = None,
+    min_gpa: Optional[float] = None,
+    max_gpa: Optional[float] = None,
+    q: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Filtered, sorted student listing. Without limit/after/before every matching
+    student is returned, as before pagination existed; otherwise pages are
+    linked through X-Next-Cursor and X-Prev-Cursor. X-Total-Count always holds
+    the number of matching students.
+    """
+    if sort not in STUDENT_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(STUDENT_SORT_FIELDS)}")
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Use either 'after' or 'before', not both")
+
+    query = {}
+    if student_status:
+        query["status"] = student_status
+    if department:
+        query["department"] = department
+    if class_level:
+        query["class_level"] = class_level
+    if min_gpa is not None or max_gpa is not None:
+        query["gpa"] = {k: v for k, v in (("$gte", min_gpa), ("$lte", max_gpa)) if v is not None}
+    if q:
+        prefix = f"^{re.escape(q.strip())}"
+        if q.strip().isdigit():
+            query["student_no"] = {"$regex": prefix}
+        else:
+            query["$or"] = [
+                {"first_name": {"$regex": prefix, "$options": "i"}},
+                {"last_name": {"$regex": prefix, "$options": "i"}},
+            ]
+
+    direction = -1 if order == "desc" else 1
+    page_query = query
+    cursor = after if after is not None else before
+    if cursor is not None:
+        value, doc_id = decode_cursor(cursor)
+        # Walking backwards flips the comparison and the sort, then the page is reversed
+        op = "$lt" if (direction == -1) == (after is not None) else "$gt"
+        cursor_filter = {"$or": [{sort: {op: value}}, {sort: value, "id": {op: doc_id}}]}
+        page_query = {"$and": [query, cursor_filter]} if query else cursor_filter
+        if before is not None:
+            direction = -direction
+
+    # Every sort key has a (sort, id) index, and status/department filters with
+    # the default sort have (filter, created_at, id) ones, so the page is read
+    # in index order and the limit stops the scan; other filters are applied
+    # while walking the sort index
+    projection = {"_id": 0, "password": 0}
+    if limit is None and cursor is None:
+        # The find streams in batches, so a full listing has no 16MB document cap
+        students = await db.students.find(query, projection).sort([(sort, direction), ("id", direction)]).to_list(length=None)
+        response.headers["X-Total-Count"] = str(len(students))
+        return list_response(StudentProfile, students, response)
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    students, total = await asyncio.gather(
+        db.students.find(page_query, projection)
+        .sort([(sort, direction), ("id", direction)])
+        .limit(limit + 1)
+        .to_list(limit + 1),
+        db.students.count_documents(query),
+    )
+    response.headers["X-Total-Count"] = str(total)
+
+    has_more = len(students) > limit
+    students = students[:limit]
+    if before is not None:
+        students.reverse()
+    if students:
+        if has_more or before is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(students[-1], sort)
+        if after is not None or (before is not None and has_more):
+            response.headers["X-Prev-Cursor"] = encode_cursor(students[0], sort)
+    return list_response(StudentProfile, students, response)
 
 @api_router.get("/students/{student_id}", response_model=Student)
 async def get_student(student_id: str, current_user: User = Depends(get_current_admin)):
@@ -1581,6 +3244,8 @@ async def approve_student(student_id: str, current_user: User = Depends(get_curr
             "approved_by": current_user.username
         }}
     )
+    await principal_cache.invalidate("student", student_id)
+    await invalidate_dashboards([student_id])
     
     return {"message": "Öğrenci onaylandı"}
 
@@ -1594,6 +3259,8 @@ async def reject_student(student_id: str, current_user: User = Depends(get_curre
         {"id": student_id},
         {"$set": {"status": "rejected"}}
     )
+    await principal_cache.invalidate("student", student_id)
+    await invalidate_dashboards([student_id])
     
     return {"message": "Öğrenci reddedildi"}
 
@@ -1606,6 +3273,8 @@ async def update_student(student_id: str, student_data: StudentUpdate, current_u
     update_data = {k: v for k, v in student_data.model_dump().items() if v is not None}
     if update_data:
         await db.students.update_one({"id": student_id}, {"$set": update_data})
+        await principal_cache.invalidate("student", student_id)
+        await invalidate_dashboards([student_id])
     
     updated = await db.students.find_one({"id": student_id}, {"_id": 0})
     return Student(**updated)
@@ -1615,10 +3284,12 @@ async def delete_student(student_id: str, current_user: User = Depends(get_curre
     result = await db.students.delete_one({"id": student_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Öğrenci bulunamadı")
+    await principal_cache.invalidate("student", student_id)
     
     # Also delete student's grades and attendance
     await db.student_grades.delete_many({"student_id": student_id})
     await db.student_attendance.delete_many({"student_id": student_id})
+    await invalidate_dashboards([student_id])
     
     return {"message": "Öğrenci silindi"}
 
@@ -1626,15 +3297,16 @@ async def delete_student(student_id: str, current_user: User = Depends(get_curre
 @api_router.get("/students/{student_id}/grades", response_model=List[StudentGrade])
 async def get_student_grades(student_id: str):
     grades = await db.student_grades.find({"student_id": student_id}, {"_id": 0}).to_list(length=None)
-    return [StudentGrade(**g) for g in grades]
+    return list_response(StudentGrade, grades)
 
 @api_router.post("/students/grades", response_model=StudentGrade)
 async def create_student_grade(grade_data: StudentGradeCreate, current_user: User = Depends(get_current_admin)):
     new_grade = StudentGrade(**grade_data.model_dump())
     await db.student_grades.insert_one(new_grade.model_dump())
     
-    # Recalculate GPA
-    await recalculate_student_gpa(grade_data.student_id)
+    # Update GPA
+    await apply_grade_change(grade_data.student_id, None, new_grade.model_dump())
+    await invalidate_dashboards([grade_data.student_id])
     
     return new_grade
 
@@ -1650,8 +3322,9 @@ async def update_student_grade(grade_id: str, grade_data: StudentGradeUpdate, cu
     
     updated = await db.student_grades.find_one({"id": grade_id}, {"_id": 0})
     
-    # Recalculate GPA
-    await recalculate_student_gpa(grade['student_id'])
+    # Update GPA
+    await apply_grade_change(grade['student_id'], grade, updated)
+    await invalidate_dashboards([grade['student_id']])
     
     return StudentGrade(**updated)
 
@@ -1663,16 +3336,144 @@ async def delete_student_grade(grade_id: str, current_user: User = Depends(get_c
     
     result = await db.student_grades.delete_one({"id": grade_id})
     
-    # Recalculate GPA
-    await recalculate_student_gpa(grade['student_id'])
+    # Update GPA
+    if result.deleted_count:
+        await apply_grade_change(grade['student_id'], grade, None)
+    await invalidate_dashboards([grade['student_id']])
     
     return {"message": "Not silindi"}
 
+# Bulk grade import. The upload is read as a stream, one CSV or NDJSON row per
+# line, validated with StudentGradeCreate and written in unordered batches.
+# GPA is then recomputed once per affected student.
+IMPORT_BATCH_SIZE = 500
+IMPORT_GPA_CONCURRENCY = 8
+
+# Excel on Turkish Windows saves CSV as cp1254 rather than UTF-8
+UPLOAD_FALLBACK_ENCODING = "cp1254"
+
+UNDECODABLE_LINE = "Satır okunamadı: dosya UTF-8 veya Windows-1254 olarak kaydedilmeli"
+
+def decode_upload_line(line: bytes) -> Optional[str]:
+    """Decode one upload line, or return None if neither encoding can read it."""
+    for encoding in ("utf-8-sig", UPLOAD_FALLBACK_ENCODING):
+        try:
+            return line.decode(encoding).rstrip("\r")
+        except UnicodeDecodeError:
+            continue
+    return None
+
+async def iter_upload_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield decode_upload_line(line)
+    if buffer:
+        yield decode_upload_line(buffer)
+
+async def iter_upload_rows(request: Request, upload_format: str):
+    """Yield (row_number, dict) pairs, or (row_number, error message) for unparsable lines."""
+    header = None
+    row_number = 0
+    async for line in iter_upload_lines(request):
+        if line is None:
+            if upload_format == "csv" and header is None:
+                raise HTTPException(status_code=400, detail="Başlık satırı okunamadı: dosya UTF-8 veya Windows-1254 olarak kaydedilmeli")
+            row_number += 1
+            yield row_number, UNDECODABLE_LINE
+            continue
+        if not line.strip():
+            continue
+        if upload_format == "csv" and header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        row_number += 1
+        try:
+            if upload_format == "csv":
+                values = next(csv.reader([line]))
+                yield row_number, {k: (v if v != "" else None) for k, v in zip(header, values)}
+            else:
+                yield row_number, json.loads(line)
+        except (ValueError, csv.Error) as e:
+            yield row_number, f"Satır okunamadı: {e}"
+
+async def insert_grade_batch(batch: List[tuple], errors: List[dict]) -> List[str]:
+    """Insert (row_number, grade_doc) pairs; return the student ids of inserted rows."""
+    docs = [doc for _, doc in batch]
+    failed = set()
+    try:
+        await db.student_grades.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            failed.add(write_error["index"])
+            errors.append({"row": batch[write_error["index"]][0], "errors": [write_error.get("errmsg", "Yazma hatası")]})
+    return [doc["student_id"] for index, (_, doc) in enumerate(batch) if index not in failed]
+
+@api_router.post("/students/grades/import")
+async def import_student_grades(
+    request: Request,
+    upload_format: Optional[str] = Query(None, alias="format"),
+    current_user: User = Depends(get_current_admin),
+):
+    content_type = request.headers.get("content-type", "")
+    upload_format = upload_format or ("csv" if "csv" in content_type else "ndjson")
+    if upload_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Desteklenmeyen format (csv veya ndjson)")
+
+    errors = []
+    batch = []
+    affected_students = set()
+    total_rows = 0
+    inserted = 0
+    semaphore = asyncio.Semaphore(IMPORT_GPA_CONCURRENCY)
+
+    async def recalculate(student_id: str):
+        async with semaphore:
+            await recalculate_student_gpa(student_id)
+
+    try:
+        async for row_number, row in iter_upload_rows(request, upload_format):
+            total_rows += 1
+            if isinstance(row, str):
+                errors.append({"row": row_number, "errors": [row]})
+                continue
+            try:
+                grade_input = StudentGradeCreate.model_validate(row)
+            except ValidationError as e:
+                errors.append({"row": row_number, "errors": [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]})
+                continue
+            batch.append((row_number, StudentGrade(**grade_input.model_dump()).model_dump()))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                student_ids = await insert_grade_batch(batch, errors)
+                inserted += len(student_ids)
+                affected_students.update(student_ids)
+                batch = []
+        if batch:
+            student_ids = await insert_grade_batch(batch, errors)
+            inserted += len(student_ids)
+            affected_students.update(student_ids)
+    finally:
+        # Batches already written must be reflected in GPA and dashboards even if
+        # the upload breaks off part way
+        await asyncio.gather(*(recalculate(student_id) for student_id in affected_students))
+        await invalidate_dashboards(affected_students)
+
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "total_rows": total_rows,
+        "inserted": inserted,
+        "failed": len(errors),
+        "students_updated": len(affected_students),
+        "errors": errors,
+    }
+
 # Student Attendance endpoints
 @api_router.get("/students/{student_id}/attendance", response_model=List[StudentAttendance])
 async def get_student_attendance(student_id: str):
     attendance = await db.student_attendance.find({"student_id": student_id}, {"_id": 0}).to_list(length=None)
-    return [StudentAttendance(**a) for a in attendance]
+    return list_response(StudentAttendance, attendance)
 
 @api_router.post("/students/attendance", response_model=StudentAttendance)
 async def create_student_attendance(attendance_data: StudentAttendanceCreate, current_user: User = Depends(get_current_admin)):
@@ -1682,9 +3483,81 @@ async def create_student_attendance(attendance_data: StudentAttendanceCreate, cu
         **attendance_data.model_dump(),
         absence_percentage=round(absence_percentage, 2)
     )
-    await db.student_attendance.insert_one(new_attendance.model_dump())
+    try:
+        await db.student_attendance.insert_one(new_attendance.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Bu ders için devamsızlık kaydı zaten var")
+    await invalidate_dashboards([attendance_data.student_id])
     return new_attendance
 
+# Bulk attendance ingest: percentages for a whole batch are computed in one
+# numpy pass and records are upserted by (student_id, course_name).
+ATTENDANCE_BATCH_SIZE = 1000
+
+def absence_percentages(total_hours: np.ndarray, attended_hours: np.ndarray) -> np.ndarray:
+    return np.round((total_hours - attended_hours) / total_hours * 100, 2)
+
+async def upsert_attendance_batch(records: List[StudentAttendanceCreate]) -> dict:
+    started = time.perf_counter()
+    total = np.fromiter((r.total_hours for r in records), dtype=np.float64, count=len(records))
+    attended = np.fromiter((r.attended_hours for r in records), dtype=np.float64, count=len(records))
+    percentages = absence_percentages(total, attended).tolist()
+
+    now = datetime.now(timezone.utc).isoformat()
+    operations = [
+        UpdateOne(
+            {"student_id": record.student_id, "course_name": record.course_name},
+            {
+                "$set": {
+                    "total_hours": record.total_hours,
+                    "attended_hours": record.attended_hours,
+                    "absence_percentage": percentage,
+                },
+                "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now},
+            },
+            upsert=True,
+        )
+        for record, percentage in zip(records, percentages)
+    ]
+    upserted, modified = 0, 0
+    try:
+        result = await db.student_attendance.bulk_write(operations, ordered=False)
+        upserted, modified = result.upserted_count, result.modified_count
+    except BulkWriteError as e:
+        # Two concurrent batches upserting the same (student_id, course_name): the
+        # loser hits the unique index, and retrying turns its insert into an update
+        retry = [operations[error["index"]] for error in e.details["writeErrors"] if error["code"] == 11000]
+        if len(retry) != len(e.details["writeErrors"]):
+            raise
+        upserted, modified = e.details["nUpserted"], e.details["nModified"]
+        result = await db.student_attendance.bulk_write(retry, ordered=False)
+        upserted += result.upserted_count
+        modified += result.modified_count
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": len(records),
+        "upserted": upserted,
+        "modified": modified,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(records) / elapsed) if elapsed > 0 else None,
+    }
+
+@api_router.post("/students/attendance/bulk")
+async def bulk_upsert_student_attendance(records: List[StudentAttendanceCreate], current_user: User = Depends(get_current_admin)):
+    errors = []
+    valid = []
+    for index, record in enumerate(records):
+        if record.total_hours <= 0:
+            errors.append({"index": index, "error": "total_hours sıfırdan büyük olmalı"})
+        else:
+            valid.append(record)
+
+    batches = []
+    for start in range(0, len(valid), ATTENDANCE_BATCH_SIZE):
+        batches.append(await upsert_attendance_batch(valid[start:start + ATTENDANCE_BATCH_SIZE]))
+    await invalidate_dashboards(record.student_id for record in valid)
+    return {"received": len(records), "written": len(valid), "batches": batches, "errors": errors}
+
 @api_router.put("/students/attendance/{attendance_id}", response_model=StudentAttendance)
 async def update_student_attendance(attendance_id: str, attendance_data: StudentAttendanceUpdate, current_user: User = Depends(get_current_admin)):
     attendance = await db.student_attendance.find_one({"id": attendance_id}, {"_id": 0})
@@ -1698,112 +3571,672 @@ async def update_student_attendance(attendance_id: str, attendance_data: Student
         absence_percentage = ((updated_attendance['total_hours'] - updated_attendance['attended_hours']) / updated_attendance['total_hours']) * 100
         update_data['absence_percentage'] = round(absence_percentage, 2)
         
-        await db.student_attendance.update_one({"id": attendance_id}, {"$set": update_data})
+        try:
+            await db.student_attendance.update_one({"id": attendance_id}, {"$set": update_data})
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail="Bu ders için devamsızlık kaydı zaten var")
+        await invalidate_dashboards([attendance['student_id']])
     
     updated = await db.student_attendance.find_one({"id": attendance_id}, {"_id": 0})
     return StudentAttendance(**updated)
 
 @api_router.delete("/students/attendance/{attendance_id}")
 async def delete_student_attendance(attendance_id: str, current_user: User = Depends(get_current_admin)):
-    result = await db.student_attendance.delete_one({"id": attendance_id})
-    if result.deleted_count == 0:
+    deleted = await db.student_attendance.find_one_and_delete({"id": attendance_id}, {"_id": 0, "student_id": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Devamsızlık kaydı bulunamadı")
+    await invalidate_dashboards([deleted['student_id']])
     return {"message": "Devamsızlık kaydı silindi"}
 
-# Helper function for GPA calculation
+# GPA bookkeeping. Each student document carries running totals
+# (total_points, total_credits and per-semester subtotals in semester_totals),
+# so a grade write only applies its own delta instead of reloading every grade.
+GRADE_POINTS = {
+    "AA": 4.0, "BA": 3.5, "BB": 3.0, "CB": 2.5, "CC": 2.0,
+    "DC": 1.5, "DD": 1.0, "FD": 0.5, "FF": 0.0
+}
+
+GPA_EXPRESSION = {
+    "$cond": [
+        {"$gt": ["$total_credits", 0]},
+        {"$round": [{"$divide": ["$total_points", "$total_credits"]}, 2]},
+        0.0,
+    ]
+}
+
+def semester_key(semester: str) -> str:
+    # Semester names become field names, which may not contain '.' or start with '$'
+    return semester.replace(".", "_").lstrip("$")
+
+def grade_contribution(grade: dict) -> tuple:
+    if grade.get('grade') and grade['grade'] in GRADE_POINTS:
+        return GRADE_POINTS[grade['grade']] * grade['credit'], grade['credit']
+    return 0.0, 0
+
+def new_gpa_summary() -> dict:
+    return {"total_points": 0.0, "total_credits": 0, "semester_totals": {}}
+
+def add_to_gpa_summary(summary: dict, grade: dict):
+    points, credits = grade_contribution(grade)
+    if not credits:
+        return
+    summary["total_points"] += points
+    summary["total_credits"] += credits
+    semester = summary["semester_totals"].setdefault(semester_key(grade["semester"]), {"points": 0.0, "credits": 0})
+    semester["points"] += points
+    semester["credits"] += credits
+
+def finalize_gpa_summary(summary: dict) -> dict:
+    total_credits = summary["total_credits"]
+    summary["gpa"] = round(summary["total_points"] / total_credits, 2) if total_credits > 0 else 0.0
+    return summary
+
 async def recalculate_student_gpa(student_id: str):
-    grades = await db.student_grades.find({"student_id": student_id}, {"_id": 0}).to_list(length=None)
-    
-    grade_points = {
-        "AA": 4.0, "BA": 3.5, "BB": 3.0, "CB": 2.5, "CC": 2.0,
-        "DC": 1.5, "DD": 1.0, "FD": 0.5, "FF": 0.0
+    summary = new_gpa_summary()
+    async for grade in db.student_grades.find({"student_id": student_id}, {"_id": 0, "grade": 1, "credit": 1, "semester": 1}):
+        add_to_gpa_summary(summary, grade)
+    await db.students.update_one({"id": student_id}, {"$set": finalize_gpa_summary(summary)})
+
+def grade_deltas(old_grade: Optional[dict], new_grade: Optional[dict]) -> dict:
+    """Per-semester [points, credits] change of replacing old_grade with new_grade; unchanged semesters are omitted."""
+    deltas = {}
+    for grade, sign in ((old_grade, -1), (new_grade, 1)):
+        if grade:
+            points, credits = grade_contribution(grade)
+            if credits:
+                delta = deltas.setdefault(semester_key(grade["semester"]), [0.0, 0])
+                delta[0] += sign * points
+                delta[1] += sign * credits
+    return {key: delta for key, delta in deltas.items() if delta != [0.0, 0]}
+
+async def apply_grade_change(student_id: str, old_grade: Optional[dict], new_grade: Optional[dict]):
+    """Apply the GPA delta of replacing old_grade with new_grade (either may be None)."""
+    deltas = grade_deltas(old_grade, new_grade)
+    if not deltas:
+        return
+
+    def add(path: str, amount):
+        return {"$add": [{"$ifNull": [f"${path}", 0]}, amount]}
+
+    totals = {
+        "total_points": add("total_points", sum(d[0] for d in deltas.values())),
+        "total_credits": add("total_credits", sum(d[1] for d in deltas.values())),
+    }
+    for key, (points, credits) in deltas.items():
+        totals[f"semester_totals.{key}.points"] = add(f"semester_totals.{key}.points", points)
+        totals[f"semester_totals.{key}.credits"] = add(f"semester_totals.{key}.credits", credits)
+
+    result = await db.students.update_one(
+        {"id": student_id, "total_credits": {"$exists": True}},
+        [{"$set": totals}, {"$set": {"gpa": GPA_EXPRESSION}}],
+    )
+    if result.matched_count == 0:
+        # Student predates running totals: compute them once from scratch
+        await recalculate_student_gpa(student_id)
+
+async def recalculate_all_gpas(batch_size: int = 1000) -> int:
+    """Repair job: rebuild every student's totals from student_grades in one pass."""
+    summaries = {}
+    grades = db.student_grades.find({}, {"_id": 0, "student_id": 1, "grade": 1, "credit": 1, "semester": 1})
+    async for grade in grades.batch_size(5000):
+        summary = summaries.setdefault(grade["student_id"], new_gpa_summary())
+        add_to_gpa_summary(summary, grade)
+
+    updated = 0
+    operations = []
+    async for student in db.students.find({}, {"_id": 0, "id": 1}).batch_size(batch_size):
+        summary = finalize_gpa_summary(summaries.get(student["id"]) or new_gpa_summary())
+        operations.append(UpdateOne({"id": student["id"]}, {"$set": summary}))
+        if len(operations) >= batch_size:
+            await db.students.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        await db.students.bulk_write(operations, ordered=False)
+        updated += len(operations)
+    return updated
+
+@api_router.post("/students/gpa/recalculate")
+async def recalculate_gpas(current_user: User = Depends(get_current_admin)):
+    updated = await recalculate_all_gpas()
+    return {"message": "Not ortalamaları yeniden hesaplandı", "students": updated}
+
+# Streaming exports (Admin only). Documents are read with a Motor cursor in
+# id order and written out as they arrive, so memory use does not grow with
+# the collection. A download can be resumed with after_id=<last exported id>.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORTS = {
+    "students": StudentProfile,
+    "student_grades": StudentGrade,
+    "student_attendance": StudentAttendance,
+    "contact_messages": ContactMessage,
+}
+
+async def iter_export(collection_name: str, columns: List[str], query: dict, export_format: str):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    projection = {"_id": 0, **{column: 1 for column in columns}}
+    cursor = db[collection_name].find(query, projection).sort("id", 1).batch_size(EXPORT_BATCH_SIZE)
+    async for doc in cursor:
+        if writer:
+            writer.writerow([doc.get(column) for column in columns])
+        else:
+            buffer.write(json.dumps(doc, ensure_ascii=False, default=str))
+            buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+@api_router.get("/export/{collection_name}")
+async def export_collection(
+    collection_name: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    after_id: Optional[str] = None,
+    until_id: Optional[str] = None,
+    current_admin: User = Depends(get_current_admin),
+):
+    model = EXPORTS.get(collection_name)
+    if model is None:
+        raise HTTPException(status_code=404, detail=f"Export not available for '{collection_name}'")
+
+    id_range = {}
+    if after_id:
+        id_range["$gt"] = after_id
+    if until_id:
+        id_range["$lte"] = until_id
+    query = {"id": id_range} if id_range else {}
+
+    columns = list(model.model_fields)
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    filename = f"{collection_name}.{export_format}"
+    return StreamingResponse(
+        iter_export(collection_name, columns, query, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# Site search. An in-process inverted index over news, announcements, events,
+# academic staff and academic units with Turkish-aware folding (ı/i, ş/s, ğ/g,
+# ü/u, ö/o, ç/c) and prefix matching on the last query term for autocomplete.
+# Writes update the local index directly and bump a version counter; other
+# workers notice the new version within SEARCH_INDEX_TTL seconds and rebuild.
+SEARCH_INDEX_TTL = float(os.environ.get('SEARCH_INDEX_TTL', '30'))
+SEARCH_MAX_PREFIX_EXPANSIONS = 50
+SEARCH_SNIPPET_LENGTH = 160
+SEARCH_TITLE_WEIGHT = 3.0
+
+# collection -> (title field, body fields, query restricting what is searchable)
+SEARCH_SOURCES = {
+    "news": ("title", ("summary", "content"), {}),
+    "announcements": ("title", ("content",), {"is_active": True}),
+    "events": ("title", ("description", "location"), {}),
+    "academic_staff": ("name", ("title", "department", "bio"), {}),
+    "academic_units": ("name", ("description", "dean_name", "departments"), {}),
+}
+
+TURKISH_FOLD = {"I": "ı", "İ": "i"}
+ASCII_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c", "â": "a", "î": "i", "û": "u"})
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip Turkish diacritics, keeping one output char per input char."""
+    chars = []
+    for char in text:
+        char = TURKISH_FOLD.get(char, char)
+        lowered = char.lower()
+        chars.append(lowered if len(lowered) == 1 else char)
+    return "".join(chars).translate(ASCII_FOLD)
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(fold_text(text))
+
+class SearchIndex:
+    def __init__(self):
+        self.documents = {}  # (collection, id) -> {"title", "body"}
+        self.postings = {}   # token -> {(collection, id): weight}
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+        self.version = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._building = False  # rebuild appends tokens and sorts the vocabulary once
+
+    def _add_token(self, token: str, key: tuple, weight: float):
+        posting = self.postings.get(token)
+        if posting is None:
+            posting = self.postings[token] = {}
+            if self._building:
+                self.vocabulary.append(token)
+            else:
+                bisect.insort(self.vocabulary, token)
+        posting[key] = posting.get(key, 0.0) + weight
+
+    def remove(self, collection: str, doc_id: str):
+        key = (collection, doc_id)
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        for token in set(tokenize(document["title"]) + tokenize(document["body"])):
+            posting = self.postings.get(token)
+            if posting:
+                posting.pop(key, None)
+
+    def upsert(self, collection: str, doc: dict):
+        title_field, body_fields, conditions = SEARCH_SOURCES[collection]
+        self.remove(collection, doc["id"])
+        if any(doc.get(field) != value for field, value in conditions.items()):
+            return
+        key = (collection, doc["id"])
+        body_parts = []
+        for field in body_fields:
+            value = doc.get(field)
+            if isinstance(value, list):
+                value = " ".join(map(str, value))
+            if value:
+                body_parts.append(str(value))
+        title = str(doc.get(title_field) or "")
+        body = " ".join(body_parts)
+        self.documents[key] = {"title": title, "body": body}
+        for token in tokenize(title):
+            self._add_token(token, key, SEARCH_TITLE_WEIGHT)
+        for token in tokenize(body):
+            self._add_token(token, key, 1.0)
+
+    def _expand(self, term: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [term] if self.postings.get(term) else []
+        start = bisect.bisect_left(self.vocabulary, term)
+        expansions = []
+        for token in self.vocabulary[start:]:
+            if not token.startswith(term) or len(expansions) >= SEARCH_MAX_PREFIX_EXPANSIONS:
+                break
+            if self.postings.get(token):
+                expansions.append(token)
+        return expansions
+
+    def search(self, query: str, collections: Optional[set] = None) -> List[tuple]:
+        """Return (score, key) pairs for documents matching every query term, best first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        total_docs = max(len(self.documents), 1)
+        scores = None
+        for position, term in enumerate(terms):
+            term_scores = {}
+            # The last term is treated as a prefix so partial words autocomplete
+            for token in self._expand(term, prefix=position == len(terms) - 1):
+                posting = self.postings[token]
+                idf = math.log(1 + total_docs / len(posting))
+                for key, weight in posting.items():
+                    term_scores[key] = max(term_scores.get(key, 0.0), weight * idf)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+            if not scores:
+                return []
+        results = [(score, key) for key, score in scores.items() if collections is None or key[0] in collections]
+        results.sort(key=lambda item: (-item[0], item[1]))
+        return results
+
+    def snippet(self, key: tuple, query: str) -> str:
+        document = self.documents[key]
+        text = document["body"] or document["title"]
+        folded = fold_text(text)
+        position = -1
+        for term in tokenize(query):
+            position = folded.find(term)
+            if position >= 0:
+                break
+        start = max(position - SEARCH_SNIPPET_LENGTH // 4, 0) if position >= 0 else 0
+        snippet = text[start:start + SEARCH_SNIPPET_LENGTH].strip()
+        return ("…" if start > 0 else "") + snippet + ("…" if start + SEARCH_SNIPPET_LENGTH < len(text) else "")
+
+    async def rebuild(self):
+        documents = await asyncio.gather(*(
+            db[collection].find(conditions, {"_id": 0}).to_list(length=None)
+            for collection, (_, _, conditions) in SEARCH_SOURCES.items()
+        ))
+        self.documents, self.postings, self.vocabulary = {}, {}, []
+        self._building = True
+        try:
+            for collection, docs in zip(SEARCH_SOURCES, documents):
+                for doc in docs:
+                    self.upsert(collection, doc)
+        finally:
+            self._building = False
+            self.vocabulary.sort()
+        logging.info(f"Search index built with {len(self.documents)} documents")
+
+    async def ensure_current(self):
+        if self.version is not None and time.monotonic() - self.checked_at < SEARCH_INDEX_TTL:
+            return
+        async with self._lock:
+            if self.version is not None and time.monotonic() - self.checked_at < SEARCH_INDEX_TTL:
+                return
+            marker = await db.cache_versions.find_one({"_id": "search"})
+            version = marker["version"] if marker else 0
+            if version != self.version:
+                await self.rebuild()
+                self.version = version
+            self.checked_at = time.monotonic()
+
+search_index = SearchIndex()
+
+async def search_index_changed(collection: str, doc: Optional[dict] = None, doc_id: Optional[str] = None):
+    if doc is not None:
+        search_index.upsert(collection, doc)
+    else:
+        search_index.remove(collection, doc_id)
+    marker = await db.cache_versions.find_one_and_update(
+        {"_id": "search"}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    # If nobody else wrote in between, the local index already reflects this version
+    if search_index.version is not None and marker["version"] == search_index.version + 1:
+        search_index.version = marker["version"]
+
+class SearchResult(BaseModel):
+    type: str
+    id: str
+    title: str
+    snippet: str
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+
+@api_router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+):
+    collections = None
+    if types:
+        collections = {name.strip() for name in types.split(",") if name.strip()}
+        unknown = collections - set(SEARCH_SOURCES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(sorted(unknown))}")
+
+    await search_index.ensure_current()
+    matches = search_index.search(q, collections)
+    results = [
+        {
+            "type": key[0],
+            "id": key[1],
+            "title": search_index.documents[key]["title"],
+            "snippet": search_index.snippet(key, q),
+            "score": round(score, 4),
+        }
+        for score, key in matches[offset:offset + limit]
+    ]
+    return {"query": q, "total": len(matches), "results": results}
+
+# Image uploads. The request body is streamed to a temp file while it is
+# hashed, so nothing larger than one chunk sits in memory. A process pool
+# decodes it once and writes WebP variants per IMAGE_VARIANTS width. Files are
+# named by content hash, so they are served as immutable, and uploading the
+# same image twice returns the existing record. Storage is local disk by
+# default, or S3 when IMAGE_STORAGE=s3 (point IMAGE_BASE_URL at the bucket or
+# its CDN).
+IMAGE_STORAGE = os.environ.get('IMAGE_STORAGE', 'local')
+IMAGE_DIR = Path(os.environ.get('IMAGE_DIR', str(ROOT_DIR / 'uploads' / 'images')))
+IMAGE_BASE_URL = os.environ.get('IMAGE_BASE_URL', '/api/images')
+IMAGE_S3_BUCKET = os.environ.get('IMAGE_S3_BUCKET')
+IMAGE_MAX_BYTES = int(os.environ.get('IMAGE_MAX_BYTES', str(15 * 1024 * 1024)))
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', '2'))
+IMAGE_WEBP_QUALITY = 80
+IMAGE_VARIANTS = {"thumb": 320, "card": 800, "hero": 1920}
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+IMAGE_NAME_PATTERN = re.compile(r"^[0-9a-f]{16}-[a-z]+\.webp$")
+
+_image_pool = None
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _image_pool
+    if _image_pool is None:
+        # Forking a process that already runs Motor and bcrypt threads can
+        # deadlock the child, so workers come from a clean forkserver instead
+        _image_pool = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+        )
+    return _image_pool
+
+@app.on_event("startup")
+async def start_image_pool():
+    get_image_pool()
+
+def render_image_variants(source: str, out_dir: str, digest: str) -> dict:
+    """Runs in the image pool: decode once, write one WebP per variant no wider than the original."""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        width, height = image.size
+        variants = []
+        for name, target in IMAGE_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((target, max(target * height // width, 1)), Image.LANCZOS)  # never upscales
+            filename = f"{digest}-{name}.webp"
+            resized.save(os.path.join(out_dir, filename), "WEBP", quality=IMAGE_WEBP_QUALITY, method=4)
+            variants.append({"name": name, "width": resized.width, "height": resized.height, "file": filename})
+            if target >= width:
+                break  # larger variants would repeat the original size
+    return {"width": width, "height": height, "variants": variants}
+
+async def store_image_files(out_dir: str, filenames: List[str]):
+    if IMAGE_STORAGE == "s3":
+        import boto3
+
+        s3 = boto3.client("s3")
+        for filename in filenames:
+            await asyncio.to_thread(
+                s3.upload_file, os.path.join(out_dir, filename), IMAGE_S3_BUCKET, f"images/{filename}",
+                ExtraArgs={"ContentType": "image/webp", "CacheControl": IMAGE_CACHE_CONTROL},
+            )
+        return
+    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+    for filename in filenames:
+        # os.replace is atomic, so a concurrent upload of the same image never serves a half-written file
+        await asyncio.to_thread(os.replace, os.path.join(out_dir, filename), IMAGE_DIR / filename)
+
+def srcset_for(variants: List[dict]) -> str:
+    return ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants)
+
+class ImageVariant(BaseModel):
+    name: str
+    width: int
+    height: int
+    url: str
+
+class UploadedImage(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str  # content hash prefix
+    url: str  # largest variant
+    srcset: str
+    width: int
+    height: int
+    size: int
+    variants: List[ImageVariant]
+    created_at: str
+
+@api_router.post("/images", response_model=UploadedImage)
+async def upload_image(request: Request, current_user: User = Depends(get_current_user)):
+    if not request.headers.get("content-type", "").startswith("image/"):
+        raise HTTPException(status_code=415, detail="Send the raw image with an image/* Content-Type")
+
+    work_dir = tempfile.mkdtemp(prefix="upload-")
+    try:
+        source = os.path.join(work_dir, "source")
+        digest = hashlib.sha256()
+        size = 0
+        with open(source, "wb") as handle:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > IMAGE_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Image is larger than {IMAGE_MAX_BYTES} bytes")
+                digest.update(chunk)
+                handle.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        image_id = digest.hexdigest()[:16]
+
+        existing = await db.images.find_one({"id": image_id}, {"_id": 0})
+        if existing:
+            return existing
+
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(get_image_pool(), render_image_variants, source, work_dir, image_id)
+        except ImportError:
+            raise HTTPException(status_code=503, detail="Image processing is not available (Pillow is not installed)")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Unreadable image: {e}")
+
+        await store_image_files(work_dir, [variant["file"] for variant in rendered["variants"]])
+        # URLs are stored absolute because the frontend is served from a different origin
+        base_url = IMAGE_BASE_URL if "://" in IMAGE_BASE_URL else str(request.base_url).rstrip("/") + IMAGE_BASE_URL
+        variants = [
+            {"name": v["name"], "width": v["width"], "height": v["height"], "url": f"{base_url}/{v['file']}"}
+            for v in rendered["variants"]
+        ]
+        doc = {
+            "id": image_id,
+            "url": variants[-1]["url"],
+            "srcset": srcset_for(variants),
+            "width": rendered["width"],
+            "height": rendered["height"],
+            "size": size,
+            "variants": variants,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            await db.images.insert_one(dict(doc))
+        except DuplicateKeyError:
+            pass  # the same image finished uploading concurrently; files are identical
+        return doc
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+@api_router.get("/images/{filename}")
+async def get_image(filename: str):
+    if not IMAGE_NAME_PATTERN.match(filename):
+        raise HTTPException(status_code=404, detail="Image not found")
+    path = IMAGE_DIR / filename
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(path, media_type="image/webp", headers={"Cache-Control": IMAGE_CACHE_CONTROL})
+
+# Runtime stats endpoint (Admin only)
+@api_router.get("/system/stats")
+async def get_system_stats(current_admin: User = Depends(get_current_admin)):
+    return {
+        "password_pool": password_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "login_rate_limiter": login_limiter.stats(),
+        "contact_queue": contact_queue.stats(),
     }
-    
-    total_points = 0
-    total_credits = 0
-    
-    for grade in grades:
-        if grade.get('grade') and grade['grade'] in grade_points:
-            total_points += grade_points[grade['grade']] * grade['credit']
-            total_credits += grade['credit']
-    
-    gpa = round(total_points / total_credits, 2) if total_credits > 0 else 0.0
-    
-    await db.students.update_one({"id": student_id}, {"$set": {"gpa": gpa}})
 
 # Weather endpoint
+WEATHER_CACHE_TTL = float(os.environ.get('WEATHER_CACHE_TTL', '600'))
+GEOCODE_CACHE_TTL = float(os.environ.get('GEOCODE_CACHE_TTL', str(3 * 24 * 3600)))
+WEATHER_COORD_PRECISION = 2  # ~1 km buckets
+
+# Map weather codes to descriptions (Turkish)
+WEATHER_DESCRIPTIONS = {
+    0: "Açık", 1: "Çoğunlukla açık", 2: "Parçalı bulutlu", 3: "Bulutlu",
+    45: "Sisli", 48: "Dondurucu sis",
+    51: "Hafif çiseleyen", 53: "Çiseleyen", 55: "Yoğun çiseleyen",
+    61: "Hafif yağmurlu", 63: "Yağmurlu", 65: "Şiddetli yağmurlu",
+    71: "Hafif karlı", 73: "Karlı", 75: "Şiddetli karlı",
+    77: "Dolu", 80: "Sağanak yağışlı", 81: "Orta sağanak", 82: "Şiddetli sağanak",
+    85: "Kar yağışlı", 86: "Şiddetli kar yağışlı",
+    95: "Fırtınalı", 96: "Fırtına ve dolu", 99: "Şiddetli fırtına"
+}
+
+# Map weather codes to icons (simplified)
+WEATHER_ICONS = {
+    0: "01d", 1: "02d", 2: "03d", 3: "04d",
+    45: "50d", 48: "50d",
+    51: "09d", 53: "09d", 55: "09d",
+    61: "10d", 63: "10d", 65: "10d",
+    71: "13d", 73: "13d", 75: "13d",
+    77: "13d", 80: "09d", 81: "09d", 82: "09d",
+    85: "13d", 86: "13d",
+    95: "11d", 96: "11d", 99: "11d"
+}
+
+weather_cache = SingleFlightCache(WEATHER_CACHE_TTL)
+geocode_cache = SingleFlightCache(GEOCODE_CACHE_TTL)
+
+# Shared upstream client, created on first use and closed on shutdown. Tests can
+# point `http_transport` at an httpx.MockTransport to stub the upstream APIs.
+http_transport: Optional[httpx.AsyncBaseTransport] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            transport=http_transport,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=10.0,
+        )
+    return _http_client
+
+async def fetch_current_weather(lat: float, lon: float) -> dict:
+    response = await get_http_client().get(
+        "https://api.open-meteo.com/v1/forecast",
+        params={
+            "latitude": lat,
+            "longitude": lon,
+            "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code",
+            "timezone": "auto"
+        },
+        timeout=10.0
+    )
+    response.raise_for_status()
+    return response.json()["current"]
+
+async def fetch_city(lat: float, lon: float) -> str:
+    response = await get_http_client().get(
+        "https://geocode.maps.co/reverse",
+        params={"lat": lat, "lon": lon},
+        timeout=5.0
+    )
+    response.raise_for_status()
+    address = response.json().get("address", {})
+    return address.get("city") or address.get("town") or address.get("county") or address.get("state") or "Konum"
+
+async def get_city(bucket: tuple) -> str:
+    # Reverse geocoding is best effort; failures are not cached
+    try:
+        return await geocode_cache.get(bucket, lambda: fetch_city(*bucket))
+    except Exception:
+        return "Konum"
+
 @api_router.get("/weather")
 async def get_weather(lat: float, lon: float):
     """
     Get weather data for given coordinates using Open-Meteo API (no API key required)
     """
+    bucket = (round(lat, WEATHER_COORD_PRECISION), round(lon, WEATHER_COORD_PRECISION))
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.open-meteo.com/v1/forecast",
-                params={
-                    "latitude": lat,
-                    "longitude": lon,
-                    "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code",
-                    "timezone": "auto"
-                },
-                timeout=10.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            current = data["current"]
-            
-            # Map weather codes to descriptions (Turkish)
-            weather_descriptions = {
-                0: "Açık", 1: "Çoğunlukla açık", 2: "Parçalı bulutlu", 3: "Bulutlu",
-                45: "Sisli", 48: "Dondurucu sis",
-                51: "Hafif çiseleyen", 53: "Çiseleyen", 55: "Yoğun çiseleyen",
-                61: "Hafif yağmurlu", 63: "Yağmurlu", 65: "Şiddetli yağmurlu",
-                71: "Hafif karlı", 73: "Karlı", 75: "Şiddetli karlı",
-                77: "Dolu", 80: "Sağanak yağışlı", 81: "Orta sağanak", 82: "Şiddetli sağanak",
-                85: "Kar yağışlı", 86: "Şiddetli kar yağışlı",
-                95: "Fırtınalı", 96: "Fırtına ve dolu", 99: "Şiddetli fırtına"
-            }
-            
-            # Map weather codes to icons (simplified)
-            weather_icons = {
-                0: "01d", 1: "02d", 2: "03d", 3: "04d",
-                45: "50d", 48: "50d",
-                51: "09d", 53: "09d", 55: "09d",
-                61: "10d", 63: "10d", 65: "10d",
-                71: "13d", 73: "13d", 75: "13d",
-                77: "13d", 80: "09d", 81: "09d", 82: "09d",
-                85: "13d", 86: "13d",
-                95: "11d", 96: "11d", 99: "11d"
-            }
-            
-            weather_code = current.get("weather_code", 0)
-            
-            # Get city name using reverse geocoding
-            city = "Konum"
-            try:
-                geo_response = await client.get(
-                    f"https://geocode.maps.co/reverse",
-                    params={"lat": lat, "lon": lon},
-                    timeout=5.0
-                )
-                if geo_response.status_code == 200:
-                    geo_data = geo_response.json()
-                    address = geo_data.get("address", {})
-                    city = address.get("city") or address.get("town") or address.get("county") or address.get("state") or "Konum"
-            except:
-                pass
-            
-            return {
-                "temp": round(current["temperature_2m"]),
-                "feels_like": round(current["apparent_temperature"]),
-                "humidity": current["relative_humidity_2m"],
-                "description": weather_descriptions.get(weather_code, "Bilinmiyor"),
-                "icon": weather_icons.get(weather_code, "01d"),
-                "city": city,
-                "country": ""
-            }
+        current, city = await asyncio.gather(
+            weather_cache.get(bucket, lambda: fetch_current_weather(*bucket)),
+            get_city(bucket),
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=502, detail=f"Weather API error: {str(e)}")
     except httpx.TimeoutException:
@@ -1811,16 +4244,201 @@ async def get_weather(lat: float, lon: float):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching weather: {str(e)}")
 
+    weather_code = current.get("weather_code", 0)
+    return {
+        "temp": round(current["temperature_2m"]),
+        "feels_like": round(current["apparent_temperature"]),
+        "humidity": current["relative_humidity_2m"],
+        "description": WEATHER_DESCRIPTIONS.get(weather_code, "Bilinmiyor"),
+        "icon": WEATHER_ICONS.get(weather_code, "01d"),
+        "city": city,
+        "country": ""
+    }
+
 app.include_router(api_router)
 
+# HTTP caching for public GETs. Each route prefix has a Cache-Control policy
+# and the write prefixes whose changes affect it. A successful non-GET request
+# under a write prefix bumps its "http:<prefix>" counter in cache_versions, and
+# the ETag of a GET is derived from the counters of its sources, so a matching
+# If-None-Match gets a 304 before the handler runs. Routes without sources
+# (/api/home validates its own cached payload) fall back to hashing the body.
+PUBLIC_CACHE_MAX_AGE = int(os.environ.get('PUBLIC_CACHE_MAX_AGE', '60'))
+PUBLIC_CACHE_SWR = int(os.environ.get('PUBLIC_CACHE_SWR', '300'))
+
+def _cache_control(max_age: int = PUBLIC_CACHE_MAX_AGE, swr: int = PUBLIC_CACHE_SWR) -> str:
+    return f"public, max-age={max_age}, stale-while-revalidate={swr}"
+
+CACHE_POLICIES = {
+    "/api/home": (_cache_control(), ()),
+    "/api/news": (_cache_control(), ("/api/news",)),
+    "/api/events": (_cache_control(), ("/api/events",)),
+    "/api/slider": (_cache_control(), ("/api/slider",)),
+    "/api/quick-links": (_cache_control(max_age=300), ("/api/quick-links",)),
+    "/api/footer-links": (_cache_control(max_age=300), ("/api/footer-links",)),
+    "/api/academic-units": (_cache_control(max_age=300), ("/api/academic-units",)),
+    "/api/academic-staff": (_cache_control(max_age=300), ("/api/academic-staff",)),
+    "/api/academic-calendar": (_cache_control(max_age=3600, swr=86400), ("/api/academic-calendar",)),
+    "/api/course-schedules": (_cache_control(max_age=300), ("/api/course-schedules", "/api/course-departments")),
+}
+CACHE_WRITE_PREFIXES = {source for _, sources in CACHE_POLICIES.values() for source in sources}
+
+def _route_prefix(path: str, prefixes) -> Optional[str]:
+    for prefix in prefixes:
+        if path == prefix or path.startswith(prefix + "/"):
+            return prefix
+    return None
+
+def cache_policy_for(path: str) -> Optional[tuple]:
+    prefix = _route_prefix(path, CACHE_POLICIES)
+    return CACHE_POLICIES[prefix] if prefix else None
+
+async def bump_http_versions(prefixes):
+    updates = [UpdateOne({"_id": f"http:{prefix}"}, {"$inc": {"version": 1}}, upsert=True) for prefix in prefixes]
+    if updates:
+        await db.cache_versions.bulk_write(updates, ordered=False)
+
+async def versioned_etag(request: Request, sources: tuple) -> str:
+    keys = [f"http:{source}" for source in sources]
+    docs = await db.cache_versions.find({"_id": {"$in": keys}}).to_list(len(keys))
+    versions = {doc["_id"]: doc["version"] for doc in docs}
+    # Signed-in requests may see more (e.g. inactive items), so they validate separately
+    raw = json.dumps([
+        request.url.path, request.url.query, "authorization" in request.headers,
+        [versions.get(key, 0) for key in keys],
+    ])
+    return f'"v{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+@app.middleware("http")
+async def http_caching(request: Request, call_next):
+    if request.method != "GET":
+        response = await call_next(request)
+        prefix = _route_prefix(request.url.path, CACHE_WRITE_PREFIXES)
+        if prefix and response.status_code < 400:
+            await bump_http_versions([prefix])
+        return response
+
+    cache = cache_policy_for(request.url.path)
+    if cache is None:
+        return await call_next(request)
+    policy, sources = cache
+    # Signed-in users (admin panel) must always revalidate so their edits show up
+    cache_control = "private, no-cache" if "authorization" in request.headers else policy
+
+    # The counters are read before the handler, so a write racing with it can
+    # only leave an older ETag on newer data, which the next request corrects
+    etag = await versioned_etag(request, sources) if sources else None
+    if etag and etag_matches(request, etag):
+        response = Response(status_code=304, headers={"ETag": etag})
+    else:
+        response = await call_next(request)
+        if response.status_code not in (200, 304):
+            return response
+        if etag and "etag" not in response.headers:
+            response.headers["ETag"] = etag
+        elif response.status_code != 304 and "etag" not in response.headers:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            if etag_matches(request, etag):
+                response = Response(status_code=304, headers={"ETag": etag})
+            else:
+                headers = dict(response.headers)
+                headers["ETag"] = etag
+                response = Response(content=body, status_code=response.status_code, headers=headers)
+
+    response.headers["Cache-Control"] = cache_control
+    response.headers.add_vary_header("Authorization")
+    return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count", "X-Schedule-Warnings"],
 )
 
+class RequestMetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware buffering) that records latency,
+    response size and in-flight count per route template, so /api/news/{news_id}
+    is one series rather than one per id. Streaming bodies are counted as sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started_at = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started_at, method, route_path, state["status"])
+            HTTP_RESPONSE_BYTES.observe(state["bytes"], method, route_path)
+
+app.add_middleware(RequestMetricsMiddleware)
+
+# /metrics exposes route names, traffic and Mongo statistics, so scrapers must
+# send `Authorization: Bearer $METRICS_TOKEN`. Without a token the endpoint is
+# closed unless METRICS_PUBLIC=true, which is only meant for deployments where
+# the API port is not reachable from outside.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', 'false').lower() == 'true'
+
+def runtime_metric_lines() -> List[str]:
+    """Point-in-time gauges read from the in-process pools and caches."""
+    lines = []
+    gauges = {
+        "password_pool": password_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "login_rate_limiter": login_limiter.stats(),
+        "contact_queue": contact_queue.stats(),
+    }
+    for prefix, stats in gauges.items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.append(f"{prefix}_{key} {value}")
+    return lines
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN:
+        if not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    elif not METRICS_PUBLIC:
+        raise HTTPException(status_code=403, detail="Metrics are disabled; set METRICS_TOKEN")
+    lines = []
+    for metric in metrics_registry:
+        lines.extend(metric.render())
+    lines.extend(runtime_metric_lines())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -1829,4 +4447,10 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await contact_queue.close()
+    client.close()
+    password_pool.shutdown()
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=False, cancel_futures=True)
+    if _http_client is not None:
+        await _http_client.aclose()
\ No newline at end of file
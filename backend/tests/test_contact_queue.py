@@ -0,0 +1,24 @@
+import asyncio
+import json
+
+import server
+
+
+def test_recover_skips_truncated_line(tmp_path, monkeypatch):
+    stored = []
+
+    async def insert_spilled(docs):
+        stored.extend(docs)
+
+    monkeypatch.setattr(server, "CONTACT_SPILL_DIR", tmp_path)
+    monkeypatch.setattr(server, "insert_spilled", insert_spilled)
+
+    good = server.ContactMessage(name="Ali", email="ali@example.com", subject="Kayıt", message="Merhaba").model_dump()
+    segment = tmp_path / "4242-deadbeef.ndjson"
+    segment.write_text(json.dumps(good) + "\n" + '{"id": "x", "name": "Unterminated', encoding="utf-8")
+
+    asyncio.run(server.ContactIntakeQueue().recover())
+
+    assert [doc["id"] for doc in stored] == [good["id"]]
+    assert not segment.exists()
+    assert segment.with_suffix(".corrupt").read_text(encoding="utf-8").startswith('{"id": "x"')
@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def dashboard(db, monkeypatch):
+    monkeypatch.setattr(server, "dashboard_cache", server.SingleFlightCache(60))
+
+    async def seed():
+        await db.students.insert_one({"id": "s1", "student_no": "2024001", "first_name": "Ayşe"})
+        await db.student_grades.insert_many([
+            {"id": "g1", "student_id": "s1", "grade": "AA", "credit": 4, "semester": "Bahar 2025"},
+            {"id": "g2", "student_id": "s1", "grade": "CC", "credit": 2, "semester": "Bahar 2025"},
+            {"id": "g3", "student_id": "s1", "grade": "BB", "credit": 3, "semester": "Güz 2024"},
+            {"id": "g4", "student_id": "s1", "grade": None, "credit": 3, "semester": "Güz 2024"},
+            {"id": "g5", "student_id": "s2", "grade": "FF", "credit": 5, "semester": "Güz 2024"},
+        ])
+        await db.student_attendance.insert_many([
+            {"id": "a1", "student_id": "s1", "course_code": "MAT101", "absence_percentage": 10.0},
+            {"id": "a2", "student_id": "s1", "course_code": "FIZ101", "absence_percentage": 20.0},
+            {"id": "a3", "student_id": "s1", "course_code": "KIM101", "absence_percentage": 35.0},
+        ])
+
+    asyncio.run(seed())
+    return db
+
+
+def test_semesters_are_in_academic_order():
+    assert sorted(["Bahar 2025", "Yaz 2024", "Güz 2024", "Bahar 2024"], key=server.semester_sort_key) == [
+        "Bahar 2024", "Yaz 2024", "Güz 2024", "Bahar 2025",
+    ]
+
+
+def test_dashboard_groups_grades_by_semester(dashboard):
+    data = asyncio.run(server.build_student_dashboard("s1"))
+
+    assert data["student"]["student_no"] == "2024001"
+    assert [semester["semester"] for semester in data["semesters"]] == ["Güz 2024", "Bahar 2025"]
+    fall, spring = data["semesters"]
+    assert (fall["gpa"], fall["credits"], len(fall["grades"])) == (3.0, 3, 2)
+    assert (spring["gpa"], spring["credits"]) == (round((16 + 4) / 6, 2), 6)
+
+
+def test_attendance_flags_use_warning_and_limit_thresholds(dashboard):
+    data = asyncio.run(server.build_student_dashboard("s1"))
+
+    flags = {record["course_code"]: (record["at_risk"], record["limit_exceeded"]) for record in data["attendance"]}
+    assert flags == {"MAT101": (False, False), "FIZ101": (True, False), "KIM101": (True, True)}
+
+
+def test_missing_student_has_no_dashboard(db):
+    assert asyncio.run(server.build_student_dashboard("nobody")) is None
+
+
+def test_cached_dashboard_is_reloaded_after_invalidation(dashboard):
+    student = SimpleNamespace(id="s1")
+
+    async def scenario():
+        first = await server.get_student_dashboard(student)
+        await dashboard.student_grades.insert_one(
+            {"id": "g6", "student_id": "s1", "grade": "AA", "credit": 2, "semester": "Yaz 2025"}
+        )
+        stale = await server.get_student_dashboard(student)
+        await server.invalidate_dashboards(["s1", "s1"])
+        fresh = await server.get_student_dashboard(student)
+        return first, stale, fresh, await server.dashboard_version("s1")
+
+    first, stale, fresh, version = asyncio.run(scenario())
+    assert stale is first
+    assert [semester["semester"] for semester in fresh["semesters"]] == ["Güz 2024", "Bahar 2025", "Yaz 2025"]
+    assert version == 1
+
+
+def test_missing_student_dashboard_is_404(db, monkeypatch):
+    monkeypatch.setattr(server, "dashboard_cache", server.SingleFlightCache(60))
+    with pytest.raises(server.HTTPException) as error:
+        asyncio.run(server.get_student_dashboard(SimpleNamespace(id="nobody")))
+    assert error.value.status_code == 404
@@ -0,0 +1,93 @@
+import asyncio
+import random
+
+import pytest
+
+import server
+
+
+def apply(totals, deltas):
+    for key, (points, credits) in deltas.items():
+        totals["total_points"] += points
+        totals["total_credits"] += credits
+        semester = totals["semester_totals"].setdefault(key, {"points": 0.0, "credits": 0})
+        semester["points"] += points
+        semester["credits"] += credits
+
+
+def recomputed(grades):
+    summary = server.new_gpa_summary()
+    for grade in grades.values():
+        server.add_to_gpa_summary(summary, grade)
+    return summary
+
+
+def random_grade(rng):
+    return {
+        "grade": rng.choice(list(server.GRADE_POINTS) + [None, "XX"]),
+        "credit": rng.randint(1, 6),
+        "semester": rng.choice(["Güz 2024", "Bahar 2025", "Yaz 2025"]),
+    }
+
+
+def test_running_deltas_match_a_full_recompute():
+    rng = random.Random(11)
+    grades, totals = {}, server.new_gpa_summary()
+    for step in range(500):
+        action = rng.choice(["add", "update", "delete"]) if grades else "add"
+        if action == "add":
+            grade = random_grade(rng)
+            grades[step] = grade
+            apply(totals, server.grade_deltas(None, grade))
+        elif action == "update":
+            key = rng.choice(list(grades))
+            grade = {**grades[key], **rng.choice([{"grade": "CC"}, {"credit": 2}, {"semester": "Yaz 2025"}])}
+            apply(totals, server.grade_deltas(grades[key], grade))
+            grades[key] = grade
+        else:
+            apply(totals, server.grade_deltas(grades.pop(rng.choice(list(grades))), None))
+
+    expected = recomputed(grades)
+    assert totals["total_points"] == pytest.approx(expected["total_points"])
+    assert totals["total_credits"] == expected["total_credits"]
+    for key, semester in expected["semester_totals"].items():
+        assert totals["semester_totals"][key]["points"] == pytest.approx(semester["points"])
+        assert totals["semester_totals"][key]["credits"] == semester["credits"]
+
+
+def test_unchanged_contribution_has_no_delta():
+    grade = {"grade": "BA", "credit": 4, "semester": "Güz 2024"}
+    assert server.grade_deltas(grade, dict(grade)) == {}
+
+
+def test_moving_a_grade_between_semesters_debits_one_and_credits_the_other():
+    old = {"grade": "AA", "credit": 3, "semester": "Güz 2024"}
+    new = {**old, "semester": "Bahar 2025"}
+    assert server.grade_deltas(old, new) == {"Güz 2024": [-12.0, -3], "Bahar 2025": [12.0, 3]}
+
+
+def test_ungraded_and_unknown_letters_count_for_nothing():
+    assert server.grade_deltas(None, {"grade": None, "credit": 3, "semester": "Güz 2024"}) == {}
+    assert server.grade_deltas(None, {"grade": "XX", "credit": 3, "semester": "Güz 2024"}) == {}
+
+
+def test_semester_names_are_safe_field_names():
+    assert list(server.grade_deltas(None, {"grade": "AA", "credit": 1, "semester": "$Güz.2024"})) == ["Güz_2024"]
+
+
+def test_student_without_running_totals_is_recomputed_from_scratch(db):
+    grades = [
+        {"id": "g1", "student_id": "s1", "grade": "AA", "credit": 4, "semester": "Güz 2024"},
+        {"id": "g2", "student_id": "s1", "grade": "CC", "credit": 2, "semester": "Bahar 2025"},
+    ]
+
+    async def scenario():
+        await db.students.insert_one({"id": "s1"})
+        await db.student_grades.insert_many([dict(grade) for grade in grades])
+        await server.apply_grade_change("s1", None, grades[1])
+        return await db.students.find_one({"id": "s1"}, {"_id": 0})
+
+    student = asyncio.run(scenario())
+    assert student["total_credits"] == 6
+    assert student["gpa"] == round((16 + 4) / 6, 2)
+    assert student["semester_totals"]["Bahar 2025"] == {"points": 4.0, "credits": 2}
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+@pytest.fixture
+def importer(monkeypatch):
+    calls = {"inserted": [], "recalculated": [], "invalidated": []}
+
+    async def insert_grade_batch(batch, errors):
+        calls["inserted"].extend(doc for _, doc in batch)
+        return [doc["student_id"] for _, doc in batch]
+
+    async def recalculate_student_gpa(student_id):
+        calls["recalculated"].append(student_id)
+
+    async def invalidate_dashboards(student_ids):
+        calls["invalidated"].extend(student_ids)
+
+    monkeypatch.setattr(server, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(server, "insert_grade_batch", insert_grade_batch)
+    monkeypatch.setattr(server, "recalculate_student_gpa", recalculate_student_gpa)
+    monkeypatch.setattr(server, "invalidate_dashboards", invalidate_dashboards)
+    server.app.dependency_overrides[server.get_current_admin] = lambda: None
+    yield TestClient(server.app), calls
+    server.app.dependency_overrides.pop(server.get_current_admin, None)
+
+
+def grade_row(student_id, course_name):
+    return {"student_id": student_id, "course_name": course_name, "course_code": "C1", "credit": 3, "grade": "AA", "semester": "Güz 2024"}
+
+
+def test_mixed_encoding_upload_reports_bad_lines_per_row(importer):
+    client, calls = importer
+    body = b"\n".join([
+        json.dumps(grade_row("s1", "Programlama")).encode(),
+        json.dumps(grade_row("s1", "Türkçe"), ensure_ascii=False).encode("cp1254"),
+        b"\x81\x8d",
+        json.dumps(grade_row("s2", "Veri Yapıları"), ensure_ascii=False).encode(),
+    ])
+
+    response = client.post("/api/students/grades/import", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 3
+    assert result["errors"] == [{"row": 3, "errors": [server.UNDECODABLE_LINE]}]
+    assert [doc["course_name"] for doc in calls["inserted"]] == ["Programlama", "Türkçe", "Veri Yapıları"]
+    assert sorted(calls["recalculated"]) == ["s1", "s2"]
+
+
+def test_undecodable_csv_header_is_rejected(importer):
+    client, calls = importer
+    response = client.post("/api/students/grades/import", content=b"\x81\x8d\ns1,C", headers={"content-type": "text/csv"})
+    assert response.status_code == 400
+    assert calls["inserted"] == []
+
+
+def test_gpa_is_recomputed_for_written_batches_when_the_import_fails(importer, monkeypatch):
+    client, calls = importer
+    written = []
+
+    async def insert_grade_batch(batch, errors):
+        if written:
+            raise RuntimeError("connection lost")
+        written.extend(batch)
+        return [doc["student_id"] for _, doc in batch]
+
+    monkeypatch.setattr(server, "insert_grade_batch", insert_grade_batch)
+    body = "\n".join(json.dumps(grade_row(f"s{i}", "C")) for i in range(4)).encode()
+
+    with pytest.raises(RuntimeError):
+        client.post("/api/students/grades/import", content=body, headers={"content-type": "application/x-ndjson"})
+
+    assert sorted(calls["recalculated"]) == ["s0", "s1"]
+    assert sorted(calls["invalidated"]) == ["s0", "s1"]
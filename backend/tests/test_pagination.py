@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Response
+
+import server
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def news(db):
+    # Three items share a published_date so the id tiebreak decides their order
+    dates = ["2025-01-05", "2025-01-04", "2025-01-04", "2025-01-04", "2025-01-03", "2025-01-02", "2025-01-01"]
+    docs = [{"id": f"n{i}", "title": f"News {i}", "published_date": date} for i, date in enumerate(dates)]
+    run(db.news.insert_many([dict(doc) for doc in docs]))
+    return sorted(docs, key=lambda doc: (doc["published_date"], doc["id"]), reverse=True)
+
+
+def page(db, **kwargs):
+    response = Response()
+    docs = run(server.paginate(db.news, {}, "published_date", response, **kwargs))
+    return [doc["id"] for doc in docs], response.headers.get("X-Next-Cursor"), response.headers.get("X-Prev-Cursor")
+
+
+def test_cursor_round_trip_drops_padding():
+    cursor = server.encode_cursor({"published_date": "2025-01-04", "id": "n2"}, "published_date")
+    assert "=" not in cursor
+    assert server.decode_cursor(cursor) == ("2025-01-04", "n2")
+
+
+def test_invalid_cursor_is_a_400():
+    with pytest.raises(HTTPException) as exc:
+        server.decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_forward_pages_cover_every_document_once(db, news):
+    seen, after = [], None
+    while True:
+        ids, after, _ = page(db, limit=2, after=after)
+        seen.extend(ids)
+        if after is None:
+            break
+    assert seen == [doc["id"] for doc in news]
+
+
+def test_backward_pages_flip_the_comparison_and_restore_order(db, news):
+    expected = [doc["id"] for doc in news]
+    first, after, prev = page(db, limit=3)
+    assert prev is None
+    second, after, prev = page(db, limit=3, after=after)
+    assert second == expected[3:6]
+
+    # Walking back from the second page lands on the first in descending order
+    back, next_cursor, prev = page(db, limit=3, before=prev)
+    assert back == first == expected[:3]
+    assert prev is None
+    assert page(db, limit=3, after=next_cursor)[0] == second
+
+
+def test_without_paging_params_returns_the_legacy_list(db, news):
+    ids, after, prev = page(db)
+    assert ids == [doc["id"] for doc in news]
+    assert after is None and prev is None
+
+
+def test_after_and_before_together_are_rejected(db, news):
+    with pytest.raises(HTTPException):
+        page(db, after="x", before="y")
@@ -0,0 +1,107 @@
+import asyncio
+
+import server
+
+
+def keys(results):
+    return [key for _, key in results]
+
+
+def make_index():
+    index = server.SearchIndex()
+    index.upsert("news", {"id": "n1", "title": "Bahar Şenliği Başlıyor", "summary": "Kampüste konserler", "content": ""})
+    index.upsert("news", {"id": "n2", "title": "İstanbul Gezisi", "summary": "ISPARTA ve İzmir", "content": "Şenlik yok"})
+    index.upsert("academic_staff", {"id": "p1", "name": "Ayşe Çelik", "title": "Doçent", "department": "Fizik"})
+    index.upsert("announcements", {"id": "a1", "title": "Kapalı duyuru", "content": "Ayşe", "is_active": False})
+    return index
+
+
+def test_fold_text_handles_turkish_casing_and_keeps_length():
+    assert server.fold_text("İSTANBUL Işık Şenliği") == "istanbul isik senligi"
+    text = "Çağrı İĞDIR"
+    assert len(server.fold_text(text)) == len(text)
+    assert server.tokenize("Ayşe'nin dersi, 2024!") == ["ayse", "nin", "dersi", "2024"]
+
+
+def test_ascii_queries_match_turkish_text():
+    index = make_index()
+
+    assert keys(index.search("istanbul")) == [("news", "n2")]
+    assert keys(index.search("ISTANBUL")) == [("news", "n2")]
+    assert keys(index.search("senligi")) == [("news", "n1")]
+    assert keys(index.search("ısparta")) == [("news", "n2")]
+
+
+def test_last_term_is_a_prefix_and_earlier_terms_are_exact():
+    index = make_index()
+
+    assert keys(index.search("ayse cel")) == [("academic_staff", "p1")]
+    assert keys(index.search("istanbul gez")) == [("news", "n2")]
+    assert index.search("ays celik") == []
+
+
+def test_title_matches_rank_above_body_matches():
+    index = make_index()
+
+    assert keys(index.search("senlik")) == [("news", "n2")]
+    assert keys(index.search("sen")) == [("news", "n1"), ("news", "n2")]
+
+
+def test_inactive_documents_are_not_indexed():
+    index = make_index()
+
+    assert keys(index.search("kapali")) == []
+    assert keys(index.search("ayse")) == [("academic_staff", "p1")]
+
+
+def test_collection_filter_and_remove():
+    index = make_index()
+
+    assert keys(index.search("fizik", {"news"})) == []
+    assert keys(index.search("fizik", {"academic_staff"})) == [("academic_staff", "p1")]
+    index.remove("news", "n1")
+    index.remove("news", "missing")
+    assert keys(index.search("bahar")) == []
+    assert keys(index.search("sen")) == [("news", "n2")]
+
+
+def test_upsert_replaces_the_previous_text():
+    index = make_index()
+    index.upsert("news", {"id": "n1", "title": "Güz Festivali", "summary": "", "content": ""})
+
+    assert keys(index.search("bahar")) == []
+    assert keys(index.search("guz fest")) == [("news", "n1")]
+
+
+def test_snippet_centres_on_the_folded_match():
+    index = server.SearchIndex()
+    body = "x" * 300 + " Şenlik programı " + "y" * 300
+    index.upsert("events", {"id": "e1", "title": "Etkinlik", "description": body, "location": ""})
+
+    snippet = index.snippet(("events", "e1"), "senlik")
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "Şenlik programı" in snippet
+    assert len(snippet) <= server.SEARCH_SNIPPET_LENGTH + 2
+
+
+def test_rebuild_loads_every_source_with_a_sorted_vocabulary(db):
+    async def scenario():
+        await db.news.insert_many([
+            {"id": "n1", "title": "Zeytin Hasadı", "summary": "", "content": "Ödül"},
+            {"id": "n2", "title": "Araştırma", "summary": "Çevre", "content": ""},
+        ])
+        await db.announcements.insert_many([
+            {"id": "a1", "title": "Burs", "content": "", "is_active": True},
+            {"id": "a2", "title": "Eski burs", "content": "", "is_active": False},
+        ])
+        index = server.SearchIndex()
+        await index.rebuild()
+        return index
+
+    index = asyncio.run(scenario())
+    assert index.vocabulary == sorted(index.vocabulary)
+    assert not index._building
+    assert set(index.documents) == {("news", "n1"), ("news", "n2"), ("announcements", "a1")}
+    assert keys(index.search("odu")) == [("news", "n1")]
+    index.upsert("news", {"id": "n3", "title": "Bilim", "summary": "", "content": ""})
+    assert index.vocabulary == sorted(index.vocabulary)
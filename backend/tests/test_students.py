@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+GPAS = [3.5, 2.0, 3.5, 1.0, 3.5, 2.0, 4.0]
+
+
+@pytest.fixture
+def client(db):
+    asyncio.run(db.students.insert_many([
+        {
+            "id": f"s{i}",
+            "student_no": f"202400{i}",
+            "tc_no": f"1000000000{i}",
+            "first_name": name,
+            "last_name": "Yılmaz",
+            "email": f"s{i}@example.com",
+            "phone": "5550000000",
+            "department": "Bilgisayar" if i % 2 else "Fizik",
+            "class_level": "1",
+            "status": "approved" if i < 5 else "pending",
+            "gpa": gpa,
+            "created_at": f"2024-09-0{i + 1}T10:00:00",
+            "password": "hash",
+        }
+        for i, (name, gpa) in enumerate(zip(["Ayşe", "Ali", "Can", "Deniz", "Ece", "Fatma", "Gül"], GPAS))
+    ]))
+    server.app.dependency_overrides[server.get_current_admin] = lambda: None
+    yield TestClient(server.app)
+    server.app.dependency_overrides.pop(server.get_current_admin, None)
+
+
+def ids(response):
+    return [student["id"] for student in response.json()]
+
+
+def test_without_paging_params_every_student_is_listed(client):
+    response = client.get("/api/students", params={"sort": "created_at"})
+
+    assert response.status_code == 200
+    assert ids(response) == [f"s{i}" for i in reversed(range(7))]
+    assert response.headers["X-Total-Count"] == "7"
+    assert "X-Next-Cursor" not in response.headers
+    assert all("password" not in student for student in response.json())
+
+
+def test_ascending_pages_walk_ties_forward_and_back(client):
+    params = {"sort": "gpa", "order": "asc", "limit": 3}
+    expected = ["s3", "s1", "s5", "s0", "s2", "s4", "s6"]
+
+    first = client.get("/api/students", params=params)
+    second = client.get("/api/students", params={**params, "after": first.headers["X-Next-Cursor"]})
+    third = client.get("/api/students", params={**params, "after": second.headers["X-Next-Cursor"]})
+    assert ids(first) + ids(second) + ids(third) == expected
+    assert "X-Prev-Cursor" not in first.headers
+    assert "X-Next-Cursor" not in third.headers
+    assert first.headers["X-Total-Count"] == "7"
+
+    back = client.get("/api/students", params={**params, "before": third.headers["X-Prev-Cursor"]})
+    assert ids(back) == ids(second)
+    start = client.get("/api/students", params={**params, "before": back.headers["X-Prev-Cursor"]})
+    assert ids(start) == ids(first)
+    assert "X-Prev-Cursor" not in start.headers
+    assert start.headers["X-Next-Cursor"]
+
+
+def test_descending_pages_split_a_tie(client):
+    params = {"sort": "gpa", "order": "desc", "limit": 2}
+
+    first = client.get("/api/students", params=params)
+    second = client.get("/api/students", params={**params, "after": first.headers["X-Next-Cursor"]})
+    assert ids(first) == ["s6", "s4"]
+    assert ids(second) == ["s2", "s0"]
+    back = client.get("/api/students", params={**params, "before": second.headers["X-Prev-Cursor"]})
+    assert ids(back) == ids(first)
+
+
+def test_filters_apply_to_pages_and_total(client):
+    response = client.get(
+        "/api/students", params={"status": "approved", "department": "Fizik", "min_gpa": 3, "limit": 10}
+    )
+
+    assert sorted(ids(response)) == ["s0", "s2", "s4"]
+    assert response.headers["X-Total-Count"] == "3"
+
+
+def test_name_and_number_prefix_search(client):
+    assert ids(client.get("/api/students", params={"q": "ay"})) == ["s0"]
+    assert ids(client.get("/api/students", params={"q": "2024003"})) == ["s3"]
+
+
+@pytest.mark.parametrize("params, status", [
+    ({"limit": server.MAX_PAGE_SIZE + 1}, 422),
+    ({"sort": "password"}, 400),
+    ({"order": "sideways"}, 422),
+    ({"after": "x", "before": "y"}, 400),
+    ({"after": "not-a-cursor"}, 400),
+])
+def test_invalid_listing_params_are_rejected(client, params, status):
+    assert client.get("/api/students", params=params).status_code == status
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+import server
+
+
+def bucket_of(*intervals):
+    bucket = server.TimetableBucket()
+    for schedule_id, (start, end) in enumerate(intervals):
+        bucket.add(start, end, f"c{schedule_id}")
+    return bucket
+
+
+def schedule(schedule_id, start, end, room="A101", instructor="Dr. Kaya", department="bm", day="Pazartesi"):
+    return {
+        "id": schedule_id,
+        "course_name": f"Ders {schedule_id}",
+        "department_id": department,
+        "room": room,
+        "instructor": instructor,
+        "day": day,
+        "start_time": start,
+        "end_time": end,
+    }
+
+
+def test_long_early_entry_is_found_past_later_short_ones():
+    bucket = bucket_of((480, 720), (540, 570), (600, 630), (650, 660))
+
+    assert sorted(bucket.overlapping(690, 700)) == ["c0"]
+    assert sorted(bucket.overlapping(560, 610)) == ["c0", "c1", "c2"]
+    assert bucket.overlapping(720, 780) == []
+
+
+def test_touching_intervals_do_not_overlap():
+    bucket = bucket_of((540, 600))
+
+    assert bucket.overlapping(600, 660) == []
+    assert bucket.overlapping(480, 540) == []
+    assert bucket.overlapping(599, 600) == ["c0"]
+
+
+def test_overlapping_matches_a_full_scan():
+    rng = random.Random(18)
+    intervals = []
+    for _ in range(200):
+        start = rng.randrange(0, 1400)
+        intervals.append((start, start + rng.choice([10, 30, 60, 240])))
+    bucket = bucket_of(*intervals)
+
+    for _ in range(500):
+        start = rng.randrange(0, 1400)
+        end = start + rng.randrange(1, 120)
+        expected = {f"c{i}" for i, (s, e) in enumerate(intervals) if s < end and e > start}
+        assert set(bucket.overlapping(start, end)) == expected
+
+
+def test_discard_removes_only_the_given_schedule():
+    bucket = bucket_of((540, 600), (540, 660))
+    bucket.discard(540, "c1")
+    bucket.discard(540, "missing")
+
+    assert bucket.overlapping(620, 640) == []
+    assert bucket.overlapping(550, 560) == ["c0"]
+
+
+def test_room_and_instructor_clashes_block_department_ones_warn():
+    index = server.TimetableIndex()
+    index.add(schedule("s1", "09:00", "11:00"))
+    index.add(schedule("s2", "09:00", "10:00", room="B201", instructor="Dr. Aydın"))
+
+    kinds = {(c["schedule_id"], c["kind"]): c["blocking"] for c in index.conflicts(schedule("new", "10:00", "12:00"))}
+    assert kinds == {("s1", "room"): True, ("s1", "instructor"): True, ("s1", "department"): False}
+
+    parallel = index.conflicts(schedule("new", "09:30", "10:30", room="C301", instructor="Dr. Demir"))
+    assert {(c["schedule_id"], c["blocking"]) for c in parallel} == {("s1", False), ("s2", False)}
+
+
+def test_exclude_id_and_updates_ignore_the_schedule_itself():
+    index = server.TimetableIndex()
+    index.add(schedule("s1", "09:00", "11:00"))
+
+    assert index.conflicts(schedule("s1", "10:00", "12:00"), exclude_id="s1") == []
+    index.add(schedule("s1", "13:00", "14:00"))
+    assert index.conflicts(schedule("s2", "09:00", "11:00", department="fz")) == []
+    assert [c["schedule_id"] for c in index.conflicts(schedule("s2", "13:30", "15:00", department="fz"))] == ["s1", "s1"]
+
+
+def test_free_rooms_and_grid():
+    index = server.TimetableIndex()
+    index.add(schedule("s1", "09:00", "11:00", room="A101"))
+    index.add(schedule("s2", "13:00", "15:00", room="B201", day="Salı"))
+    index.add(schedule("s3", "08:00", "09:00", room="C301"))
+
+    assert index.free_rooms("Pazartesi", 540, 600) == ["B201", "C301"]
+    assert index.free_rooms("Salı", 780, 840) == ["A101", "C301"]
+    grid = index.grid("bm")
+    assert list(grid["days"]) == ["Pazartesi", "Salı"]
+    assert [s["id"] for s in grid["days"]["Pazartesi"]] == ["s3", "s1"]
+    assert grid["time_slots"] == ["08:00", "09:00", "13:00"]
+
+
+@pytest.mark.parametrize("start, end", [("10:00", "10:00"), ("11:00", "10:00"), ("25:00", "26:00"), ("9", "10:00")])
+def test_invalid_time_ranges_are_rejected(start, end):
+    with pytest.raises(server.HTTPException) as error:
+        server.schedule_interval({"start_time": start, "end_time": end})
+    assert error.value.status_code == 400
@@ -4,17 +4,25 @@ import { Facebook, Twitter, Instagram, Linkedin, Youtube, Mail, Phone, MapPin, C
 import { api } from '../utils/api';
 
 
-const Footer = () => {
-  const [settings, setSettings] = useState(null);
+// Like Navbar: settings/footerSettings passed by the page (null while loading)
+// replace the separate /settings and /footer-settings requests.
+const Footer = ({ settings: providedSettings, footerSettings: providedFooterSettings }) => {
+  const [fetchedSettings, setSettings] = useState(null);
   const [weather, setWeather] = useState(null);
   const [loadingWeather, setLoadingWeather] = useState(true);
-  const [footerSettings, setFooterSettings] = useState(null);
+  const [fetchedFooterSettings, setFooterSettings] = useState(null);
+  const settings = providedSettings !== undefined ? providedSettings : fetchedSettings;
+  const footerSettings = providedFooterSettings !== undefined ? providedFooterSettings : fetchedFooterSettings;
 
 
   useEffect(() => {
-    fetchSettings();
+    if (providedSettings === undefined) {
+      fetchSettings();
+    }
     fetchWeather();
-    fetchFooterSettings();
+    if (providedFooterSettings === undefined) {
+      fetchFooterSettings();
+    }
   }, []);
 
 
@@ -3,11 +3,14 @@ import { Link, useLocation } from 'react-router-dom';
 import { Menu, X, ChevronDown } from 'lucide-react';
 import { api } from '../utils/api';
 
-const Navbar = () => {
+// Pages that already loaded the settings (the home page gets them from /home)
+// pass them in; null means "still loading", undefined means "fetch them here".
+const Navbar = ({ settings: providedSettings }) => {
   const [isOpen, setIsOpen] = useState(false);
   const [scrolled, setScrolled] = useState(false);
   const [activeDropdown, setActiveDropdown] = useState(null);
-  const [settings, setSettings] = useState(null);
+  const [fetchedSettings, setSettings] = useState(null);
+  const settings = providedSettings !== undefined ? providedSettings : fetchedSettings;
   const location = useLocation();
 
   useEffect(() => {
@@ -15,7 +18,9 @@ const Navbar = () => {
       setScrolled(window.scrollY > 50);
     };
     window.addEventListener('scroll', handleScroll);
-    fetchSettings();
+    if (providedSettings === undefined) {
+      fetchSettings();
+    }
     return () => window.removeEventListener('scroll', handleScroll);
   }, []);
 
@@ -109,6 +109,8 @@ const AcademicStaffPage = () => {
                   {member.image_url ? (
                     <img
                       src={member.image_url}
+                      srcSet={member.image_srcset || undefined}
+                      sizes="(min-width: 768px) 25vw, 100vw"
                       alt={member.name}
                       className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-300"
                     />
@@ -6,7 +6,7 @@ import { api } from '../utils/api';
 
 const CourseSchedulePage = () => {
   const [departments, setDepartments] = useState([]);
-  const [schedules, setSchedules] = useState([]);
+  const [grid, setGrid] = useState(null);
   const [selectedDepartment, setSelectedDepartment] = useState(null);
   const [loading, setLoading] = useState(true);
 
@@ -14,58 +14,48 @@ const CourseSchedulePage = () => {
     fetchData();
   }, []);
 
+  useEffect(() => {
+    if (selectedDepartment) {
+      fetchGrid(selectedDepartment);
+    }
+  }, [selectedDepartment]);
+
   const fetchData = async () => {
     try {
-      const [deptResponse, scheduleResponse] = await Promise.all([
-        api.get('/course-departments'),
-        api.get('/course-schedules')
-      ]);
-      
+      const deptResponse = await api.get('/course-departments');
       setDepartments(deptResponse.data);
-      setSchedules(scheduleResponse.data);
       
       // Varsayılan olarak ilk departmanı seç
       if (deptResponse.data.length > 0) {
         setSelectedDepartment(deptResponse.data[0].id);
+      } else {
+        setLoading(false);
       }
     } catch (error) {
       console.error('Error fetching data:', error);
-    } finally {
       setLoading(false);
     }
   };
 
-  const days = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma'];
-
-  const getDepartmentSchedules = () => {
-    if (!selectedDepartment) return [];
-    return schedules.filter(s => s.department_id === selectedDepartment);
-  };
-
-  // Gerçek programlara göre dinamik zaman aralıkları oluştur
-  const getTimeSlots = () => {
-    const deptSchedules = getDepartmentSchedules();
-    if (deptSchedules.length === 0) {
-      return ['09:00', '10:00', '11:00', '12:00', '13:00', '14:00', '15:00', '16:00'];
+  // Haftalık tablo sunucuda gün ve saate göre gruplanmış olarak gelir
+  const fetchGrid = async (departmentId) => {
+    try {
+      const response = await api.get('/course-schedules/grid', { params: { department_id: departmentId } });
+      setGrid(response.data);
+    } catch (error) {
+      console.error('Error fetching schedule grid:', error);
+    } finally {
+      setLoading(false);
     }
-    
-    // Programlardan tüm benzersiz başlangıç saatlerini al
-    const times = new Set();
-    deptSchedules.forEach(schedule => {
-      times.add(schedule.start_time);
-    });
-    
-    // Saatleri sırala
-    return Array.from(times).sort();
   };
 
-  const timeSlots = getTimeSlots();
+  const days = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma'];
+
+  const defaultTimeSlots = ['09:00', '10:00', '11:00', '12:00', '13:00', '14:00', '15:00', '16:00'];
+  const timeSlots = grid && grid.time_slots.length > 0 ? grid.time_slots : defaultTimeSlots;
 
   const getScheduleForDayAndTime = (day, time) => {
-    const deptSchedules = getDepartmentSchedules();
-    return deptSchedules.find(s => 
-      s.day === day && s.start_time === time
-    );
+    return (grid?.days[day] || []).find(s => s.start_time === time);
   };
 
   const selectedDeptName = departments.find(d => d.id === selectedDepartment)?.name || '';
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import Navbar from '../components/Navbar';
 import Footer from '../components/Footer';
-import { newsAPI, announcementsAPI, sliderAPI, settingsAPI } from '../utils/api';
+import { homeAPI } from '../utils/api';
 import { Calendar, ChevronRight, BookOpen, Users, Award, Building2, GraduationCap, Library, X } from 'lucide-react';
 
 const HomePage = () => {
@@ -11,6 +11,7 @@ const HomePage = () => {
   const [news, setNews] = useState([]);
   const [announcements, setAnnouncements] = useState([]);
   const [settings, setSettings] = useState(null);
+  const [footerSettings, setFooterSettings] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedAnnouncement, setSelectedAnnouncement] = useState(null);
 
@@ -20,12 +21,7 @@ const HomePage = () => {
 
   const fetchData = async () => {
     try {
-      const [sliderRes, newsRes, announcementsRes, settingsRes] = await Promise.all([
-        sliderAPI.getAll(),
-        newsAPI.getAll(),
-        announcementsAPI.getAll(),
-        settingsAPI.get(),
-      ]);
+      const { data } = await homeAPI.get();
 
       const defaultSliders = [
         {
@@ -51,10 +47,11 @@ const HomePage = () => {
         }
       ];
 
-      setSliderImages(sliderRes.data.length > 0 ? sliderRes.data : defaultSliders);
-      setNews(newsRes.data.slice(0, 3));
-      setAnnouncements(announcementsRes.data.slice(0, 6));
-      setSettings(settingsRes.data);
+      setSliderImages(data.slider.length > 0 ? data.slider : defaultSliders);
+      setNews(data.news);
+      setAnnouncements(data.announcements);
+      setSettings(data.settings);
+      setFooterSettings(data.footer_settings);
     } catch (error) {
       console.error('Error fetching data:', error);
     } finally {
@@ -88,7 +85,7 @@ const HomePage = () => {
 
   return (
     <div className="min-h-screen" data-testid="home-page">
-      <Navbar />
+      <Navbar settings={settings} />
 
       {/* Hero Slider – Azaltılmış yükseklik */}
       <section className="relative h-[500px] overflow-hidden" data-testid="hero-slider">
@@ -200,6 +197,8 @@ const HomePage = () => {
                         >
                           <img
                             src={item.image_url}
+                            srcSet={item.image_srcset || undefined}
+                            sizes="96px"
                             alt={item.title}
                             className="w-24 h-24 object-cover rounded-lg flex-shrink-0 shadow-md group-hover:shadow-lg transition-shadow"
                           />
@@ -374,7 +373,7 @@ const HomePage = () => {
         </div>
       </div>
 
-      <Footer />
+      <Footer settings={settings} footerSettings={footerSettings} />
 
       {/* Duyuru Penceresi */}
       {selectedAnnouncement && (
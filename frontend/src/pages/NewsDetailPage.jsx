@@ -80,6 +80,8 @@ const NewsDetailPage = () => {
           <div className="rounded-2xl overflow-hidden shadow-2xl mb-8 animate-fade-in">
             <img
               src={news.image_url}
+              srcSet={news.image_srcset || undefined}
+              sizes="(min-width: 1024px) 896px, 100vw"
               alt={news.title}
               className="w-full h-96 object-cover"
             />
@@ -15,7 +15,7 @@ const NewsListPage = () => {
 
   const fetchNews = async () => {
     try {
-      const response = await newsAPI.getAll();
+      const response = await newsAPI.getAll({ fields: 'id,title,summary,image_url,image_srcset,published_date' });
       setNews(response.data);
     } catch (error) {
       console.error('Error fetching news:', error);
@@ -64,6 +64,8 @@ const NewsListPage = () => {
                   <div className="h-56 overflow-hidden">
                     <img
                       src={item.image_url}
+                      srcSet={item.image_srcset || undefined}
+                      sizes="(min-width: 768px) 33vw, 100vw"
                       alt={item.title}
                       className="w-full h-full object-cover transition-transform duration-500 hover:scale-110"
                     />
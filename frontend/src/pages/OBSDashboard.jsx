@@ -25,10 +25,10 @@ const OBSDashboard = () => {
     }
 
     try {
-      const response = await studentAPI.getMe();
-      setStudent(response.data);
-      fetchGrades(response.data.id);
-      fetchAttendance(response.data.id);
+      const { data } = await studentAPI.getDashboard();
+      setStudent(data.student);
+      setGrades(data.semesters.flatMap((semester) => semester.grades));
+      setAttendance(data.attendance);
     } catch (error) {
       localStorage.removeItem('student_token');
       localStorage.removeItem('student');
@@ -38,24 +38,6 @@ const OBSDashboard = () => {
     }
   };
 
-  const fetchGrades = async (studentId) => {
-    try {
-      const response = await studentAPI.getGrades(studentId);
-      setGrades(response.data);
-    } catch (error) {
-      console.error('Notlar yüklenemedi:', error);
-    }
-  };
-
-  const fetchAttendance = async (studentId) => {
-    try {
-      const response = await studentAPI.getAttendance(studentId);
-      setAttendance(response.data);
-    } catch (error) {
-      console.error('Devamsızlık bilgileri yüklenemedi:', error);
-    }
-  };
-
   const handleLogout = () => {
     localStorage.removeItem('student_token');
     localStorage.removeItem('student');
@@ -23,7 +23,7 @@ import {
   Phone,
   FileText
 } from 'lucide-react';
-import { newsAPI, announcementsAPI, eventsAPI, academicUnitsAPI, sliderAPI, api, usersAPI, footerAPI, academicStaffAPI, academicCalendarAPI, courseDepartmentsAPI, courseSchedulesAPI, contactPageSettingsAPI, aboutSettingsAPI, studentAPI } from '../../utils/api';
+import { newsAPI, announcementsAPI, eventsAPI, academicUnitsAPI, sliderAPI, api, usersAPI, footerAPI, academicStaffAPI, academicCalendarAPI, courseDepartmentsAPI, courseSchedulesAPI, contactPageSettingsAPI, aboutSettingsAPI, studentAPI, imagesAPI } from '../../utils/api';
 import { toast } from 'sonner';
 import { Button } from '../../components/ui/button';
 import {
@@ -444,6 +444,47 @@ const DashboardHome = ({ user }) => {
   );
 };
 
+// Görsel alanı: URL girilebilir ya da dosya yüklenip boyutlandırılmış sürümleri kullanılabilir
+const ImageUploadField = ({ imageUrl, onChange, required = false, inputClassName }) => {
+  const [uploading, setUploading] = useState(false);
+
+  const handleFile = async (e) => {
+    const file = e.target.files[0];
+    if (!file) return;
+    setUploading(true);
+    try {
+      const response = await imagesAPI.upload(file);
+      onChange({ image_url: response.data.url, image_srcset: response.data.srcset });
+      toast.success('Görsel yüklendi');
+    } catch (error) {
+      toast.error('Görsel yüklenemedi');
+    } finally {
+      setUploading(false);
+      e.target.value = '';
+    }
+  };
+
+  return (
+    <div className="space-y-2">
+      <input
+        type="url"
+        required={required}
+        value={imageUrl || ''}
+        onChange={(e) => onChange({ image_url: e.target.value, image_srcset: null })}
+        className={inputClassName}
+      />
+      <input
+        type="file"
+        accept="image/*"
+        disabled={uploading}
+        onChange={handleFile}
+        className="block w-full text-sm text-gray-600"
+      />
+      {uploading && <p className="text-sm text-gray-500">Yükleniyor...</p>}
+    </div>
+  );
+};
+
 // Haber Yöneticisi Bileşeni
 const NewsManager = () => {
   const [news, setNews] = useState([]);
@@ -455,6 +496,7 @@ const NewsManager = () => {
     summary: '',
     content: '',
     image_url: '',
+    image_srcset: null,
     is_featured: false
   });
 
@@ -510,6 +552,7 @@ const NewsManager = () => {
       summary: item.summary,
       content: item.content,
       image_url: item.image_url,
+      image_srcset: item.image_srcset || null,
       is_featured: item.is_featured
     });
     setDialogOpen(true);
@@ -522,6 +565,7 @@ const NewsManager = () => {
       summary: '',
       content: '',
       image_url: '',
+      image_srcset: null,
       is_featured: false
     });
   };
@@ -574,12 +618,11 @@ const NewsManager = () => {
               </div>
               <div>
                 <label className="block text-sm font-medium mb-2">Görsel URL *</label>
-                <input
-                  type="url"
+                <ImageUploadField
                   required
-                  value={formData.image_url}
-                  onChange={(e) => setFormData({...formData, image_url: e.target.value})}
-                  className="w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-blue-500"
+                  imageUrl={formData.image_url}
+                  onChange={(image) => setFormData({...formData, ...image})}
+                  inputClassName="w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-blue-500"
                 />
               </div>
               <div className="flex items-center space-x-2">
@@ -1315,6 +1358,7 @@ const SliderManager = () => {
     title: '',
     subtitle: '',
     image_url: '',
+    image_srcset: null,
     link_url: '',
     order: 0,
     is_active: true
@@ -1371,6 +1415,7 @@ const SliderManager = () => {
       title: slider.title,
       subtitle: slider.subtitle || '',
       image_url: slider.image_url,
+      image_srcset: slider.image_srcset || null,
       link_url: slider.link_url || '',
       order: slider.order,
       is_active: slider.is_active
@@ -1384,6 +1429,7 @@ const SliderManager = () => {
       title: '',
       subtitle: '',
       image_url: '',
+      image_srcset: null,
       link_url: '',
       order: 0,
       is_active: true
@@ -1427,12 +1473,11 @@ const SliderManager = () => {
               </div>
               <div>
                 <label className="block text-sm font-medium mb-2">Görsel URL *</label>
-                <input
-                  type="url"
+                <ImageUploadField
                   required
-                  value={formData.image_url}
-                  onChange={(e) => setFormData({...formData, image_url: e.target.value})}
-                  className="w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-indigo-500"
+                  imageUrl={formData.image_url}
+                  onChange={(image) => setFormData({...formData, ...image})}
+                  inputClassName="w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-indigo-500"
                 />
               </div>
               <div>
@@ -2272,11 +2317,10 @@ const AcademicStaffManager = () => {
 
             <div>
               <label className="block text-sm font-medium text-gray-700 mb-2">Fotoğraf URL</label>
-              <input
-                type="url"
-                value={formData.image_url}
-                onChange={(e) => setFormData({ ...formData, image_url: e.target.value })}
-                className="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
+              <ImageUploadField
+                imageUrl={formData.image_url}
+                onChange={(image) => setFormData({ ...formData, ...image })}
+                inputClassName="w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500"
               />
             </div>
 
@@ -2648,17 +2692,25 @@ const CourseScheduleManager = () => {
     const data = { ...scheduleFormData, department_id: selectedDepartment };
 
     try {
-      if (editingSchedule) {
-        await courseSchedulesAPI.update(editingSchedule.id, data);
-        toast.success('Ders güncellendi');
-      } else {
-        await courseSchedulesAPI.create(data);
-        toast.success('Ders eklendi');
+      const response = editingSchedule
+        ? await courseSchedulesAPI.update(editingSchedule.id, data)
+        : await courseSchedulesAPI.create(data);
+      toast.success(editingSchedule ? 'Ders güncellendi' : 'Ders eklendi');
+      const warnings = Number(response.headers['x-schedule-warnings'] || 0);
+      if (warnings > 0) {
+        toast.warning(`Bölümde aynı saatte ${warnings} ders daha var`);
       }
       fetchSchedules(selectedDepartment);
       resetScheduleForm();
     } catch (error) {
-      toast.error('İşlem başarısız');
+      const conflicts = error.response?.status === 409 ? error.response.data.detail.conflicts : null;
+      if (conflicts && conflicts.length > 0) {
+        const labels = { room: 'Derslik', instructor: 'Öğretim görevlisi', department: 'Bölüm' };
+        const first = conflicts[0];
+        toast.error(`Çakışma (${labels[first.kind] || first.kind}): ${first.course_name} ${first.day} ${first.start_time}-${first.end_time}`);
+      } else {
+        toast.error('İşlem başarısız');
+      }
     } finally {
       setLoading(false);
     }
@@ -2893,6 +2945,8 @@ const CourseScheduleManager = () => {
 // Öğrenci Yöneticisi Bileşeni
 const StudentsManager = () => {
   const [students, setStudents] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalStudents, setTotalStudents] = useState(0);
   const [loading, setLoading] = useState(true);
   const [dialogOpen, setDialogOpen] = useState(false);
   const [editingStudent, setEditingStudent] = useState(null);
@@ -2912,10 +2966,12 @@ const StudentsManager = () => {
     fetchStudents();
   }, []);
 
-  const fetchStudents = async () => {
+  const fetchStudents = async (after = null) => {
     try {
-      const response = await studentAPI.getAll();
-      setStudents(response.data);
+      const response = await studentAPI.getAll({ limit: 50, ...(after ? { after } : {}) });
+      setStudents((prev) => (after ? [...prev, ...response.data] : response.data));
+      setNextCursor(response.headers['x-next-cursor'] || null);
+      setTotalStudents(Number(response.headers['x-total-count'] || 0));
     } catch (error) {
       console.error('Error:', error);
     } finally {
@@ -3207,6 +3263,14 @@ const StudentsManager = () => {
               ))}
             </tbody>
           </table>
+          {nextCursor && (
+            <div className="flex justify-between items-center px-6 py-4 border-t">
+              <span className="text-sm text-gray-500">{students.length} / {totalStudents} öğrenci</span>
+              <Button onClick={() => fetchStudents(nextCursor)} variant="outline">
+                Daha Fazla Yükle
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -31,8 +31,21 @@ export const authAPI = {
   register: (userData) => api.post('/auth/register', userData),
 };
 
+export const homeAPI = {
+  get: () => api.get('/home'),
+};
+
+export const imagesAPI = {
+  // Dosya ham gövde olarak gönderilir; sunucu akış halinde okur
+  upload: (file) => api.post('/images', file, { headers: { 'Content-Type': file.type } }),
+};
+
+export const searchAPI = {
+  search: (q, params = {}) => api.get('/search', { params: { q, ...params } }),
+};
+
 export const newsAPI = {
-  getAll: () => api.get('/news'),
+  getAll: (params) => api.get('/news', { params }),
   getById: (id) => api.get(`/news/${id}`),
   create: (data) => api.post('/news', data),
   update: (id, data) => api.put(`/news/${id}`, data),
@@ -40,14 +53,14 @@ export const newsAPI = {
 };
 
 export const announcementsAPI = {
-  getAll: () => api.get('/announcements'),
+  getAll: (params) => api.get('/announcements', { params }),
   create: (data) => api.post('/announcements', data),
   update: (id, data) => api.put(`/announcements/${id}`, data),
   delete: (id) => api.delete(`/announcements/${id}`),
 };
 
 export const eventsAPI = {
-  getAll: () => api.get('/events'),
+  getAll: (params) => api.get('/events', { params }),
   getById: (id) => api.get(`/events/${id}`),
   create: (data) => api.post('/events', data),
   update: (id, data) => api.put(`/events/${id}`, data),
@@ -87,7 +100,7 @@ export const settingsAPI = {
 };
 
 export const contactMessagesAPI = {
-  getAll: () => api.get('/contact-messages'),
+  getAll: (params) => api.get('/contact-messages', { params }),
   create: (data) => api.post('/contact-messages', data),
   markRead: (id) => api.put(`/contact-messages/${id}/read`),
   delete: (id) => api.delete(`/contact-messages/${id}`),
@@ -111,7 +124,7 @@ export const footerAPI = {
 };
 
 export const academicStaffAPI = {
-  getAll: () => api.get('/academic-staff'),
+  getAll: (params) => api.get('/academic-staff', { params }),
   getById: (id) => api.get(`/academic-staff/${id}`),
   create: (data) => api.post('/academic-staff', data),
   update: (id, data) => api.put(`/academic-staff/${id}`, data),
@@ -136,6 +149,9 @@ export const courseDepartmentsAPI = {
 
 export const courseSchedulesAPI = {
   getAll: (departmentId) => api.get('/course-schedules', { params: { department_id: departmentId } }),
+  getGrid: (departmentId) => api.get('/course-schedules/grid', { params: { department_id: departmentId } }),
+  getFreeRooms: (day, time, endTime) => api.get('/course-schedules/free-rooms', { params: { day, time, end_time: endTime } }),
+  checkConflicts: (data, excludeId) => api.post('/course-schedules/conflicts', data, { params: { exclude_id: excludeId } }),
   getById: (id) => api.get(`/course-schedules/${id}`),
   create: (data) => api.post('/course-schedules', data),
   update: (id, data) => api.put(`/course-schedules/${id}`, data),
@@ -156,7 +172,8 @@ export const studentAPI = {
   register: (data) => api.post('/students/register', data),
   login: (data) => api.post('/students/login', data),
   getMe: () => api.get('/students/me'),
-  getAll: () => api.get('/students'),
+  getDashboard: () => api.get('/students/me/dashboard'),
+  getAll: (params) => api.get('/students', { params }),
   getById: (id) => api.get(`/students/${id}`),
   approve: (id) => api.put(`/students/${id}/approve`),
   reject: (id) => api.put(`/students/${id}/reject`),